@@ -0,0 +1,42 @@
+"""trip_poll_lease
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def _column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    columns = [c["name"] for c in insp.get_columns(table_name)]
+    return column_name in columns
+
+
+def upgrade() -> None:
+    if not _column_exists("trips", "poll_lease_owner"):
+        op.add_column(
+            "trips", sa.Column("poll_lease_owner", sa.String(), nullable=True)
+        )
+    if not _column_exists("trips", "poll_lease_expires_at"):
+        op.add_column(
+            "trips",
+            sa.Column("poll_lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    if _column_exists("trips", "poll_lease_expires_at"):
+        op.drop_column("trips", "poll_lease_expires_at")
+    if _column_exists("trips", "poll_lease_owner"):
+        op.drop_column("trips", "poll_lease_owner")
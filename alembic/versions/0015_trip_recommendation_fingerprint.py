@@ -0,0 +1,35 @@
+"""trip_recommendation_fingerprint
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def _column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    columns = [c["name"] for c in insp.get_columns(table_name)]
+    return column_name in columns
+
+
+def upgrade() -> None:
+    if not _column_exists("trips", "recommendation_fingerprint"):
+        op.add_column(
+            "trips", sa.Column("recommendation_fingerprint", sa.String(), nullable=True)
+        )
+
+
+def downgrade() -> None:
+    if _column_exists("trips", "recommendation_fingerprint"):
+        op.drop_column("trips", "recommendation_fingerprint")
@@ -0,0 +1,50 @@
+"""flight_cache
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    return table_name in insp.get_table_names()
+
+
+def upgrade() -> None:
+    if not _table_exists("flight_cache"):
+        op.create_table(
+            "flight_cache",
+            sa.Column("cache_key", sa.String(), primary_key=True),
+            sa.Column("flights", sa.JSON(), nullable=False),
+            sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index("ix_flight_cache_expires_at", "flight_cache", ["expires_at"])
+        # Same lockdown 0007 applied to every table: server-side access only.
+        if op.get_bind().dialect.name == "postgresql":
+            op.execute("ALTER TABLE public.flight_cache ENABLE ROW LEVEL SECURITY;")
+            op.execute(
+                "CREATE POLICY deny_anon_access ON public.flight_cache "
+                "FOR ALL TO anon USING (false);"
+            )
+            op.execute(
+                "CREATE POLICY deny_authenticated_access ON public.flight_cache "
+                "FOR ALL TO authenticated USING (false);"
+            )
+
+
+def downgrade() -> None:
+    if _table_exists("flight_cache"):
+        op.drop_table("flight_cache")
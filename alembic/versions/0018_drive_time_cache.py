@@ -0,0 +1,50 @@
+"""drive_time_cache
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0018"
+down_revision = "0017"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    return table_name in insp.get_table_names()
+
+
+def upgrade() -> None:
+    if not _table_exists("drive_time_cache"):
+        op.create_table(
+            "drive_time_cache",
+            sa.Column("cache_key", sa.String(), primary_key=True),
+            sa.Column("result", sa.JSON(), nullable=False),
+            sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index("ix_drive_time_cache_expires_at", "drive_time_cache", ["expires_at"])
+        # Same lockdown 0007 applied to every table: server-side access only.
+        if op.get_bind().dialect.name == "postgresql":
+            op.execute("ALTER TABLE public.drive_time_cache ENABLE ROW LEVEL SECURITY;")
+            op.execute(
+                "CREATE POLICY deny_anon_access ON public.drive_time_cache "
+                "FOR ALL TO anon USING (false);"
+            )
+            op.execute(
+                "CREATE POLICY deny_authenticated_access ON public.drive_time_cache "
+                "FOR ALL TO authenticated USING (false);"
+            )
+
+
+def downgrade() -> None:
+    if _table_exists("drive_time_cache"):
+        op.drop_table("drive_time_cache")
@@ -0,0 +1,49 @@
+"""drive_time_profiles
+
+Revision ID: 0019
+Revises: 0018
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0019"
+down_revision = "0018"
+branch_labels = None
+depends_on = None
+
+
+def _table_exists(table_name: str) -> bool:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    return table_name in insp.get_table_names()
+
+
+def upgrade() -> None:
+    if not _table_exists("drive_time_profiles"):
+        op.create_table(
+            "drive_time_profiles",
+            sa.Column("profile_key", sa.String(), primary_key=True),
+            sa.Column("samples", sa.JSON(), nullable=False),
+            sa.Column("distance_text", sa.String(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        # Same lockdown 0007 applied to every table: server-side access only.
+        if op.get_bind().dialect.name == "postgresql":
+            op.execute("ALTER TABLE public.drive_time_profiles ENABLE ROW LEVEL SECURITY;")
+            op.execute(
+                "CREATE POLICY deny_anon_access ON public.drive_time_profiles "
+                "FOR ALL TO anon USING (false);"
+            )
+            op.execute(
+                "CREATE POLICY deny_authenticated_access ON public.drive_time_profiles "
+                "FOR ALL TO authenticated USING (false);"
+            )
+
+
+def downgrade() -> None:
+    if _table_exists("drive_time_profiles"):
+        op.drop_table("drive_time_profiles")
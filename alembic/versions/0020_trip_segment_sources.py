@@ -0,0 +1,33 @@
+"""trip_segment_sources
+
+Revision ID: 0020
+Revises: 0019
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+from sqlalchemy import inspect
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0020"
+down_revision = "0019"
+branch_labels = None
+depends_on = None
+
+
+def _column_exists(table_name: str, column_name: str) -> bool:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    columns = [c["name"] for c in insp.get_columns(table_name)]
+    return column_name in columns
+
+
+def upgrade() -> None:
+    if not _column_exists("trips", "segment_sources"):
+        op.add_column("trips", sa.Column("segment_sources", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    if _column_exists("trips", "segment_sources"):
+        op.drop_column("trips", "segment_sources")
@@ -24,8 +24,10 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.core.config import settings
 from app.db.models import Airport, Trip
-from app.services.integrations.aerodatabox import lookup_flights
+from app.services.flight_record import FlightIndex
+from app.services.integrations.aerodatabox import AeroDataBoxQuotaDeferred, lookup_flights
 from app.services.integrations.airport_defaults import AIRPORT_TIMEZONES
+from app.services.integrations.rapidapi_quota import Priority, use_priority
 from app.services.flight_snapshot_service import (
     _select_flight,
     build_flight_info_and_status,
@@ -151,7 +153,7 @@ def _reconstruct_from_scalars(
     return flight_info, flight_status
 
 
-def _backfill_from_adb(row: Trip) -> tuple[dict, dict] | None:
+async def _backfill_from_adb(row: Trip) -> tuple[dict, dict] | None:
     """Fetch ADB and build info/status. Overrides snapshot_taken_at to trip.created_at."""
     if not row.flight_number or not row.departure_date:
         return None
@@ -162,11 +164,14 @@ def _backfill_from_adb(row: Trip) -> tuple[dict, dict] | None:
         row.departure_date,
         row.id,
     )
-    flights = lookup_flights(row.flight_number, row.departure_date)
+    # Lowest quota class: waits for spare tokens, never eats into the
+    # budget reserved for live users and the polling agent.
+    with use_priority(Priority.BACKFILL):
+        flights = await lookup_flights(row.flight_number, row.departure_date)
     if not flights:
         return None
 
-    flight = _select_flight(flights, row.selected_departure_utc)
+    flight = _select_flight(FlightIndex.from_dicts(flights), row.selected_departure_utc)
     flight_info, flight_status = build_flight_info_and_status(flight)
     if flight_info is None:
         return None
@@ -215,7 +220,15 @@ async def process_trips(session, dry_run: bool, limit: int | None) -> dict:
         else:
             action = "api_call"
             if not dry_run:
-                plan = _backfill_from_adb(row)
+                try:
+                    plan = await _backfill_from_adb(row)
+                except AeroDataBoxQuotaDeferred:
+                    logger.warning(
+                        "Skip trip_id=%s — ADB quota reserved for live traffic; rerun later",
+                        row.id,
+                    )
+                    skipped += 1
+                    continue
             api_called += 1
 
         if dry_run:
@@ -1,11 +1,20 @@
 """Analytics event ingestion endpoint."""
 
+import logging
+import uuid
+from datetime import datetime, timezone
+
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field, field_validator
+from sqlalchemy import select
 
 from app.api.middleware.auth import get_optional_user
 from app.db import get_db
-from app.db.models import Event, User
+from app.db.models import Event, Trip, User
+from app.services.notifications import is_pro_user
+from app.services.trip_state import INTERACTION_SIGNALS, apply_interaction_signal
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["events"])
 
@@ -42,4 +51,36 @@ async def record_event(
     db.add(event)
     await db.commit()
     await db.refresh(event)
-    return {"status": "recorded", "event_id": str(event.id)}
+    event_id = str(event.id)
+    if user is not None and body.event_name in INTERACTION_SIGNALS and is_pro_user(user):
+        try:
+            await _advance_on_interaction(db, user.id, body.metadata)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            logger.exception("Failed to apply %s to trips of user %s", body.event_name, user.id)
+    return {"status": "recorded", "event_id": event_id}
+
+
+async def _advance_on_interaction(db, user_id, metadata: dict | None) -> None:
+    """Apply an interaction signal to the user's active trip(s).
+
+    A tap means the user is leaving now, so the trip moves to en_route
+    immediately instead of waiting for the polling agent's next tick. Only
+    monitored (pro) users' trips are advanced, as in the agent; the event
+    itself is committed first so a failed transition never loses it.
+    ``metadata.trip_id`` narrows the transition to that trip when present;
+    an unparseable one advances nothing.
+    """
+    stmt = select(Trip).where(Trip.user_id == user_id, Trip.trip_status == "active")
+    trip_id = (metadata or {}).get("trip_id")
+    if trip_id:
+        try:
+            stmt = stmt.where(Trip.id == uuid.UUID(str(trip_id)))
+        except ValueError:
+            logger.warning("Ignoring interaction signal with invalid trip_id %r", trip_id)
+            return
+    now = datetime.now(tz=timezone.utc)
+    for trip in (await db.execute(stmt)).scalars().all():
+        if apply_interaction_signal(trip, now):
+            logger.info("Trip %s advanced to en_route (interaction signal)", trip.id)
@@ -7,12 +7,13 @@ from app.core.errors import (
     UpstreamRateLimitedError,
     UpstreamUnavailableError,
 )
+from app.services.departures_board import get_departures_board
+from app.services.flight_record import parse_utc
 from app.services.flight_snapshot_service import get_available_flights
 from app.services.integrations.aerodatabox import (
     AeroDataBoxError,
     AeroDataBoxNotFound,
     AeroDataBoxRateLimited,
-    lookup_airport_departures,
 )
 from app.services.integrations.google_maps import get_drive_time
 from app.services.integrations.airport_defaults import get_airport_timings
@@ -59,15 +60,6 @@ TIME_WINDOW_RANGES = {
 }
 
 
-def _parse_utc(utc_str: str | None) -> datetime | None:
-    if not utc_str:
-        return None
-    try:
-        return datetime.fromisoformat(utc_str.strip().replace("Z", "+00:00"))
-    except (ValueError, TypeError):
-        return None
-
-
 async def _estimate_min_journey(home_address: str, origin_iata: str, departure_hour: int | None, cache: dict) -> int:
     if origin_iata in cache:
         return cache[origin_iata]
@@ -133,8 +125,8 @@ async def enrich_flights(flights: list[dict], home_address: str = "") -> list[di
         flight["is_boarding"] = False
 
         # Use the best available departure time
-        scheduled_utc = _parse_utc(flight.get("departure_time_utc"))
-        revised_utc = _parse_utc(flight.get("revised_departure_utc"))
+        scheduled_utc = parse_utc(flight.get("departure_time_utc"))
+        revised_utc = parse_utc(flight.get("revised_departure_utc"))
         # Use revised time only if it's later than scheduled (actual delay)
         if revised_utc and scheduled_utc and revised_utc > scheduled_utc:
             dep_utc = revised_utc
@@ -208,7 +200,7 @@ async def get_flights(
     home_address: str = Query(default=""),
 ):
     try:
-        result = get_available_flights(flight_number, date)
+        result = await get_available_flights(flight_number, date)
     except AeroDataBoxError as e:
         raise _translate_flights_upstream(e) from e
 
@@ -220,58 +212,17 @@ async def get_flights(
     return {"flights": enriched}
 
 
-def _extract_local_hour(local_str: str | None) -> int | None:
-    """Extract hour from a local time string like '2026-03-07 06:00'."""
-    if not local_str:
-        return None
-    try:
-        return datetime.fromisoformat(local_str.strip()).hour
-    except (ValueError, TypeError):
-        return None
-
-
-def _matches_time_window(flight: dict, time_window: str) -> bool:
-    """Check if a flight's local departure hour falls within the given time window."""
-    local_str = flight.get("departure_time_local")
-    hour = _extract_local_hour(local_str)
-    if hour is None:
-        return True  # can't filter without time info, include it
-
-    rng = TIME_WINDOW_RANGES.get(time_window)
+def _window_hours(time_window: str | None) -> set[int] | None:
+    """Local departure hours covered by a named time window; None means no filter."""
+    rng = TIME_WINDOW_RANGES.get(time_window) if time_window else None
     if rng is None:
-        return True
+        return None
 
     start, end = rng
     if start < end:
-        return start <= hour < end
-    else:
-        # wraps around midnight (red_eye: 22-5)
-        return hour >= start or hour < end
-
-
-def _matches_airline(flight: dict, airline_query: str) -> bool:
-    """Match on IATA airline code (from flight_number prefix) or airline name, case-insensitive partial."""
-    query = airline_query.strip().lower()
-    if not query:
-        return True
-
-    # Check airline_name
-    airline_name = (flight.get("airline_name") or "").lower()
-    if query in airline_name:
-        return True
-
-    # Check IATA code prefix of flight_number (e.g. "UA" from "UA300")
-    flight_num = (flight.get("flight_number") or "").upper()
-    iata_code = ""
-    for ch in flight_num:
-        if ch.isalpha():
-            iata_code += ch
-        else:
-            break
-    if iata_code and query == iata_code.lower():
-        return True
-
-    return False
+        return set(range(start, end))
+    # wraps around midnight (red_eye: 22-5)
+    return set(range(start, 24)) | set(range(0, end))
 
 
 @router.get("/search")
@@ -284,29 +235,11 @@ async def search_flights(
     home_address: str = Query(default=""),
 ):
     try:
-        departures = lookup_airport_departures(origin, date)
+        board = await get_departures_board(origin, date)
     except AeroDataBoxError as e:
         raise _translate_search_upstream(e) from e
 
-    if not departures:
-        # Upstream OK but zero departures — legitimate empty-day result.
-        return {"flights": []}
-
-    # Filter by destination
-    dest_upper = destination.strip().upper()
-    filtered = [
-        f for f in departures
-        if (f.get("destination_iata") or "").upper() == dest_upper
-    ]
-
-    # Filter by time window
-    if time_window:
-        filtered = [f for f in filtered if _matches_time_window(f, time_window)]
-
-    # Filter by airline
-    if airline:
-        filtered = [f for f in filtered if _matches_airline(f, airline)]
-
+    filtered = board.search(destination, hours=_window_hours(time_window), airline=airline)
     if not filtered:
         return {"flights": []}
 
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
-from app.schemas.health import HealthResponse
+from app.schemas.health import AdbQuotaResponse, HealthResponse
+from app.services.integrations.rapidapi_quota import quota
 
 router = APIRouter(tags=["health"])
 
@@ -9,3 +10,9 @@ router = APIRouter(tags=["health"])
 def get_health() -> HealthResponse:
     """Liveness check."""
     return HealthResponse(status="ok")
+
+
+@router.get("/health/adb-quota", response_model=AdbQuotaResponse)
+def get_adb_quota() -> AdbQuotaResponse:
+    """Remaining RapidAPI budget and per-priority grant/deferral counts."""
+    return AdbQuotaResponse(**quota.status())
@@ -6,6 +6,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 
 from app.api.middleware.auth import get_optional_user
+from app.core.config import settings
+from app.core.deadline import within_budget
 from app.core.errors import (
     AppError,
     UpstreamRateLimitedError,
@@ -52,9 +54,15 @@ async def post_recommendation(
 ) -> RecommendationResponse:
     """Compute a leave-home recommendation for the given trip."""
     try:
-        response = await compute_recommendation(payload, user=user, strict=True)
+        response = await within_budget(
+            settings.recommendation_budget_seconds,
+            compute_recommendation(payload, user=user, strict=True),
+        )
     except AeroDataBoxError as e:
         raise _translate_upstream(e) from e
+    except TimeoutError as e:
+        logger.warning("Recommendation for trip %s overran its budget", payload.trip_id)
+        raise UpstreamUnavailableError() from e
     if response is None:
         raise HTTPException(status_code=404, detail="Trip not found")
     return response
@@ -79,9 +87,15 @@ async def post_recommendation_recompute(
             logger.exception("Failed to persist home_address for trip %s", payload.trip_id)
 
     try:
-        response = await recompute_recommendation(payload, user=user, strict=True)
+        response = await within_budget(
+            settings.recommendation_budget_seconds,
+            recompute_recommendation(payload, user=user, strict=True),
+        )
     except AeroDataBoxError as e:
         raise _translate_upstream(e) from e
+    except TimeoutError as e:
+        logger.warning("Recommendation recompute for trip %s overran its budget", payload.trip_id)
+        raise UpstreamUnavailableError() from e
     if response is None:
         raise HTTPException(status_code=404, detail="Trip not found")
 
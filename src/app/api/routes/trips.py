@@ -19,6 +19,7 @@ from app.schemas.trips import (
     TripContext,
     TripRequest,
 )
+from app.services.integrations.rapidapi_quota import Priority, use_priority
 from app.services.trip_intake import process_trip_intake
 
 
@@ -240,51 +241,57 @@ async def track_trip(
         row.trip_status = "active"
         user.trip_count = (user.trip_count or 0) + 1
 
-        # Compute initial projected_timeline. This also warms the flight_snapshot_service
-        # cache with the raw AeroDataBox response, which get_selected_flight reuses below.
-        try:
-            from app.schemas.recommendations import RecommendationRequest
-            from app.services.recommendation_service import (
-                build_latest_recommendation_jsonb,
-                compute_recommendation,
-            )
-
-            rec_response = await compute_recommendation(
-                RecommendationRequest(trip_id=trip_id), user=user
-            )
-            timeline = _build_projected_timeline(rec_response, row.selected_departure_utc)
-            if timeline:
-                row.projected_timeline = timeline
-            if rec_response is not None:
-                row.latest_recommendation = build_latest_recommendation_jsonb(rec_response)
-        except Exception:
-            logger.exception("Failed to compute projected_timeline on track for trip %s", trip_id)
-
-        # Persist frozen flight_info + initial flight_status from the cached ADB response.
-        # flight_info is the source of truth on conflict; origin_iata/destination_iata/airline
-        # are denormalized scalars for fast history queries only — never read them without
-        # checking flight_info first.
-        if row.input_mode == "flight_number" and row.flight_number:
+        # Track-time ADB calls rank below interactive lookups in the RapidAPI quota.
+        with use_priority(Priority.TRACK):
+            # Compute initial projected_timeline. This also warms the flight_snapshot_service
+            # cache with the raw AeroDataBox response, which get_selected_flight reuses below.
             try:
-                from app.services.flight_snapshot_service import (
-                    build_flight_info_and_status,
-                    get_selected_flight,
+                from app.schemas.recommendations import RecommendationRequest
+                from app.services.recommendation_service import (
+                    build_latest_recommendation_jsonb,
+                    compute_recommendation,
+                    segment_sources,
                 )
 
-                flight = get_selected_flight(
-                    row.flight_number,
-                    row.departure_date,
-                    row.selected_departure_utc,
+                rec_response = await compute_recommendation(
+                    RecommendationRequest(trip_id=trip_id), user=user
                 )
-                flight_info, flight_status = build_flight_info_and_status(flight)
-                if flight_info:
-                    row.flight_info = flight_info
-                    row.flight_status = flight_status
-                    row.origin_iata = flight_info.get("origin_iata")
-                    row.destination_iata = flight_info.get("destination_iata")
-                    row.airline = flight_info.get("airline")
+                timeline = _build_projected_timeline(rec_response, row.selected_departure_utc)
+                if timeline:
+                    row.projected_timeline = timeline
+                if rec_response is not None:
+                    row.latest_recommendation = build_latest_recommendation_jsonb(rec_response)
+                    row.segment_sources = segment_sources(rec_response)
             except Exception:
-                logger.exception("Failed to populate flight_info for trip %s", trip_id)
+                logger.exception("Failed to compute projected_timeline on track for trip %s", trip_id)
+
+            # Persist frozen flight_info + initial flight_status from the cached ADB response.
+            # flight_info is the source of truth on conflict; origin_iata/destination_iata/airline
+            # are denormalized scalars for fast history queries only — never read them without
+            # checking flight_info first.
+            if row.input_mode == "flight_number" and row.flight_number:
+                try:
+                    from app.services.flight_snapshot_service import (
+                        build_flight_info_and_status,
+                        get_selected_flight,
+                    )
+
+                    flight = await get_selected_flight(
+                        row.flight_number,
+                        row.departure_date,
+                        row.selected_departure_utc,
+                    )
+                    flight_info, flight_status = build_flight_info_and_status(flight)
+                    # Last known good data served during an ADB outage isn't
+                    # frozen; the polling agent fills both once ADB answers.
+                    if flight_info and not flight.stale:
+                        row.flight_info = flight_info
+                        row.flight_status = flight_status
+                        row.origin_iata = flight_info.get("origin_iata")
+                        row.destination_iata = flight_info.get("destination_iata")
+                        row.airline = flight_info.get("airline")
+                except Exception:
+                    logger.exception("Failed to populate flight_info for trip %s", trip_id)
 
         await db.commit()
         return {
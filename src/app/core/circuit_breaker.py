@@ -0,0 +1,100 @@
+"""Consecutive-failure circuit breaker for upstream integrations."""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast after ``failure_threshold`` consecutive upstream failures.
+
+    closed     calls go through; consecutive failures are counted.
+    open       calls are refused until ``reset_timeout`` seconds have passed.
+    half_open  one probe call is let through; success closes the circuit,
+               failure re-opens it for another ``reset_timeout``.
+
+    A probe that never reports back (cancelled caller) stops blocking after
+    ``reset_timeout`` and another probe is allowed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock=time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at: float | None = None
+
+    def refusing(self) -> bool:
+        """Whether ``allow`` would refuse a call now, without claiming the probe.
+
+        Lets callers skip other costly admission steps (e.g. a quota token)
+        for a call that can't go out, and claim the probe only afterwards.
+        """
+        if self.state == CLOSED:
+            return False
+        now = self._clock()
+        if self.state == OPEN:
+            return now - self._opened_at < self.reset_timeout
+        return self._probe_started_at is not None and now - self._probe_started_at < self.reset_timeout
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now."""
+        if self.state == CLOSED:
+            return True
+        now = self._clock()
+        if self.state == OPEN:
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+            self._probe_started_at = now
+            return True
+        # HALF_OPEN: one probe at a time
+        if self._probe_started_at is not None and now - self._probe_started_at < self.reset_timeout:
+            return False
+        self._probe_started_at = now
+        return True
+
+    def release_probe(self) -> None:
+        """Free the half-open probe slot of a call that ended without a verdict.
+
+        For probes that neither succeeded nor failed (cut short by the
+        caller's own deadline, cancelled), so the next call can probe at once
+        instead of waiting out ``reset_timeout``.
+        """
+        if self.state == HALF_OPEN:
+            self._probe_started_at = None
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info("Circuit %s closed", self.name)
+        self.reset()
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.failures >= self.failure_threshold
+        ):
+            logger.warning(
+                "Circuit %s open after %d consecutive failures; failing fast for %ss",
+                self.name, self.failures, self.reset_timeout,
+            )
+            self.state = OPEN
+            self._opened_at = self._clock()
+            self._probe_started_at = None
@@ -12,7 +12,16 @@ class Settings:
     rapidapi_key: str = os.getenv("RAPIDAPI_KEY", "")
     google_maps_api_key: str = os.getenv("GOOGLE_MAPS_API_KEY", "")
     database_url: str = os.getenv("DATABASE_URL", "")
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
     enable_polling_agent: bool = os.getenv("ENABLE_POLLING_AGENT", "true").lower() in ("true", "1", "yes")
+    polling_concurrency: int = int(os.getenv("POLLING_CONCURRENCY", "8"))
+    polling_adb_concurrency: int = int(os.getenv("POLLING_ADB_CONCURRENCY", "4"))
+    polling_google_concurrency: int = int(os.getenv("POLLING_GOOGLE_CONCURRENCY", "4"))
+    adb_rate_per_second: float = float(os.getenv("ADB_RATE_PER_SECOND", "5"))
+    adb_burst: int = int(os.getenv("ADB_BURST", "10"))
+    adb_daily_budget: int = int(os.getenv("ADB_DAILY_BUDGET", "0"))  # 0 = uncapped
+    recommendation_budget_seconds: float = float(os.getenv("RECOMMENDATION_BUDGET_SECONDS", "8"))
     supabase_url: str = os.getenv("SUPABASE_URL", "")
     supabase_key: str = os.getenv("SUPABASE_KEY", "")
     jwt_secret: str = os.getenv("JWT_SECRET", "dev-secret-change-me")
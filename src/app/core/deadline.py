@@ -0,0 +1,115 @@
+"""Request-scoped latency budget for upstream integrations.
+
+A request opens a budget with ``request_budget(seconds)``. The flight, maps,
+TSA and geocode integrations read it through ``call_timeout`` before each
+upstream call: their own timeout is capped at their share of what is left,
+and once that share is spent they skip the call, use their existing
+fallback and ``mark_degraded`` the budget. The request can then report a
+degraded response instead of waiting out every upstream timeout in turn.
+
+Like the RapidAPI priority, the budget is carried in a contextvar, so it
+follows the request into tasks it spawns. Calls made outside a budget
+(polling agent, scripts) keep their plain timeouts.
+
+The budget is cooperative: only code that asks ``call_timeout`` honours
+it. Routes run their compute through ``within_budget``, which also puts a
+hard stop on the whole request in case something else (a DB read, a slow
+fallback) overruns.
+
+A call coalesced onto another request's in-flight lookup (see SingleFlight)
+runs under the budget of the request that started it, so coalescing is
+scoped by ``budget_class``: only requests whose deadlines fall in the same
+BUDGET_CLASS_SECONDS window share a call.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import time
+
+# Below this much time a call isn't worth sending: the caller falls back.
+MIN_CALL_SECONDS = 0.25
+# Width of the deadline windows within which budgeted calls may coalesce.
+BUDGET_CLASS_SECONDS = 1.0
+# Past the deadline, time a request gets to finish with its fallbacks
+# before ``within_budget`` cancels it.
+HARD_STOP_GRACE_SECONDS = 1.0
+
+
+class Budget:
+    """Wall-clock deadline shared by everything one request does upstream."""
+
+    def __init__(self, seconds: float, clock=time.monotonic) -> None:
+        self._clock = clock
+        self.deadline = clock() + seconds
+        self.degraded: set[str] = set()
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - self._clock())
+
+
+_budget: contextvars.ContextVar[Budget | None] = contextvars.ContextVar(
+    "request_budget", default=None
+)
+
+
+@contextlib.contextmanager
+def request_budget(seconds: float, clock=time.monotonic):
+    """Bound the enclosed upstream calls (and tasks spawned inside) to ``seconds``."""
+    budget = Budget(seconds, clock=clock)
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+async def within_budget(seconds: float, awaitable):
+    """Await ``awaitable`` under a ``seconds`` budget, cancelling it shortly after the deadline.
+
+    Raises TimeoutError if it is still running HARD_STOP_GRACE_SECONDS
+    past the deadline.
+    """
+    with request_budget(seconds):
+        return await asyncio.wait_for(awaitable, seconds + HARD_STOP_GRACE_SECONDS)
+
+
+def current_budget() -> Budget | None:
+    return _budget.get()
+
+
+def call_timeout(default: float, share: float = 1.0) -> float | None:
+    """Timeout for the next upstream call, or None when its budget is spent.
+
+    ``default`` is the integration's own timeout; under a request budget it
+    is capped at ``share`` of the time remaining. None means fewer than
+    MIN_CALL_SECONDS are left and the caller should use its fallback.
+    """
+    budget = _budget.get()
+    if budget is None:
+        return default
+    timeout = min(default, budget.remaining() * share)
+    if timeout < MIN_CALL_SECONDS:
+        return None
+    return timeout
+
+
+def budget_class() -> int | None:
+    """SingleFlight scope for budgeted calls: None outside a budget, else the deadline window."""
+    budget = _budget.get()
+    if budget is None:
+        return None
+    return int(budget.deadline // BUDGET_CLASS_SECONDS)
+
+
+def mark_degraded(integration: str) -> None:
+    """Record that ``integration`` fell back because the budget ran out."""
+    budget = _budget.get()
+    if budget is not None:
+        budget.degraded.add(integration)
+
+
+def is_degraded(integration: str) -> bool:
+    """Whether ``integration`` has fallen back under the current budget."""
+    budget = _budget.get()
+    return budget is not None and integration in budget.degraded
@@ -0,0 +1,52 @@
+"""Single-flight coalescing for concurrent identical upstream calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one in-flight task.
+
+    The first caller for a key starts the call; callers that arrive while it
+    is still running await the same task instead of hitting the upstream
+    again. The key is dropped as soon as the call settles, so this only
+    deduplicates overlapping calls — caching results is the caller's job.
+
+    Each caller awaits through ``asyncio.shield``: one caller being cancelled
+    (client disconnect, request deadline) doesn't cancel the shared call for
+    the others.
+
+    The shared call runs in the first caller's contextvars context. ``scope``
+    returns the parts of that context the call depends on (RapidAPI
+    priority, request budget); it is folded into the key so a caller only
+    joins a call made under the same conditions it would have made it.
+    """
+
+    def __init__(self, scope: Callable[[], Hashable] | None = None) -> None:
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._scope = scope
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._scope is not None:
+            key = (self._scope(), key)
+        task = self._inflight.get(key)
+        # A task left over from another event loop (scripts, tests) can't be
+        # awaited here; start a fresh call instead.
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(fn(*args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._settle(k, t))
+        return await asyncio.shield(task)
+
+    def _settle(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved so it isn't logged as "never
+        # retrieved" when every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
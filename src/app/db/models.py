@@ -89,9 +89,17 @@ class Trip(Base):
     flight_info: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     flight_status: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     latest_recommendation: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Inputs behind latest_recommendation's segments, reused by recomputes (see
+    # recommendation_service.segment_sources). Internal: never returned by the API.
+    segment_sources: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Hash of the recompute inputs behind latest_recommendation (see recommendation_input_fingerprint)
+    recommendation_fingerprint: Mapped[str | None] = mapped_column(String, nullable=True)
     actual_depart_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     auto_completed: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false")
     feedback_requested_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Polling-agent lease: which replica owns the trip's current poll slot, and until when.
+    poll_lease_owner: Mapped[str | None] = mapped_column(String, nullable=True)
+    poll_lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     user: Mapped["User | None"] = relationship(back_populates="trips")
@@ -188,3 +196,46 @@ class Event(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+
+
+class FlightCacheEntry(Base):
+    __tablename__ = "flight_cache"
+
+    cache_key: Mapped[str] = mapped_column(String, primary_key=True)
+    flights: Mapped[list] = mapped_column(JSON, nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+
+class GeocodeCacheEntry(Base):
+    __tablename__ = "geocode_cache"
+
+    query_key: Mapped[str] = mapped_column(String, primary_key=True)
+    lat: Mapped[float] = mapped_column(Float, nullable=False)
+    lng: Mapped[float] = mapped_column(Float, nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+
+class DriveTimeCacheEntry(Base):
+    __tablename__ = "drive_time_cache"
+
+    cache_key: Mapped[str] = mapped_column(String, primary_key=True)
+    result: Mapped[dict] = mapped_column(JSON, nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+
+class DriveTimeProfile(Base):
+    __tablename__ = "drive_time_profiles"
+
+    profile_key: Mapped[str] = mapped_column(String, primary_key=True)
+    samples: Mapped[dict] = mapped_column(JSON, nullable=False)  # local date -> [expected, pessimistic, optimistic]
+    distance_text: Mapped[str | None] = mapped_column(String, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
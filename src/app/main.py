@@ -13,6 +13,7 @@ from slowapi.errors import RateLimitExceeded
 from app.api.routes import auth, devices, events, feedback, flights, health, recommendations, subscriptions, trips, users, version
 from app.core.config import settings
 from app.core.errors import AppError, app_error_handler, validation_error_handler
+from app.services.integrations import aerodatabox, google_maps
 from app.services.integrations.airport_cache import load_airport_cache
 from app.services.integrations.firebase import init_firebase
 from app.services.polling_agent import start_polling_agent
@@ -55,6 +56,8 @@ async def lifespan(app: FastAPI):
             await app.state.polling_task
         except asyncio.CancelledError:
             pass
+    await aerodatabox.close_client()
+    await google_maps.close_client()
     if settings.database_url:
         from app.db import engine
 
@@ -19,3 +19,6 @@ class FlightSnapshot(BaseModel):
     departure_local_hour: int | None = Field(
         None, description="Local hour of departure (0-23) for TSA estimates"
     )
+    is_stale: bool = Field(
+        False, description="Built from last known good data while AeroDataBox was unavailable"
+    )
@@ -3,3 +3,16 @@ from pydantic import BaseModel
 
 class HealthResponse(BaseModel):
     status: str
+
+
+class AdbQuotaResponse(BaseModel):
+    """Client-side RapidAPI budget for AeroDataBox (per process)."""
+
+    rate_per_second: float
+    burst: int
+    tokens_available: float | None = None
+    daily_budget: int | None = None
+    used_today: int
+    remaining_today: int | None = None
+    granted: dict[str, int]
+    deferred: dict[str, int]
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from app.schemas.trips import TripPreferenceOverrides
 
@@ -95,3 +95,15 @@ class RecommendationResponse(BaseModel):
     origin_airport_code: str | None = Field(
         None, description="Origin airport IATA code"
     )
+    flight_data_stale: bool = Field(
+        False,
+        description="True if flight times/gate are last known good data served during an upstream outage",
+    )
+    degraded: bool = Field(
+        False,
+        description="True if some upstream data was replaced by a fallback estimate to stay within the request's latency budget",
+    )
+
+    # Upstream results behind the transport/TSA segments and map coordinates,
+    # persisted into the trip's segment_sources so the next recompute can reuse them.
+    _segment_sources: dict = PrivateAttr(default_factory=dict)
@@ -0,0 +1,145 @@
+"""Short-lived, indexed departures boards backing /v1/flights/search.
+
+Searches from one origin tend to come in bursts (a user trying a few
+destinations or airlines, several users flying out of the same hub), and
+every one of them used to refetch, reparse and linearly filter the whole
+FIDS board. Here a board is fetched once per ``(origin, date)``, kept for
+BOARD_TTL seconds, and indexed by destination IATA, airline code and local
+departure hour so a search only touches the flights it returns.
+
+Boards hold the raw FIDS rows: the indexes read the few fields they need
+straight from the payload, and a row only goes through ``parse_departure``
+the first time a search returns it. Most of a hub's board never matches a
+search and is never parsed.
+
+The TTL is short because gates and statuses on a departures board move
+quickly; ``enrich_flights`` still derives departed / boarding / catchable
+from the current time on every request.
+"""
+
+import time
+
+from app.services.flight_record import local_hour
+from app.services.integrations.aerodatabox import (
+    lookup_raw_departures,
+    parse_departure,
+    raw_departure_airline_name,
+    raw_departure_destination,
+    raw_departure_local_time,
+    raw_departure_number,
+)
+
+BOARD_TTL = 120             # seconds
+BOARD_MAX_ENTRIES = 256
+
+# (origin, date) -> (expires_at monotonic, board)
+_boards: dict[tuple[str, str], tuple[float, "DeparturesBoard"]] = {}
+
+
+def airline_code(flight_number: str | None) -> str:
+    """IATA airline code from a flight number prefix (e.g. "UA" from "UA300")."""
+    code = ""
+    for ch in (flight_number or "").upper():
+        if not ch.isalpha():
+            break
+        code += ch
+    return code
+
+
+class DeparturesBoard:
+    """One airport's raw FIDS departures for a date, indexed for search.
+
+    Index values are positions in ``raw``, so results keep the board's
+    original (departure time) order. Rows without a destination IATA are
+    left out of the destination index, matching ``parse_departure``.
+    """
+
+    __slots__ = (
+        "origin", "raw", "_parsed", "_airline_names",
+        "_by_destination", "_by_airline", "_by_hour",
+    )
+
+    def __init__(self, origin: str, raw: list[dict]) -> None:
+        self.origin = origin
+        self.raw = raw
+        self._parsed: list[dict | None] = [None] * len(raw)
+        self._airline_names = [raw_departure_airline_name(r).lower() for r in raw]
+        self._by_destination: dict[str, list[int]] = {}
+        self._by_airline: dict[str, set[int]] = {}
+        # None collects flights without a usable local time; they match every window.
+        self._by_hour: dict[int | None, set[int]] = {}
+        for i, row in enumerate(raw):
+            destination = raw_departure_destination(row)
+            if destination:
+                self._by_destination.setdefault(destination, []).append(i)
+            code = airline_code(raw_departure_number(row))
+            if code:
+                self._by_airline.setdefault(code, set()).add(i)
+            hour = local_hour(raw_departure_local_time(row))
+            self._by_hour.setdefault(hour, set()).add(i)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    @property
+    def parsed_count(self) -> int:
+        """How many rows searches have parsed so far."""
+        return sum(p is not None for p in self._parsed)
+
+    def _flight(self, i: int) -> dict:
+        parsed = self._parsed[i]
+        if parsed is None:
+            parsed = self._parsed[i] = parse_departure(self.raw[i], origin_iata=self.origin)
+        return dict(parsed)
+
+    def search(
+        self,
+        destination: str,
+        hours: set[int] | None = None,
+        airline: str | None = None,
+    ) -> list[dict]:
+        """Departures to ``destination``, optionally within local ``hours`` and for ``airline``.
+
+        ``airline`` matches the IATA code exactly or the airline name as a
+        case-insensitive substring. Returns parsed copies: callers enrich
+        results in place and the board is shared between requests.
+        """
+        matches = self._by_destination.get(destination.strip().upper(), [])
+
+        if hours is not None and matches:
+            in_window = set(self._by_hour.get(None, ()))
+            for hour in hours:
+                in_window |= self._by_hour.get(hour, set())
+            matches = [i for i in matches if i in in_window]
+
+        query = (airline or "").strip().lower()
+        if query and matches:
+            by_code = self._by_airline.get(query.upper(), set())
+            matches = [
+                i for i in matches if i in by_code or query in self._airline_names[i]
+            ]
+
+        return [self._flight(i) for i in matches]
+
+
+async def get_departures_board(origin: str, date_str: str) -> DeparturesBoard:
+    """Cached board for ``origin`` on ``date_str``; fetched from FIDS on a miss.
+
+    Upstream errors propagate and are not cached. A legitimately empty day
+    is cached like any other board.
+    """
+    key = (origin.strip().upper(), date_str)
+    hit = _boards.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+
+    board = DeparturesBoard(key[0], await lookup_raw_departures(key[0], date_str))
+    if key not in _boards and len(_boards) >= BOARD_MAX_ENTRIES:
+        del _boards[next(iter(_boards))]
+    _boards[key] = (time.monotonic() + BOARD_TTL, board)
+    return board
+
+
+def clear() -> None:
+    """Drop every cached board (tests, manual invalidation)."""
+    _boards.clear()
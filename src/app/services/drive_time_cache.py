@@ -0,0 +1,210 @@
+"""Persistent cache of Google drive-time estimates.
+
+Used by ``google_maps.get_drive_time``. Every recommendation and every
+recompute used to pay for a Directions call plus two Distance Matrix calls;
+most of them asked Google the same question as a few minutes earlier. Two
+layers, like ``flight_cache``:
+
+* an in-process dict, so repeat reads within a worker skip the DB;
+* the ``drive_time_cache`` table, so entries survive deploys and are shared
+  by every worker and replica.
+
+Keys are coarse on purpose: the origin is rounded to a geohash cell (about
+1.2 x 0.6 km), the departure time to a DEPARTURE_BUCKET_SECONDS bucket, plus
+airport, terminal and transport mode. Traffic forecasts for a departure
+days out barely move, so those entries live for hours; close to departure
+live traffic matters and entries live for minutes. Fallback estimates are
+never cached.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+
+from app.db.models import DriveTimeCacheEntry
+from app.services.geocode_cache import normalize_address
+
+logger = logging.getLogger(__name__)
+
+GEOHASH_PRECISION = 6           # ~1.2 km x 0.6 km cells
+DEPARTURE_BUCKET_SECONDS = 900
+
+# (seconds-to-departure threshold, ttl seconds) — first matching tier wins.
+DRIVE_TIME_TTLS = [
+    (24 * 3600, 6 * 3600),  # > 1 day out: 6 h
+    (6 * 3600, 2 * 3600),   # 6-24 h: 2 h
+    (2 * 3600, 1800),       # 2-6 h: 30 min
+    (0, 600),               # < 2 h: 10 min
+]
+LIVE_TRAFFIC_TTL = 600      # no future departure time (live traffic): 10 min
+MEMORY_MAX_ENTRIES = 2000
+PRUNE_INTERVAL = 3600       # delete expired rows at most hourly per process
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# cache_key -> (expires_at epoch, result)
+_memory: dict[str, tuple[float, dict]] = {}
+_last_prune: float | None = None
+
+
+def geohash(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard base-32 geohash of a point."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def origin_cell(origin_address: str, coords: dict | None) -> str:
+    """Geohash cell of the origin, or its normalized address when it couldn't be geocoded."""
+    if coords and coords.get("lat") is not None and coords.get("lng") is not None:
+        return geohash(coords["lat"], coords["lng"])
+    return "addr:" + normalize_address(origin_address or "")
+
+
+def departure_bucket(departure_time: int | None, now: datetime) -> str:
+    """Bucket label for a departure timestamp; "now" when Google will use live traffic."""
+    if departure_time is None or departure_time <= int(now.timestamp()):
+        return "now"
+    return str(departure_time // DEPARTURE_BUCKET_SECONDS)
+
+
+def cache_key(
+    cell: str,
+    airport_iata: str | None,
+    terminal: str | None,
+    transport_mode: str,
+    bucket: str,
+    airport_name: str | None = None,
+) -> str:
+    parts = [cell, (airport_iata or "").upper(), terminal or "", transport_mode, bucket]
+    if airport_name:
+        parts.append(airport_name)
+    return "|".join(parts)
+
+
+def drive_time_ttl(departure_time: int | None, now: datetime) -> int:
+    """TTL in seconds for an estimate, shrinking as the departure nears."""
+    if departure_time is None:
+        return LIVE_TRAFFIC_TTL
+    seconds_out = departure_time - now.timestamp()
+    for threshold, ttl in DRIVE_TIME_TTLS:
+        if seconds_out > threshold:
+            return ttl
+    return LIVE_TRAFFIC_TTL
+
+
+def _remember(key: str, expires_at: float, result: dict) -> None:
+    if key not in _memory and len(_memory) >= MEMORY_MAX_ENTRIES:
+        del _memory[next(iter(_memory))]
+    _memory[key] = (expires_at, result)
+
+
+def _session_factory(session_factory):
+    if session_factory is not None:
+        return session_factory
+    import app.db as _db
+
+    return _db.async_session_factory
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+async def get_cached_drive_time(
+    key: str, *, now: datetime | None = None, session_factory=None
+) -> dict | None:
+    """Return a copy of the unexpired cached estimate, or None on a miss.
+
+    DB errors are logged and treated as a miss.
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    hit = _memory.get(key)
+    if hit is not None and hit[0] > now.timestamp():
+        return dict(hit[1])
+
+    factory = _session_factory(session_factory)
+    if factory is None:
+        return None
+    try:
+        async with factory() as session:
+            row = (
+                await session.execute(
+                    select(DriveTimeCacheEntry).where(DriveTimeCacheEntry.cache_key == key)
+                )
+            ).scalar_one_or_none()
+    except Exception:
+        logger.warning("drive time cache read failed for %s", key, exc_info=True)
+        return None
+    if row is None or _as_utc(row.expires_at) <= now:
+        return None
+    _remember(key, _as_utc(row.expires_at).timestamp(), dict(row.result))
+    return dict(row.result)
+
+
+async def store_drive_time(
+    key: str,
+    result: dict,
+    departure_time: int | None,
+    *,
+    now: datetime | None = None,
+    session_factory=None,
+) -> None:
+    """Cache a Google estimate in memory and in the drive_time_cache table."""
+    if result.get("source") == "fallback":
+        return
+    now = now or datetime.now(tz=timezone.utc)
+    expires_at = now + timedelta(seconds=drive_time_ttl(departure_time, now))
+    _remember(key, expires_at.timestamp(), dict(result))
+
+    factory = _session_factory(session_factory)
+    if factory is None:
+        return
+    try:
+        async with factory() as session:
+            await session.merge(
+                DriveTimeCacheEntry(
+                    cache_key=key,
+                    result=dict(result),
+                    fetched_at=now,
+                    expires_at=expires_at,
+                )
+            )
+            await _maybe_prune(session, now)
+            await session.commit()
+    except Exception:
+        logger.warning("drive time cache write failed for %s", key, exc_info=True)
+
+
+async def _maybe_prune(session, now: datetime) -> None:
+    global _last_prune
+    if _last_prune is not None and time.monotonic() - _last_prune < PRUNE_INTERVAL:
+        return
+    _last_prune = time.monotonic()
+    await session.execute(delete(DriveTimeCacheEntry).where(DriveTimeCacheEntry.expires_at < now))
+
+
+def clear_memory() -> None:
+    """Drop the in-process layer (tests, manual invalidation)."""
+    _memory.clear()
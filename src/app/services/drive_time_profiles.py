@@ -0,0 +1,197 @@
+"""Learned drive-time profiles: empirical quantiles from past Google answers.
+
+Every drive time Google returns is recorded as a sample under
+``(origin geohash cell, airport, transport mode, weekday, hour)``, with
+weekday and hour taken in the airport's local time. A sample is the
+answer's ``[expected, pessimistic, optimistic]`` minutes. A profile holds
+one sample per local departure date: recomputing the same trip replaces that
+date's sample instead of adding another, so the quantiles describe
+distinct days rather than one trip's retries. It keeps only the most
+recent PROFILE_MAX_SAMPLES dates, so it stays compact and follows changes
+in road conditions.
+
+For trips more than PROFILE_HORIZON out, live traffic says little about
+the eventual drive, so ``google_maps.get_drive_time`` answers from the
+profile once it has PROFILE_MIN_SAMPLES samples: the median of the
+expected drives, the 90th percentile of the pessimistic ones and the 10th
+percentile of the optimistic ones.
+Google is still called in the final hours, and those calls keep feeding
+the profiles.
+
+Two layers, like ``flight_cache``: an in-process dict and the
+``drive_time_profiles`` table. Memory entries are reread from the table
+after MEMORY_TTL, so each process picks up samples other workers
+recorded. Concurrent writers from different processes can still drop
+each other's newest sample; a profile is a rolling estimate, so that is
+harmless.
+"""
+
+import logging
+import math
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+
+from app.db.models import DriveTimeProfile
+from app.services.integrations.airport_defaults import AIRPORT_TIMEZONES
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HORIZON = 6 * 3600      # seconds to departure beyond which profiles answer
+PROFILE_MAX_SAMPLES = 48        # distinct departure dates kept per profile
+PROFILE_MIN_SAMPLES = 5         # distinct departure dates before a profile answers
+MEMORY_TTL = 300                # seconds before a memory entry is reread from the DB
+MEMORY_MAX_ENTRIES = 5000
+
+# profile_key -> (expires_at, {local departure date: [expected, pessimistic, optimistic]},
+#                 distance_text)
+_memory: dict[str, tuple[float, dict[str, list[int]], str | None]] = {}
+
+
+def _airport_local(airport_iata: str | None, when: datetime) -> datetime:
+    tz_name = AIRPORT_TIMEZONES.get((airport_iata or "").upper())
+    return when.astimezone(ZoneInfo(tz_name)) if tz_name else when.astimezone(timezone.utc)
+
+
+def profile_key(cell: str, airport_iata: str | None, transport_mode: str, when: datetime) -> str:
+    """Key for the weekday / hour of ``when`` in the airport's local time (UTC if unknown)."""
+    local = _airport_local(airport_iata, when)
+    return f"{cell}|{(airport_iata or '').upper()}|{transport_mode}|{local.weekday()}|{local.hour}"
+
+
+def quantile(samples: list[int], q: float) -> int:
+    """Linearly interpolated ``q`` quantile of ``samples``, rounded up to a whole minute."""
+    ordered = sorted(samples)
+    pos = (len(ordered) - 1) * q
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return math.ceil(ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo))
+
+
+def _remember(
+    key: str, samples: dict[str, list[int]], distance_text: str | None, now: datetime
+) -> tuple[dict[str, list[int]], str | None]:
+    if key not in _memory and len(_memory) >= MEMORY_MAX_ENTRIES:
+        del _memory[next(iter(_memory))]
+    _memory[key] = (now.timestamp() + MEMORY_TTL, samples, distance_text)
+    return samples, distance_text
+
+
+def _session_factory(session_factory):
+    if session_factory is not None:
+        return session_factory
+    import app.db as _db
+
+    return _db.async_session_factory
+
+
+async def _load(
+    key: str, session_factory, now: datetime
+) -> tuple[dict[str, list[int]], str | None] | None:
+    hit = _memory.get(key)
+    factory = _session_factory(session_factory)
+    if hit is not None and (factory is None or hit[0] > now.timestamp()):
+        return hit[1], hit[2]
+    if factory is None:
+        return None
+    try:
+        async with factory() as session:
+            row = (
+                await session.execute(
+                    select(DriveTimeProfile).where(DriveTimeProfile.profile_key == key)
+                )
+            ).scalar_one_or_none()
+    except Exception:
+        logger.warning("drive time profile read failed for %s", key, exc_info=True)
+        return (hit[1], hit[2]) if hit is not None else None
+    if row is None:
+        return (hit[1], hit[2]) if hit is not None else None
+    return _remember(key, dict(row.samples), row.distance_text, now)
+
+
+async def get_profile(
+    cell: str,
+    airport_iata: str | None,
+    transport_mode: str,
+    when: datetime,
+    *,
+    now: datetime | None = None,
+    session_factory=None,
+) -> dict | None:
+    """Quantiles for the profile covering ``when``, or None below PROFILE_MIN_SAMPLES dates.
+
+    Returns {"p10", "p50", "p90", "samples", "distance_text"}: p50 of the
+    expected drives, p90 of the pessimistic and p10 of the optimistic ones.
+    """
+    loaded = await _load(
+        profile_key(cell, airport_iata, transport_mode, when),
+        session_factory,
+        now or datetime.now(tz=timezone.utc),
+    )
+    if loaded is None or len(loaded[0]) < PROFILE_MIN_SAMPLES:
+        return None
+    expected, pessimistic, optimistic = zip(*loaded[0].values())
+    return {
+        "p10": quantile(list(optimistic), 0.1),
+        "p50": quantile(list(expected), 0.5),
+        "p90": quantile(list(pessimistic), 0.9),
+        "samples": len(expected),
+        "distance_text": loaded[1],
+    }
+
+
+async def record_drive_time(
+    cell: str,
+    airport_iata: str | None,
+    transport_mode: str,
+    when: datetime,
+    minutes: int,
+    distance_text: str | None = None,
+    *,
+    pessimistic: int | None = None,
+    optimistic: int | None = None,
+    now: datetime | None = None,
+    session_factory=None,
+) -> None:
+    """Record one Google answer as the sample for ``when``'s local date.
+
+    ``pessimistic`` / ``optimistic`` default to ``minutes``. A later answer
+    for the same date replaces the earlier one. DB errors are logged and
+    ignored.
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    key = profile_key(cell, airport_iata, transport_mode, when)
+    loaded = await _load(key, session_factory, now)
+    samples = dict(loaded[0]) if loaded else {}
+    samples[_airport_local(airport_iata, when).date().isoformat()] = [
+        int(minutes),
+        int(minutes if pessimistic is None else pessimistic),
+        int(minutes if optimistic is None else optimistic),
+    ]
+    samples = dict(sorted(samples.items())[-PROFILE_MAX_SAMPLES:])
+    if not distance_text or distance_text == "unknown":
+        distance_text = loaded[1] if loaded else None
+    _remember(key, samples, distance_text, now)
+
+    factory = _session_factory(session_factory)
+    if factory is None:
+        return
+    try:
+        async with factory() as session:
+            await session.merge(
+                DriveTimeProfile(
+                    profile_key=key,
+                    samples=samples,
+                    distance_text=distance_text,
+                    updated_at=now,
+                )
+            )
+            await session.commit()
+    except Exception:
+        logger.warning("drive time profile write failed for %s", key, exc_info=True)
+
+
+def clear_memory() -> None:
+    """Drop the in-process layer (tests, manual invalidation)."""
+    _memory.clear()
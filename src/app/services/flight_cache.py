@@ -0,0 +1,211 @@
+"""Persistent cache of AeroDataBox flight lookups with TTLs tiered by time to departure.
+
+Shared by ``build_flight_snapshot``, ``get_selected_flight`` and the polling
+agent's ``refresh_flight_status``. Two layers:
+
+* an in-process dict, so repeat reads within a worker skip the DB;
+* the ``flight_cache`` table, so entries survive deploys and are shared by
+  every worker and replica.
+
+Flights days out barely change, so their entries live for hours; close to
+departure gates and delays move quickly and entries live for minutes. The
+near-departure tiers never exceed the polling agent's cadence in the same
+band, so a poll never sees data older than its own interval.
+
+Expired entries are kept (rows for a day, see PRUNE_GRACE) as last known
+good data: ``get_stale_flights`` serves them, flagged, while AeroDataBox is
+down or the circuit breaker is open.
+
+Reads return a ``FlightIndex`` of immutable ``FlightRecord``s, so the
+memory layer is shared with callers without copying and timestamps are
+parsed once per lookup rather than on every read. Each record carries the
+entry's ``fetched_at``, so callers report the data's real age rather than
+the time it was read.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+
+from app.db.models import FlightCacheEntry
+from app.services.flight_record import FlightIndex
+
+logger = logging.getLogger(__name__)
+
+# (seconds-to-departure threshold, ttl seconds) — first matching tier wins.
+FLIGHT_CACHE_TTLS = [
+    (72 * 3600, 6 * 3600),  # > 3 days out: 6 h
+    (24 * 3600, 2 * 3600),  # 1-3 days: 2 h
+    (6 * 3600, 1800),       # 6-24 h: 30 min
+    (2 * 3600, 600),        # 2-6 h: 10 min
+    (0, 240),               # < 2 h: 4 min
+]
+DEPARTED_TTL = 120          # departed / unparseable times: 2 min
+MEMORY_MAX_ENTRIES = 1000
+PRUNE_INTERVAL = 3600       # delete long-expired rows at most hourly per process
+PRUNE_GRACE = timedelta(days=1)
+
+# cache_key -> (expires_at epoch, fetched_at, flights)
+_memory: dict[str, tuple[float, datetime, FlightIndex]] = {}
+_last_prune: float | None = None
+
+
+def cache_key(flight_number: str, date_str: str) -> str:
+    return f"{flight_number.strip().upper()}|{date_str}"
+
+
+def flight_cache_ttl(flights: FlightIndex | list[dict], now: datetime) -> int:
+    """TTL in seconds for a lookup result, from its earliest upcoming departure."""
+    if not isinstance(flights, FlightIndex):
+        flights = FlightIndex.from_dicts(flights)
+    departures = [f.revised_departure or f.scheduled_departure for f in flights]
+    upcoming = [d for d in departures if d is not None and d > now]
+    if not upcoming:
+        return DEPARTED_TTL
+    seconds_out = (min(upcoming) - now).total_seconds()
+    for threshold, ttl in FLIGHT_CACHE_TTLS:
+        if seconds_out > threshold:
+            return ttl
+    return DEPARTED_TTL
+
+
+def _remember(
+    key: str, expires_at: float, fetched_at: datetime, flights: FlightIndex
+) -> FlightIndex:
+    """Hold ``flights``, stamped with ``fetched_at``, in the memory layer and return them."""
+    if key not in _memory and len(_memory) >= MEMORY_MAX_ENTRIES:
+        del _memory[next(iter(_memory))]
+    flights = flights.as_fetched(fetched_at.isoformat())
+    _memory[key] = (expires_at, fetched_at, flights)
+    return flights
+
+
+def _session_factory(session_factory):
+    if session_factory is not None:
+        return session_factory
+    import app.db as _db
+
+    return _db.async_session_factory
+
+
+async def get_cached_flights(
+    flight_number: str, date_str: str, *, now: datetime | None = None, session_factory=None
+) -> FlightIndex | None:
+    """Return unexpired cached flights, or None on a miss.
+
+    DB errors are logged and treated as a miss — the cache must never be
+    the reason a lookup fails.
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    key = cache_key(flight_number, date_str)
+    hit = _memory.get(key)
+    if hit is not None:
+        expires_at, _, flights = hit
+        if expires_at > now.timestamp():
+            return flights
+        # Expired here; another worker may have refreshed the shared row.
+
+    row = await _load_row(key, session_factory)
+    if row is None:
+        return None
+    expires_at = _as_utc(row.expires_at)
+    flights = _remember(
+        key, expires_at.timestamp(), _as_utc(row.fetched_at), FlightIndex.from_dicts(row.flights)
+    )
+    if expires_at <= now:
+        return None
+    return flights
+
+
+async def get_stale_flights(
+    flight_number: str, date_str: str, *, session_factory=None
+) -> FlightIndex | None:
+    """Last known good flights regardless of expiry, or None if never cached.
+
+    Each flight carries ``stale=True`` and ``stale_as_of`` (when it was
+    fetched) so callers can flag the data and avoid overwriting newer state.
+    """
+    key = cache_key(flight_number, date_str)
+    hit = _memory.get(key)
+    if hit is not None:
+        _, fetched_at, flights = hit
+    else:
+        row = await _load_row(key, session_factory)
+        if row is None:
+            return None
+        fetched_at, flights = _as_utc(row.fetched_at), FlightIndex.from_dicts(row.flights)
+    return flights.as_stale(fetched_at.isoformat())
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+async def _load_row(key: str, session_factory) -> FlightCacheEntry | None:
+    factory = _session_factory(session_factory)
+    if factory is None:
+        return None
+    try:
+        async with factory() as session:
+            return (
+                await session.execute(
+                    select(FlightCacheEntry).where(FlightCacheEntry.cache_key == key)
+                )
+            ).scalar_one_or_none()
+    except Exception:
+        logger.warning("flight cache read failed for %s", key, exc_info=True)
+        return None
+
+
+async def store_flights(
+    flight_number: str,
+    date_str: str,
+    flights: FlightIndex | list[dict],
+    *,
+    now: datetime | None = None,
+    session_factory=None,
+) -> None:
+    """Cache a non-empty lookup result in memory and in the flight_cache table."""
+    if not flights:
+        return
+    if not isinstance(flights, FlightIndex):
+        flights = FlightIndex.from_dicts(flights)
+    now = now or datetime.now(tz=timezone.utc)
+    key = cache_key(flight_number, date_str)
+    expires_at = now + timedelta(seconds=flight_cache_ttl(flights, now))
+    _remember(key, expires_at.timestamp(), now, flights)
+
+    factory = _session_factory(session_factory)
+    if factory is None:
+        return
+    try:
+        async with factory() as session:
+            await session.merge(
+                FlightCacheEntry(
+                    cache_key=key,
+                    flights=flights.to_dicts(),
+                    fetched_at=now,
+                    expires_at=expires_at,
+                )
+            )
+            await _maybe_prune(session, now)
+            await session.commit()
+    except Exception:
+        logger.warning("flight cache write failed for %s", key, exc_info=True)
+
+
+async def _maybe_prune(session, now: datetime) -> None:
+    global _last_prune
+    if _last_prune is not None and time.monotonic() - _last_prune < PRUNE_INTERVAL:
+        return
+    _last_prune = time.monotonic()
+    await session.execute(
+        delete(FlightCacheEntry).where(FlightCacheEntry.expires_at < now - PRUNE_GRACE)
+    )
+
+
+def clear_memory() -> None:
+    """Drop the in-process layer (tests, manual invalidation)."""
+    _memory.clear()
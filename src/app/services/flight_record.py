@@ -0,0 +1,179 @@
+"""Compact in-process representation of parsed AeroDataBox flights.
+
+``parse_flight`` / ``parse_departure`` produce plain dicts with string
+timestamps, which is what the API returns and what the ``flight_cache``
+table stores. Inside the process (flight cache memory layer, flight
+selection, flight_info / flight_status building, the polling agent) flights
+are held as ``FlightRecord``: a frozen, slotted dataclass whose timestamps
+are parsed exactly once. ``FlightIndex`` groups the records of one lookup
+and finds the trip's flight by ``departure_time_utc`` in O(1).
+
+Records convert back to the original dict shape with ``to_dict`` wherever
+data leaves the process (API responses, the flight_cache JSON column).
+"""
+
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timezone
+from typing import Any
+
+
+def parse_utc(s: str | None) -> datetime | None:
+    """Parse an ADB UTC string ('2026-03-07 18:09Z') or ISO 8601 string to an aware datetime."""
+    if not s:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(s).strip().replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def local_hour(local_str: str | None) -> int | None:
+    """Hour of a local time string like '2026-03-07 06:00' (or ADB's '2026-03-07 06:00-08:00')."""
+    if not local_str:
+        return None
+    try:
+        return datetime.fromisoformat(local_str.strip()).hour
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class FlightRecord:
+    """One parsed flight. String fields mirror the ``parse_flight`` dict keys."""
+
+    flight_number: str | None = None
+    airline_name: str | None = None
+    origin_iata: str | None = None
+    origin_name: str | None = None
+    destination_iata: str | None = None
+    destination_name: str | None = None
+    departure_time_local: str | None = None
+    departure_time_utc: str | None = None
+    arrival_time_local: str | None = None
+    arrival_time_utc: str | None = None
+    revised_departure_local: str | None = None
+    revised_departure_utc: str | None = None
+    departure_terminal: str | None = None
+    departure_gate: str | None = None
+    arrival_terminal: str | None = None
+    status: str | None = None
+    is_delayed: bool = False
+    aircraft_model: str | None = None
+    # Last known good data served during an outage (see flight_cache.get_stale_flights)
+    stale: bool = False
+    stale_as_of: str | None = None
+    # When the lookup behind this record was fetched, for records served
+    # from flight_cache (None when fresh from AeroDataBox)
+    fetched_at: str | None = field(default=None, compare=False)
+    # Keys outside the known shape, kept so to_dict() round-trips losslessly
+    extras: tuple[tuple[str, Any], ...] = ()
+
+    # Parsed once from the strings above
+    scheduled_departure: datetime | None = field(default=None, compare=False, repr=False)
+    revised_departure: datetime | None = field(default=None, compare=False, repr=False)
+    scheduled_arrival: datetime | None = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_dict(cls, flight: dict) -> "FlightRecord":
+        known = {k: v for k, v in flight.items() if k in _DICT_FIELDS}
+        return cls(
+            **known,
+            extras=tuple((k, v) for k, v in flight.items() if k not in _DICT_FIELDS),
+            scheduled_departure=parse_utc(known.get("departure_time_utc")),
+            revised_departure=parse_utc(known.get("revised_departure_utc")),
+            scheduled_arrival=parse_utc(known.get("arrival_time_utc")),
+        )
+
+    def to_dict(self) -> dict:
+        """The original dict shape (``stale`` keys only when stale)."""
+        out = {name: getattr(self, name) for name in _PARSE_FIELDS}
+        if self.stale:
+            out["stale"] = True
+            out["stale_as_of"] = self.stale_as_of
+        out.update(self.extras)
+        return out
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style read, for code and tests written against the dict shape."""
+        if key in _DICT_FIELDS:
+            return getattr(self, key)
+        return dict(self.extras).get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _DICT_FIELDS:
+            return getattr(self, key)
+        return dict(self.extras)[key]
+
+    @property
+    def delayed_departure(self) -> datetime | None:
+        """Revised departure when it is later than scheduled, else None."""
+        if self.revised_departure and self.scheduled_departure and (
+            self.revised_departure > self.scheduled_departure
+        ):
+            return self.revised_departure
+        return None
+
+    def as_stale(self, as_of: str) -> "FlightRecord":
+        return replace(self, stale=True, stale_as_of=as_of)
+
+    def as_fetched(self, fetched_at: str) -> "FlightRecord":
+        return replace(self, fetched_at=fetched_at)
+
+
+_PARSED_FIELDS = {"scheduled_departure", "revised_departure", "scheduled_arrival", "extras"}
+_DICT_FIELDS = frozenset(
+    f.name for f in fields(FlightRecord) if f.name not in _PARSED_FIELDS and f.name != "fetched_at"
+)
+_PARSE_FIELDS = tuple(
+    f.name for f in fields(FlightRecord)
+    if f.name in _DICT_FIELDS and f.name not in ("stale", "stale_as_of")
+)
+
+
+class FlightIndex:
+    """The flights returned by one lookup, indexed by ``departure_time_utc``."""
+
+    __slots__ = ("records", "_by_departure")
+
+    def __init__(self, records) -> None:
+        self.records: tuple[FlightRecord, ...] = tuple(records)
+        self._by_departure: dict[str, FlightRecord] = {}
+        for record in self.records:
+            key = (record.departure_time_utc or "").strip()
+            if key:
+                self._by_departure.setdefault(key, record)
+
+    @classmethod
+    def from_dicts(cls, flights) -> "FlightIndex":
+        return cls(
+            f if isinstance(f, FlightRecord) else FlightRecord.from_dict(f) for f in flights
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, i: int) -> FlightRecord:
+        return self.records[i]
+
+    def find(self, departure_utc: str | None) -> FlightRecord | None:
+        """The flight departing at ``departure_utc`` exactly, or None."""
+        return self._by_departure.get((departure_utc or "").strip())
+
+    def select(self, selected_utc: str | None) -> FlightRecord | None:
+        """The flight matching ``selected_utc``; falls back to the first flight."""
+        if not self.records:
+            return None
+        return self.find(selected_utc) or self.records[0]
+
+    def to_dicts(self) -> list[dict]:
+        return [r.to_dict() for r in self.records]
+
+    def as_stale(self, as_of: str) -> "FlightIndex":
+        return FlightIndex(r.as_stale(as_of) for r in self.records)
+
+    def as_fetched(self, fetched_at: str) -> "FlightIndex":
+        return FlightIndex(r.as_fetched(fetched_at) for r in self.records)
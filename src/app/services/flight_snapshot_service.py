@@ -1,86 +1,114 @@
 """Build flight snapshot from trip context. Uses AeroDataBox for live flight data."""
 
+import contextlib
 import logging
 from datetime import datetime, timezone, timedelta
 
 logger = logging.getLogger(__name__)
 
+from app.core import deadline
+from app.db.models import Trip
 from app.schemas.flight_snapshot import FlightSnapshot
 from app.schemas.trips import TripContext
-from app.services.integrations.aerodatabox import AeroDataBoxError, lookup_flights
-
-# In-memory cache: "flight_number|date" -> list of flight dicts.
-# Scope after Phase 2: track-time dedup only. The polling agent no longer routes through
-# build_flight_snapshot; it reads flight_info/flight_status columns and uses
-# refresh_flight_status for live updates. Entries here live until process restart.
-_flight_cache: dict[str, list[dict]] = {}
-_FLIGHT_CACHE_MAX = 1000
-
-
-def get_available_flights(flight_number: str, date_str: str) -> list[dict]:
+from app.services import flight_cache
+from app.services.flight_record import FlightIndex, FlightRecord, local_hour, parse_utc
+from app.services.integrations.aerodatabox import (
+    AeroDataBoxError,
+    AeroDataBoxRateLimited,
+    AeroDataBoxTimeout,
+    AeroDataBoxUnavailable,
+    lookup_flights,
+)
+
+# Upstream failures that are answered with last known good data when we have
+# it (outage, open breaker, 429 or quota deferral). NotFound is a real answer
+# and is never papered over.
+STALE_FALLBACK_ERRORS = (AeroDataBoxUnavailable, AeroDataBoxTimeout, AeroDataBoxRateLimited)
+
+
+async def get_available_flights(flight_number: str, date_str: str) -> list[dict]:
     """Return list of flight options from AeroDataBox for the given flight number and date."""
-    return lookup_flights(flight_number, date_str)
+    return await lookup_flights(flight_number, date_str)
 
 
-def _select_flight(flights: list[dict], selected_utc: str | None) -> dict | None:
+def _select_flight(flights: FlightIndex | None, selected_utc: str | None) -> FlightRecord | None:
     """Pick the flight whose departure_time_utc matches selected_utc; fall back to first."""
     if not flights:
         return None
-    selected_utc = (selected_utc or "").strip()
-    if selected_utc:
-        return next(
-            (
-                f
-                for f in flights
-                if (f.get("departure_time_utc") or "").strip() == selected_utc
-            ),
-            flights[0],
-        )
-    return flights[0]
+    return flights.select(selected_utc)
 
 
-def get_selected_flight(
+async def get_selected_flight(
     flight_number: str, date_str: str, selected_utc: str | None
-) -> dict | None:
+) -> FlightRecord | None:
     """Return the single ADB flight dict matching selected_utc.
 
-    Hits the module-level ``_flight_cache`` populated by ``build_flight_snapshot``
+    Reads through the shared ``flight_cache`` populated by ``build_flight_snapshot``
     to avoid a redundant AeroDataBox call when track has already computed a
     recommendation. Calls ``lookup_flights`` only on cache miss.
     """
-    cache_key = f"{flight_number}|{date_str}"
-    flights = _flight_cache.get(cache_key)
-    if flights is None:
-        flights = lookup_flights(flight_number, date_str)
-        if flights:
-            if len(_flight_cache) >= _FLIGHT_CACHE_MAX:
-                oldest_key = next(iter(_flight_cache))
-                del _flight_cache[oldest_key]
-            _flight_cache[cache_key] = flights
+    flights = await lookup_flights_cached(flight_number, date_str)
     return _select_flight(flights, selected_utc)
 
 
-def _iso_utc(s: str | None) -> str | None:
-    """Normalize an ADB UTC string (e.g. '2026-04-10 14:00Z') to ISO 8601 with +00:00."""
-    dt = _parse_utc_datetime(s)
-    return dt.isoformat() if dt else None
+async def lookup_flights_cached(
+    flight_number: str, date_str: str, *, upstream_slot=None
+) -> FlightIndex:
+    """``lookup_flights`` behind the tiered-TTL flight cache.
+
+    On an upstream outage the last known good flights are returned instead,
+    marked ``stale``; errors propagate only when there is nothing cached.
+    ``upstream_slot`` is an async context manager held around the upstream
+    call only (the polling agent's ADB concurrency cap), so cache hits never
+    wait for it.
+    """
+    flights = await flight_cache.get_cached_flights(flight_number, date_str)
+    if flights is None:
+        try:
+            async with upstream_slot or contextlib.nullcontext():
+                flights = FlightIndex.from_dicts(await lookup_flights(flight_number, date_str))
+        except STALE_FALLBACK_ERRORS as e:
+            return await stale_flights_or_raise(flight_number, date_str, e)
+        await flight_cache.store_flights(flight_number, date_str, flights)
+    return flights
+
+
+async def stale_flights_or_raise(
+    flight_number: str, date_str: str, error: AeroDataBoxError
+) -> FlightIndex:
+    """Serve last known good flights for a failed lookup, or re-raise ``error``."""
+    stale = await flight_cache.get_stale_flights(flight_number, date_str)
+    if not stale:
+        raise error
+    logger.warning(
+        "Serving stale flight data for %s %s (as of %s): %s",
+        flight_number, date_str, stale[0].stale_as_of, type(error).__name__,
+    )
+    return stale
 
 
-def build_flight_info_and_status(flight: dict | None) -> tuple[dict | None, dict | None]:
-    """Convert a raw AeroDataBox flight dict into the (flight_info, flight_status) pair.
+def build_flight_info_and_status(
+    flight: FlightRecord | dict | None,
+) -> tuple[dict | None, dict | None]:
+    """Convert a parsed AeroDataBox flight into the (flight_info, flight_status) pair.
 
     ``flight_info`` is the frozen-at-track-time record (schedule, route, aircraft, terminal).
     ``flight_status`` is the live record (gate, status, delay) updated by the polling agent.
 
-    Returns (None, None) for a None/empty input.
+    Accepts a ``FlightRecord`` or the equivalent ``parse_flight`` dict.
+    Returns (None, None) for a None/empty input. Staleness is not persisted:
+    last known good data is dated by ``last_updated_at``, and callers check
+    ``flight.stale`` before storing either record.
     """
     if not flight:
         return None, None
+    if not isinstance(flight, FlightRecord):
+        flight = FlightRecord.from_dict(flight)
 
     now_iso = datetime.now(tz=timezone.utc).isoformat()
 
-    scheduled_dep_dt = _parse_utc_datetime(flight.get("departure_time_utc"))
-    scheduled_arr_dt = _parse_utc_datetime(flight.get("arrival_time_utc"))
+    scheduled_dep_dt = flight.scheduled_departure
+    scheduled_arr_dt = flight.scheduled_arrival
     duration_minutes = None
     if scheduled_dep_dt and scheduled_arr_dt:
         duration_minutes = int(
@@ -89,41 +117,42 @@ def build_flight_info_and_status(flight: dict | None) -> tuple[dict | None, dict
 
     # departure_local_hour is needed by recommendation_service for TSA bucket selection.
     # Prefer the local-time string from ADB; fall back to UTC hour when local is missing.
-    local_hour = _extract_local_hour(flight.get("departure_time_local"))
-    if local_hour is None and scheduled_dep_dt is not None:
-        local_hour = scheduled_dep_dt.hour
+    departure_local_hour = local_hour(flight.departure_time_local)
+    if departure_local_hour is None and scheduled_dep_dt is not None:
+        departure_local_hour = scheduled_dep_dt.hour
 
     flight_info = {
-        "airline": flight.get("airline_name"),
-        "flight_number": flight.get("flight_number"),
-        "origin_iata": flight.get("origin_iata"),
-        "destination_iata": flight.get("destination_iata"),
-        "destination_name": flight.get("destination_name"),
+        "airline": flight.airline_name,
+        "flight_number": flight.flight_number,
+        "origin_iata": flight.origin_iata,
+        "destination_iata": flight.destination_iata,
+        "destination_name": flight.destination_name,
         "scheduled_departure_at": scheduled_dep_dt.isoformat() if scheduled_dep_dt else None,
-        "scheduled_departure_local": flight.get("departure_time_local"),
+        "scheduled_departure_local": flight.departure_time_local,
         "scheduled_arrival_at": scheduled_arr_dt.isoformat() if scheduled_arr_dt else None,
-        "aircraft_type": flight.get("aircraft_model"),
-        "terminal": flight.get("departure_terminal"),
+        "aircraft_type": flight.aircraft_model,
+        "terminal": flight.departure_terminal,
         "duration_minutes": duration_minutes,
-        "departure_local_hour": local_hour,
+        "departure_local_hour": departure_local_hour,
         "snapshot_taken_at": now_iso,
     }
 
-    revised_dt = _parse_utc_datetime(flight.get("revised_departure_utc"))
     delay_minutes = 0
     actual_departure_at = None
-    if revised_dt and scheduled_dep_dt and revised_dt > scheduled_dep_dt:
+    revised_dt = flight.delayed_departure
+    if revised_dt:
         delay_minutes = int((revised_dt - scheduled_dep_dt).total_seconds() // 60)
         actual_departure_at = revised_dt.isoformat()
 
-    status_value = flight.get("status")
+    status_value = flight.status
     flight_status = {
-        "gate": flight.get("departure_gate"),
+        "gate": flight.departure_gate,
         "status": status_value,
         "delay_minutes": delay_minutes,
         "actual_departure_at": actual_departure_at,
         "cancelled": status_value == "Cancelled",
-        "last_updated_at": now_iso,
+        # Cached or last known good data is dated by when it was fetched
+        "last_updated_at": flight.stale_as_of or flight.fetched_at or now_iso,
     }
 
     return flight_info, flight_status
@@ -144,7 +173,7 @@ def snapshot_from_columns(
     if not flight_info:
         return None
 
-    scheduled_dep = _parse_utc_datetime(flight_info.get("scheduled_departure_at"))
+    scheduled_dep = parse_utc(flight_info.get("scheduled_departure_at"))
     if scheduled_dep is None:
         return None
 
@@ -165,26 +194,34 @@ def snapshot_from_columns(
     )
 
 
-def _parse_utc_datetime(s: str | None) -> datetime | None:
-    """Parse AeroDataBox UTC string (e.g. '2026-03-07 18:09Z') to timezone-aware datetime."""
-    if not s:
-        return None
-    try:
-        normalized = (s or "").strip().replace("Z", "+00:00")
-        return datetime.fromisoformat(normalized)
-    except (ValueError, TypeError):
-        return None
+async def _persisted_snapshot(trip_context: TripContext) -> FlightSnapshot | None:
+    """The trip's stored flight snapshot, marked stale, if it is for the same flight.
 
+    Edit-mode previews override the flight on the context; the stored
+    columns describe the saved flight, so they don't apply then.
+    """
+    import app.db as _db
 
-def _extract_local_hour(local_str: str | None) -> int | None:
-    """Extract the hour from a local time string like '2026-03-07 06:00'."""
-    if not local_str:
+    if _db.async_session_factory is None:
         return None
     try:
-        dt = datetime.fromisoformat(local_str.strip())
-        return dt.hour
-    except (ValueError, TypeError):
+        async with _db.async_session_factory() as session:
+            row = await session.get(Trip, trip_context.trip_id)
+    except Exception:
+        logger.warning("stored snapshot read failed for trip %s", trip_context.trip_id, exc_info=True)
+        return None
+    if row is None or (
+        row.flight_number,
+        str(row.departure_date),
+        row.selected_departure_utc,
+    ) != (
+        trip_context.flight_number,
+        str(trip_context.departure_date),
+        trip_context.selected_departure_utc,
+    ):
         return None
+    snapshot = snapshot_from_columns(row.flight_info, row.flight_status)
+    return snapshot.model_copy(update={"is_stale": True}) if snapshot else None
 
 
 def _build_fallback_snapshot(
@@ -208,7 +245,7 @@ def _build_fallback_snapshot(
     )
 
 
-def build_flight_snapshot(
+async def build_flight_snapshot(
     trip_context: TripContext, *, strict: bool = False
 ) -> FlightSnapshot:
     """Build a FlightSnapshot from the trip context.
@@ -220,7 +257,9 @@ def build_flight_snapshot(
     * strict=True: re-raise ``AeroDataBoxError`` so the caller (a user-
       initiated recommendation route) can translate it to an HTTP 503.
       Prevents showing the user a lying 10 AM UTC fallback recommendation
-      during an upstream outage.
+      during an upstream outage. When the lookup was only cut short by the
+      request budget (ADB slow, not down), the trip's stored flight data is
+      served instead, marked stale, if there is any.
 
     Hybrid exception handling: genuinely unexpected exceptions (parse
     crashes, downstream code bugs, etc.) still fall back in *both* modes.
@@ -235,76 +274,63 @@ def build_flight_snapshot(
     )
     try:
         if trip_context.flight_number and trip_context.departure_date:
-            cache_key = f"{trip_context.flight_number}|{trip_context.departure_date}"
-            if cache_key in _flight_cache:
-                flights = _flight_cache[cache_key]
-            else:
-                try:
-                    flights = lookup_flights(
-                        trip_context.flight_number, str(trip_context.departure_date)
-                    )
-                except AeroDataBoxError as e:
-                    if strict:
-                        raise
-                    logger.warning(
-                        "build_flight_snapshot fell back due to %s",
-                        type(e).__name__,
-                    )
-                    return _build_fallback_snapshot(trip_context, airport_code)
-                if flights:
-                    if len(_flight_cache) >= _FLIGHT_CACHE_MAX:
-                        oldest_key = next(iter(_flight_cache))
-                        del _flight_cache[oldest_key]
-                    _flight_cache[cache_key] = flights
+            try:
+                flights = await lookup_flights_cached(
+                    trip_context.flight_number, str(trip_context.departure_date)
+                )
+            except AeroDataBoxError as e:
+                if strict:
+                    if deadline.is_degraded("flight"):
+                        persisted = await _persisted_snapshot(trip_context)
+                        if persisted is not None:
+                            logger.warning(
+                                "build_flight_snapshot served stored flight data for trip %s "
+                                "after the request budget ran out",
+                                trip_context.trip_id,
+                            )
+                            return persisted
+                    raise
+                logger.warning(
+                    "build_flight_snapshot fell back due to %s",
+                    type(e).__name__,
+                )
+                return _build_fallback_snapshot(trip_context, airport_code)
             if flights:
                 selected_utc = (trip_context.selected_departure_utc or "").strip()
                 logger.debug("selected_departure_utc: '%s'", selected_utc)
                 logger.debug(
                     "available flights: %s",
-                    [(f.get("departure_time_utc"), f.get("origin_iata")) for f in flights],
+                    [(f.departure_time_utc, f.origin_iata) for f in flights],
                 )
-                if selected_utc:
-                    flight = next(
-                        (
-                            f
-                            for f in flights
-                            if (f.get("departure_time_utc") or "").strip() == selected_utc
-                        ),
-                        flights[0],
-                    )
-                else:
-                    flight = flights[0]
+                flight = flights.select(selected_utc)
                 logger.debug(
                     "matched: %s %s -> %s",
-                    flight.get("departure_time_utc"),
-                    flight.get("origin_iata"),
-                    flight.get("destination_iata"),
+                    flight.departure_time_utc,
+                    flight.origin_iata,
+                    flight.destination_iata,
                 )
-                origin_iata = flight.get("origin_iata")
 
                 # Use revised departure if the flight is delayed
-                scheduled_utc = _parse_utc_datetime(flight.get("departure_time_utc"))
-                revised_utc = _parse_utc_datetime(flight.get("revised_departure_utc"))
-                if revised_utc and scheduled_utc and revised_utc > scheduled_utc:
+                revised_utc = flight.delayed_departure
+                if revised_utc:
                     scheduled_departure = revised_utc
                     # Extract local hour from revised local time if available,
                     # otherwise fall back to the revised UTC hour
-                    local_hour = _extract_local_hour(
-                        flight.get("revised_departure_local")
-                    ) or (revised_utc.hour if revised_utc else None)
-                else:
-                    scheduled_departure = scheduled_utc
-                    local_hour = _extract_local_hour(
-                        flight.get("departure_time_local")
+                    departure_local_hour = (
+                        local_hour(flight.revised_departure_local) or revised_utc.hour
                     )
+                else:
+                    scheduled_departure = flight.scheduled_departure
+                    departure_local_hour = local_hour(flight.departure_time_local)
 
                 if scheduled_departure is not None:
                     return FlightSnapshot(
                         scheduled_departure=scheduled_departure,
-                        departure_terminal=flight.get("departure_terminal"),
-                        departure_gate=flight.get("departure_gate"),
-                        origin_airport_code=origin_iata,
-                        departure_local_hour=local_hour,
+                        departure_terminal=flight.departure_terminal,
+                        departure_gate=flight.departure_gate,
+                        origin_airport_code=flight.origin_iata,
+                        departure_local_hour=departure_local_hour,
+                        is_stale=flight.stale,
                     )
         return _build_fallback_snapshot(trip_context, airport_code)
     except AeroDataBoxError:
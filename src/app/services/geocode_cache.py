@@ -0,0 +1,171 @@
+"""Bounded, persistent cache of Google geocoding results.
+
+Used by ``google_maps.geocode_address`` for home addresses and for the
+terminal geocode fallback in ``get_terminal_coordinates``. Two layers, like
+``flight_cache``:
+
+* an in-process LRU of at most MEMORY_MAX_ENTRIES queries;
+* the ``geocode_cache`` table, so results survive deploys and are shared by
+  every worker and replica.
+
+Keys are normalized addresses (see ``normalize_address``) so trivially
+different spellings of the same address share an entry. Coordinates for an
+address don't change, but Google's terms limit how long geocodes may be
+stored, so entries expire after GEOCODE_TTL. Only successful geocodes are
+cached; an address Google can't resolve is retried on the next request.
+"""
+
+import logging
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+
+from app.db.models import GeocodeCacheEntry
+
+logger = logging.getLogger(__name__)
+
+GEOCODE_TTL = timedelta(days=30)
+MEMORY_MAX_ENTRIES = 5000
+PRUNE_INTERVAL = 3600       # delete expired rows at most hourly per process
+
+# Street-suffix and direction spellings folded onto one form for the key
+_ABBREVIATIONS = {
+    "street": "st",
+    "avenue": "ave",
+    "boulevard": "blvd",
+    "road": "rd",
+    "drive": "dr",
+    "lane": "ln",
+    "court": "ct",
+    "place": "pl",
+    "parkway": "pkwy",
+    "highway": "hwy",
+    "suite": "ste",
+    "apartment": "apt",
+    "north": "n",
+    "south": "s",
+    "east": "e",
+    "west": "w",
+}
+_WORD = re.compile(r"[a-z0-9#]+")
+
+# query_key -> (expires_at epoch, {"lat": ..., "lng": ...})
+_memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_last_prune: float | None = None
+
+
+def normalize_address(address: str) -> str:
+    """Cache key for an address: case, punctuation, spacing and common
+    abbreviations folded, comma-separated components preserved.
+
+    "123 Main Street,  San Francisco, CA." and "123 main st, san francisco, ca"
+    map to the same key.
+    """
+    parts = []
+    for component in address.casefold().split(","):
+        words = [_ABBREVIATIONS.get(w, w) for w in _WORD.findall(component)]
+        if words:
+            parts.append(" ".join(words))
+    return ", ".join(parts)
+
+
+def _remember(key: str, expires_at: float, coords: dict) -> None:
+    _memory[key] = (expires_at, coords)
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_MAX_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def _session_factory(session_factory):
+    if session_factory is not None:
+        return session_factory
+    import app.db as _db
+
+    return _db.async_session_factory
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+async def get_cached_geocode(
+    address: str, *, now: datetime | None = None, session_factory=None
+) -> dict | None:
+    """Return cached {"lat", "lng"} for ``address``, or None on a miss.
+
+    DB errors are logged and treated as a miss.
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    key = normalize_address(address)
+    hit = _memory.get(key)
+    if hit is not None:
+        expires_at, coords = hit
+        if expires_at > now.timestamp():
+            _memory.move_to_end(key)
+            return dict(coords)
+        del _memory[key]
+
+    factory = _session_factory(session_factory)
+    if factory is None:
+        return None
+    try:
+        async with factory() as session:
+            row = (
+                await session.execute(
+                    select(GeocodeCacheEntry).where(GeocodeCacheEntry.query_key == key)
+                )
+            ).scalar_one_or_none()
+    except Exception:
+        logger.warning("geocode cache read failed for %s", key, exc_info=True)
+        return None
+    if row is None or _as_utc(row.expires_at) <= now:
+        return None
+    coords = {"lat": row.lat, "lng": row.lng}
+    _remember(key, _as_utc(row.expires_at).timestamp(), coords)
+    return dict(coords)
+
+
+async def store_geocode(
+    address: str, coords: dict, *, now: datetime | None = None, session_factory=None
+) -> None:
+    """Cache a successful geocode in memory and in the geocode_cache table."""
+    now = now or datetime.now(tz=timezone.utc)
+    key = normalize_address(address)
+    expires_at = now + GEOCODE_TTL
+    coords = {"lat": coords["lat"], "lng": coords["lng"]}
+    _remember(key, expires_at.timestamp(), coords)
+
+    factory = _session_factory(session_factory)
+    if factory is None:
+        return
+    try:
+        async with factory() as session:
+            await session.merge(
+                GeocodeCacheEntry(
+                    query_key=key,
+                    lat=coords["lat"],
+                    lng=coords["lng"],
+                    fetched_at=now,
+                    expires_at=expires_at,
+                )
+            )
+            await _maybe_prune(session, now)
+            await session.commit()
+    except Exception:
+        logger.warning("geocode cache write failed for %s", key, exc_info=True)
+
+
+async def _maybe_prune(session, now: datetime) -> None:
+    global _last_prune
+    if _last_prune is not None and time.monotonic() - _last_prune < PRUNE_INTERVAL:
+        return
+    _last_prune = time.monotonic()
+    await session.execute(delete(GeocodeCacheEntry).where(GeocodeCacheEntry.expires_at < now))
+
+
+def clear_memory() -> None:
+    """Drop the in-process layer (tests, manual invalidation)."""
+    _memory.clear()
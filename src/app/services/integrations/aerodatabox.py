@@ -1,11 +1,88 @@
+import asyncio
+import contextlib
 import logging
 
 import httpx
 
+from app.core import deadline
+from app.core.circuit_breaker import HALF_OPEN, CircuitBreaker
 from app.core.config import settings
+from app.core.singleflight import SingleFlight
+from app.services.integrations.rapidapi_quota import current_priority, quota
 
 logger = logging.getLogger(__name__)
 
+ADB_BASE_URL = "https://aerodatabox.p.rapidapi.com"
+FLIGHT_TIMEOUT = 10      # seconds, flight-by-number lookups
+DEPARTURES_TIMEOUT = 15  # seconds, FIDS windows (larger payloads)
+# Share of a request's remaining latency budget one ADB call may use. The
+# flight lookup runs before the maps/TSA fan-out, so it leaves them half.
+BUDGET_SHARE = 0.5
+
+# Process-wide client: keeps TLS connections to RapidAPI alive across calls
+# instead of paying a fresh handshake per lookup. Bound to the event loop it
+# was created on; get_client() replaces it if called from a different loop
+# (scripts, tests). Closed by close_client() on app shutdown.
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30)
+
+# Concurrent lookups for the same flight/date or airport/date share one
+# upstream call, but only between callers at the same RapidAPI priority and
+# request-budget class: a user-facing lookup never inherits a polling
+# caller's quota deferral or a near-spent budget. Each caller gets its own
+# copy of parsed rows because routes enrich them in place; raw departure
+# rows are shared read-only.
+
+
+def _call_scope() -> tuple:
+    return current_priority(), deadline.budget_class()
+
+
+_inflight_flights = SingleFlight(scope=_call_scope)
+_inflight_departures = SingleFlight(scope=_call_scope)
+
+# Opens after consecutive timeouts / connection errors / 5xx so an outage
+# costs callers one fast AeroDataBoxCircuitOpen instead of a 10-15 s timeout
+# each; callers then serve last known good data (see flight_snapshot_service).
+breaker = CircuitBreaker("aerodatabox", failure_threshold=5, reset_timeout=30.0)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared AeroDataBox client, creating it on first use."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            base_url=ADB_BASE_URL,
+            headers={
+                "x-rapidapi-host": "aerodatabox.p.rapidapi.com",
+                "x-rapidapi-key": settings.rapidapi_key,
+            },
+            http2=_http2_available(),
+            limits=_POOL_LIMITS,
+            timeout=FLIGHT_TIMEOUT,
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client (app shutdown)."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
 
 class AeroDataBoxError(Exception):
     """Base class for AeroDataBox integration failures."""
@@ -19,6 +96,10 @@ class AeroDataBoxRateLimited(AeroDataBoxError):
     """HTTP 429 — RapidAPI rate limit hit."""
 
 
+class AeroDataBoxQuotaDeferred(AeroDataBoxRateLimited):
+    """Not sent: the client-side RapidAPI budget is reserved for higher-priority calls."""
+
+
 class AeroDataBoxUnavailable(AeroDataBoxError):
     """HTTP 5xx, connection error, or malformed response."""
 
@@ -27,6 +108,93 @@ class AeroDataBoxTimeout(AeroDataBoxError):
     """Request or connection timed out."""
 
 
+class AeroDataBoxBudgetSpent(AeroDataBoxTimeout):
+    """Not sent, or cut short: the request's latency budget ran out (upstream may be fine)."""
+
+
+class AeroDataBoxCircuitOpen(AeroDataBoxUnavailable):
+    """Not sent: the circuit breaker is open after repeated upstream failures."""
+
+
+@contextlib.contextmanager
+def _degraded_on_budget_spent():
+    """Mark the caller's budget degraded when a coalesced call ran out of budget.
+
+    ``_send`` marks the budget of the request that started the call; callers
+    that joined it through SingleFlight run in their own context and are
+    marked here.
+    """
+    try:
+        yield
+    except AeroDataBoxBudgetSpent:
+        deadline.mark_degraded("flight")
+        raise
+
+
+async def _spend_quota(what: str) -> None:
+    """Take one request from the RapidAPI budget or raise AeroDataBoxQuotaDeferred."""
+    if not await quota.acquire():
+        raise AeroDataBoxQuotaDeferred(
+            f"{current_priority().name.lower()} lookup of {what} deferred by quota"
+        )
+
+
+async def _send(url: str, params: dict, timeout: float, what: str) -> httpx.Response:
+    """GET through the breaker and quota; maps transport errors to typed ones.
+
+    Timeouts, connection errors and 5xx count as breaker failures; any other
+    response (including 404/429) proves the upstream is up. Under a request
+    budget the timeout is capped at BUDGET_SHARE of what is left; running out
+    raises AeroDataBoxBudgetSpent (an AeroDataBoxTimeout), which callers
+    answer with last known good data, but a timeout cut short by the budget
+    isn't held against the upstream.
+
+    The quota is spent before the breaker's half-open probe is claimed, so a
+    quota deferral never holds the probe slot; an open circuit is checked
+    first so refused calls don't spend quota either. The quota may wait for
+    a token, so the timeout is worked out again once it is granted. A
+    probe cut short by the budget or cancelled releases its slot, since it
+    says nothing about the upstream.
+    """
+    if deadline.call_timeout(timeout, BUDGET_SHARE) is None:
+        deadline.mark_degraded("flight")
+        raise AeroDataBoxBudgetSpent(f"request budget spent, not fetching {what}")
+    if breaker.refusing():
+        raise AeroDataBoxCircuitOpen(f"circuit open, not fetching {what}")
+    await _spend_quota(what)
+    call_timeout = deadline.call_timeout(timeout, BUDGET_SHARE)
+    if call_timeout is None:
+        deadline.mark_degraded("flight")
+        raise AeroDataBoxBudgetSpent(
+            f"request budget spent waiting for quota, not fetching {what}"
+        )
+    if not breaker.allow():
+        raise AeroDataBoxCircuitOpen(f"circuit open, not fetching {what}")
+    probing = breaker.state == HALF_OPEN
+    try:
+        response = await get_client().get(url, params=params, timeout=call_timeout)
+    except asyncio.CancelledError:
+        if probing:
+            breaker.release_probe()
+        raise
+    except httpx.TimeoutException as e:
+        if call_timeout < timeout:
+            if probing:
+                breaker.release_probe()
+            deadline.mark_degraded("flight")
+            raise AeroDataBoxBudgetSpent(f"request budget ran out fetching {what}") from e
+        breaker.record_failure()
+        raise AeroDataBoxTimeout(f"timeout fetching {what}") from e
+    except httpx.HTTPError as e:
+        breaker.record_failure()
+        raise AeroDataBoxUnavailable(f"connection error fetching {what}") from e
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
 def _classify_status(status_code: int) -> type[AeroDataBoxError]:
     if status_code == 404:
         return AeroDataBoxNotFound
@@ -140,33 +308,41 @@ def parse_departure(raw: dict, origin_iata: str) -> dict | None:
     }
 
 
-def _fetch_departures_window(iata: str, from_local: str, to_local: str) -> list[dict]:
+def raw_departure_destination(raw: dict) -> str:
+    """Destination IATA of a raw FIDS departure, upper-cased ("" when missing)."""
+    airport = (raw.get("movement") or {}).get("airport") or {}
+    return (airport.get("iata") or "").upper()
+
+
+def raw_departure_number(raw: dict) -> str:
+    """Flight number of a raw FIDS departure, normalized ("UA 100" -> "UA100")."""
+    return (raw.get("number") or "").replace(" ", "").upper()
+
+
+def raw_departure_local_time(raw: dict) -> str | None:
+    """Scheduled local departure time of a raw FIDS departure, as sent by ADB."""
+    return ((raw.get("movement") or {}).get("scheduledTime") or {}).get("local")
+
+
+def raw_departure_airline_name(raw: dict) -> str:
+    return (raw.get("airline") or {}).get("name") or ""
+
+
+async def _fetch_departures_window(iata: str, from_local: str, to_local: str) -> list[dict]:
     """Fetch a single ≤12-hour window of departures. Returns raw dicts.
 
     Raises the appropriate AeroDataBoxError subclass on any failure path;
     the caller is responsible for partial-success aggregation across windows.
     """
-    url = f"https://aerodatabox.p.rapidapi.com/flights/airports/iata/{iata}/{from_local}/{to_local}"
-    headers = {
-        "x-rapidapi-host": "aerodatabox.p.rapidapi.com",
-        "x-rapidapi-key": settings.rapidapi_key,
-    }
+    url = f"/flights/airports/iata/{iata}/{from_local}/{to_local}"
     params = {
         "withAircraftImage": "false",
         "withLocation": "false",
         "direction": "Departure",
     }
-    try:
-        with httpx.Client(timeout=15) as client:
-            response = client.get(url, headers=headers, params=params)
-    except httpx.TimeoutException as e:
-        raise AeroDataBoxTimeout(
-            f"timeout fetching departures for {iata} {from_local}-{to_local}"
-        ) from e
-    except httpx.HTTPError as e:
-        raise AeroDataBoxUnavailable(
-            f"connection error fetching departures for {iata} {from_local}-{to_local}"
-        ) from e
+    response = await _send(
+        url, params, DEPARTURES_TIMEOUT, f"departures for {iata} {from_local}-{to_local}"
+    )
 
     # AeroDataBox returns HTTP 204 "No Content" for airport/date combinations
     # with no matching departures (confirmed via cache-control: public,max-age=30
@@ -200,52 +376,126 @@ def _fetch_departures_window(iata: str, from_local: str, to_local: str) -> list[
 # vs 404 for rate-limited vs unavailable, etc.).
 _ADB_SEVERITY: dict[type[AeroDataBoxError], int] = {
     AeroDataBoxUnavailable: 4,
+    AeroDataBoxCircuitOpen: 4,
     AeroDataBoxTimeout: 3,
+    AeroDataBoxBudgetSpent: 3,
     AeroDataBoxRateLimited: 2,
+    AeroDataBoxQuotaDeferred: 2,
     AeroDataBoxNotFound: 1,
 }
 
 
-def lookup_airport_departures(iata: str, date_str: str) -> list[dict]:
-    """Call AeroDataBox FIDS/Departures endpoint for all departures from an airport on a date.
+DEPARTURE_WINDOWS = (("T00:00", "T11:59"), ("T12:00", "T23:59"))
+
+
+async def lookup_airport_departures(
+    iata: str,
+    date_str: str,
+    windows: tuple[tuple[str, str], ...] = DEPARTURE_WINDOWS,
+    *,
+    destination: str | None = None,
+    flight_numbers: set[str] | None = None,
+) -> list[dict]:
+    """Return parsed departures from an airport on a date (see ``_fetch_airport_departures``).
+
+    ``windows`` narrows the pull to a subset of ``DEPARTURE_WINDOWS`` when
+    the caller only needs one half of the day (one ADB call instead of two).
+    ``destination`` and ``flight_numbers`` are checked on the raw rows, so
+    only the departures a caller keeps go through ``parse_departure``.
+    """
+    iata = iata.strip().upper()
+    destination = destination.strip().upper() if destination else None
+    if flight_numbers is not None:
+        flight_numbers = {n.replace(" ", "").upper() for n in flight_numbers}
+
+    parsed = []
+    for raw in await lookup_raw_departures(iata, date_str, windows):
+        if destination is not None and raw_departure_destination(raw) != destination:
+            continue
+        if flight_numbers is not None and raw_departure_number(raw) not in flight_numbers:
+            continue
+        flight = parse_departure(raw, origin_iata=iata)
+        if flight is not None:
+            parsed.append(flight)
+    return parsed
+
+
+async def lookup_raw_departures(
+    iata: str, date_str: str, windows: tuple[tuple[str, str], ...] = DEPARTURE_WINDOWS
+) -> list[dict]:
+    """Unparsed FIDS departure objects for an airport on a date.
+
+    Concurrent calls for the same airport, date and windows are coalesced
+    into one upstream fetch. The row dicts are shared between callers and
+    must not be mutated; use ``parse_departure`` for a caller-owned copy.
+    """
+    iata = iata.strip().upper()
+    windows = tuple(windows)
+    with _degraded_on_budget_spent():
+        return list(
+            await _inflight_departures.do(
+                (iata, date_str, windows), _fetch_airport_departures, iata, date_str, windows
+            )
+        )
+
+
+async def _fetch_airport_departures(
+    iata: str, date_str: str, windows: tuple[tuple[str, str], ...] = DEPARTURE_WINDOWS
+) -> list[dict]:
+    """Call AeroDataBox FIDS/Departures endpoint for all raw departures from an airport on a date.
 
-    Splits into two ≤12-hour windows to stay within the API's 12-hour limit.
+    Splits into ≤12-hour windows to stay within the API's 12-hour limit;
+    the windows are fetched concurrently on the shared client.
     Partial-success semantics preserved: if one window succeeds and the other
     raises, return the successful window's results and swallow the error with
-    a warning log. Only raises when BOTH windows fail — re-raises the worst
+    a warning log. Only raises when every window fails — re-raises the worst
     exception by severity.
     """
-    iata = iata.strip().upper()
     raw_departures: list[dict] = []
     window_errors: list[AeroDataBoxError] = []
 
-    for from_time, to_time in [("T00:00", "T11:59"), ("T12:00", "T23:59")]:
-        try:
-            window = _fetch_departures_window(
-                iata, f"{date_str}{from_time}", f"{date_str}{to_time}"
-            )
-            raw_departures.extend(window)
-        except AeroDataBoxError as e:
+    results = await asyncio.gather(
+        *(
+            _fetch_departures_window(iata, f"{date_str}{from_time}", f"{date_str}{to_time}")
+            for from_time, to_time in windows
+        ),
+        return_exceptions=True,
+    )
+    for (from_time, to_time), result in zip(windows, results):
+        if isinstance(result, AeroDataBoxError):
             logger.warning(
                 "AeroDataBox departures window failed for %s on %s (%s-%s): %s",
-                iata, date_str, from_time, to_time, type(e).__name__,
+                iata, date_str, from_time, to_time, type(result).__name__,
             )
-            window_errors.append(e)
+            window_errors.append(result)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            raw_departures.extend(result)
 
-    # Both windows failed with nothing recovered → re-raise the worst exception
+    # Every window failed with nothing recovered → re-raise the worst exception
     if window_errors and not raw_departures:
         worst = max(window_errors, key=lambda e: _ADB_SEVERITY.get(type(e), 0))
         raise worst
 
-    parsed = []
-    for raw in raw_departures:
-        flight = parse_departure(raw, origin_iata=iata)
-        if flight is not None:
-            parsed.append(flight)
-    return parsed
+    return raw_departures
 
 
-def lookup_flights(flight_number: str, date_str: str) -> list[dict]:
+async def lookup_flights(flight_number: str, date_str: str) -> list[dict]:
+    """Return parsed flights for a flight number and date (see ``_fetch_flights``).
+
+    Concurrent calls for the same flight and date are coalesced into one
+    upstream fetch.
+    """
+    flight_number = flight_number.strip()
+    with _degraded_on_budget_spent():
+        flights = await _inflight_flights.do(
+            (flight_number.upper(), date_str), _fetch_flights, flight_number, date_str
+        )
+    return [dict(f) for f in flights]
+
+
+async def _fetch_flights(flight_number: str, date_str: str) -> list[dict]:
     """Call AeroDataBox Flight status (specific date) API and return parsed flights.
 
     Raises the appropriate AeroDataBoxError subclass on any failure path:
@@ -256,28 +506,13 @@ def lookup_flights(flight_number: str, date_str: str) -> list[dict]:
     An upstream 200 with an empty list is returned as ``[]`` (no exception) —
     that's a legitimate "no flights for this number/date".
     """
-    flight_number = flight_number.strip()
-    url = f"https://aerodatabox.p.rapidapi.com/flights/number/{flight_number}/{date_str}"
-    headers = {
-        "x-rapidapi-host": "aerodatabox.p.rapidapi.com",
-        "x-rapidapi-key": settings.rapidapi_key,
-    }
+    url = f"/flights/number/{flight_number}/{date_str}"
     params = {
         "withAircraftImage": "false",
         "withLocation": "false",
         "dateLocalRole": "Departure",
     }
-    try:
-        with httpx.Client(timeout=10) as client:
-            response = client.get(url, headers=headers, params=params)
-    except httpx.TimeoutException as e:
-        raise AeroDataBoxTimeout(
-            f"timeout fetching flight {flight_number} on {date_str}"
-        ) from e
-    except httpx.HTTPError as e:
-        raise AeroDataBoxUnavailable(
-            f"connection error fetching flight {flight_number} on {date_str}"
-        ) from e
+    response = await _send(url, params, FLIGHT_TIMEOUT, f"flight {flight_number} on {date_str}")
 
     # AeroDataBox returns HTTP 204 "No Content" for flight numbers it doesn't
     # recognize (confirmed via direct RapidAPI curl — stable, cached by their
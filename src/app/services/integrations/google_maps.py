@@ -3,15 +3,48 @@ import json
 import logging
 import math
 import time
+from datetime import datetime, timezone
 from pathlib import Path
 
 import httpx
 
+from app.core import deadline
 from app.core.config import settings
+from app.core.singleflight import SingleFlight
+from app.services import drive_time_cache, drive_time_profiles, geocode_cache
 from app.services.integrations.airport_cache import get_cached_airport
 
 logger = logging.getLogger(__name__)
 
+GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+GEOCODE_TIMEOUT = 10  # seconds
+
+# Process-wide client for Google Maps calls: keeps TLS connections alive
+# across requests. Bound to the event loop it was created on, like the
+# AeroDataBox client; closed by close_client() on app shutdown.
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared Google Maps client, creating it on first use."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(limits=_POOL_LIMITS, timeout=GEOCODE_TIMEOUT)
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client (app shutdown)."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
 AIRPORT_DESTINATIONS: dict[str, str] = {
     "SFO": "San Francisco International Airport",
     "OAK": "Oakland International Airport",
@@ -62,13 +95,14 @@ def _load_terminal_coords() -> dict[str, dict[str, dict[str, float]]]:
     return _terminal_coords_cache
 
 
-def get_terminal_coordinates(iata: str, terminal: str | None) -> dict | None:
+async def get_terminal_coordinates(iata: str, terminal: str | None) -> dict | None:
     """Return {"lat": ..., "lng": ...} for an airport terminal.
 
     Lookup order:
     1. Exact terminal match in static file
     2. "default" entry for that airport
-    3. Geocoding API fallback for airports not in the static file
+    3. Geocoding fallback for airports not in the static file (cached like
+       home addresses, see ``geocode_address``)
     """
     code = (iata or "").upper()
     coords = _load_terminal_coords()
@@ -86,52 +120,80 @@ def get_terminal_coordinates(iata: str, terminal: str | None) -> dict | None:
         query = f"{airport_name} Terminal {terminal} Departures"
     else:
         query = f"{airport_name} Departures"
-    try:
-        with httpx.Client(timeout=10) as client:
-            resp = client.get(
-                "https://maps.googleapis.com/maps/api/geocode/json",
-                params={"address": query, "key": settings.google_maps_api_key},
-            )
-            resp.raise_for_status()
-            results = resp.json().get("results") or []
-            if not results:
-                return None
-            loc = results[0].get("geometry", {}).get("location", {})
-            return {"lat": loc.get("lat", 0.0), "lng": loc.get("lng", 0.0)}
-    except Exception:
-        logger.exception("Geocode fallback failed for %s terminal %s", code, terminal)
-        return None
+    return await geocode_address(query)
 
 
-# --- Home address geocoding ---
+# --- Address geocoding ---
 
-_geocode_cache: dict[str, dict[str, float]] = {}
+# Concurrent identical Google calls share one request (see SingleFlight)
+# among callers in the same request-budget class.
+_inflight_geocodes = SingleFlight(scope=deadline.budget_class)
+_inflight_drive_times = SingleFlight(scope=deadline.budget_class)
 
 
-def geocode_address(address: str) -> dict | None:
+async def geocode_address(address: str) -> dict | None:
     """Geocode a street address via Google Maps. Returns {"lat": ..., "lng": ...} or None.
 
-    Results are cached in-memory so repeated calls with the same address skip the API.
+    Results are cached by normalized address in a bounded in-memory LRU and
+    the geocode_cache table (see ``geocode_cache``), so repeat addresses skip
+    the API across requests, workers and deploys; concurrent misses for the
+    same address share one request. Under a request budget (see
+    ``app.core.deadline``) the call is skipped once the budget is spent and
+    None is returned uncached.
     """
-    if address in _geocode_cache:
-        return _geocode_cache[address]
+    cached = await geocode_cache.get_cached_geocode(address)
+    if cached is not None:
+        return cached
+    return await _inflight_geocodes.do(
+        geocode_cache.normalize_address(address), _fetch_geocode, address
+    )
+
+
+async def _fetch_geocode(address: str) -> dict | None:
+    timeout = deadline.call_timeout(GEOCODE_TIMEOUT)
+    if timeout is None:
+        deadline.mark_degraded("geocode")
+        return None
     try:
-        with httpx.Client(timeout=10) as client:
-            resp = client.get(
-                "https://maps.googleapis.com/maps/api/geocode/json",
-                params={"address": address, "key": settings.google_maps_api_key},
-            )
-            resp.raise_for_status()
-            results = resp.json().get("results") or []
-            if not results:
-                return None
-            loc = results[0].get("geometry", {}).get("location", {})
-            result = {"lat": loc.get("lat", 0.0), "lng": loc.get("lng", 0.0)}
-            _geocode_cache[address] = result
-            return result
+        resp = await get_client().get(
+            GEOCODE_URL,
+            params={"address": address, "key": settings.google_maps_api_key},
+            timeout=timeout,
+        )
+        resp.raise_for_status()
+        results = resp.json().get("results") or []
+        if not results:
+            return None
+        loc = results[0].get("geometry", {}).get("location", {})
+        result = {"lat": loc.get("lat", 0.0), "lng": loc.get("lng", 0.0)}
+    except httpx.TimeoutException:
+        if timeout < GEOCODE_TIMEOUT:
+            deadline.mark_degraded("geocode")
+        logger.warning("Geocode timed out for address: %s", address)
+        return None
     except Exception:
         logger.exception("Geocode failed for address: %s", address)
         return None
+    await geocode_cache.store_geocode(address, result)
+    return result
+
+
+def _drive_destination(airport_iata: str, airport_name: str | None, terminal: str | None) -> str:
+    """Google destination string for an airport, terminal-specific when known."""
+    base_name = get_airport_destination(airport_iata)
+    if terminal and base_name != f"{airport_iata or ''} Airport":
+        return f"{base_name} Terminal {terminal} departures"
+    return airport_name or base_name
+
+
+def _mode_params(transport_mode: str) -> dict[str, str]:
+    """Google ``mode`` / ``transit_mode`` params for a transport mode."""
+    if transport_mode == "train":
+        return {"mode": "transit", "transit_mode": "rail"}
+    if transport_mode == "bus":
+        return {"mode": "transit", "transit_mode": "bus"}
+    # rideshare, driving, other
+    return {"mode": "driving"}
 
 
 def _travel_label(transport_mode: str, airport_iata: str) -> str:
@@ -146,62 +208,135 @@ def _travel_label(transport_mode: str, airport_iata: str) -> str:
     return labels.get(transport_mode, f"Travel to {airport_iata}")
 
 
-async def _fetch_distance_matrix(
-    client: httpx.AsyncClient,
-    origin: str,
+# --- Drive times ---
+
+DIRECTIONS_URL = "https://maps.googleapis.com/maps/api/directions/json"
+DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
+DRIVE_TIME_TIMEOUT = 10  # seconds
+TRAFFIC_MODELS = ("best_guess", "pessimistic", "optimistic")
+
+
+async def _fetch_matrix_elements(
+    origins: list[str],
     destination: str,
-    departure_time: int,
-    traffic_model: str,
-) -> int | None:
-    """Fetch duration_in_traffic from Google Distance Matrix API. Returns minutes or None."""
+    mode_params: dict[str, str],
+    departure_time: int | None,
+    traffic_model: str | None,
+) -> list[dict | None]:
+    """One Distance Matrix call; the OK element per origin, or None per origin on failure."""
+    timeout = deadline.call_timeout(DRIVE_TIME_TIMEOUT)
+    if timeout is None:
+        deadline.mark_degraded("drive_time")
+        return [None] * len(origins)
+    params = {
+        # "|" separates origins in the request
+        "origins": "|".join(o.replace("|", " ") for o in origins),
+        "destinations": destination,
+        "key": settings.google_maps_api_key,
+        **mode_params,
+    }
+    if departure_time is not None:
+        params["departure_time"] = str(departure_time)
+    if traffic_model is not None:
+        params["traffic_model"] = traffic_model
     try:
-        params = {
-            "origins": origin,
-            "destinations": destination,
-            "key": settings.google_maps_api_key,
-            "mode": "driving",
-            "departure_time": str(departure_time),
-            "traffic_model": traffic_model,
-        }
-        resp = await client.get(
-            "https://maps.googleapis.com/maps/api/distancematrix/json",
-            params=params,
-        )
+        resp = await get_client().get(DISTANCE_MATRIX_URL, params=params, timeout=timeout)
         resp.raise_for_status()
-        data = resp.json()
-        rows = data.get("rows") or []
-        if not rows:
-            return None
-        elements = rows[0].get("elements") or []
-        if not elements or elements[0].get("status") != "OK":
-            return None
-        dur = elements[0].get("duration_in_traffic") or elements[0].get("duration")
-        if not dur:
-            return None
-        return math.ceil(dur.get("value", 0) / 60)
-    except Exception:
+        rows = resp.json().get("rows") or []
+    except Exception as e:
+        if isinstance(e, httpx.TimeoutException) and timeout < DRIVE_TIME_TIMEOUT:
+            deadline.mark_degraded("drive_time")
+        logger.warning(
+            "Distance Matrix batch failed for %d origins -> %s",
+            len(origins), destination, exc_info=True,
+        )
+        return [None] * len(origins)
+    elements: list[dict | None] = []
+    for i in range(len(origins)):
+        row = (rows[i].get("elements") or []) if i < len(rows) else []
+        element = row[0] if row else None
+        elements.append(element if element and element.get("status") == "OK" else None)
+    return elements
+
+
+def _element_minutes(element: dict | None) -> int | None:
+    """Minutes from a Distance Matrix element (traffic-aware when available)."""
+    if not element:
         return None
+    dur = element.get("duration_in_traffic") or element.get("duration")
+    if not dur:
+        return None
+    return math.ceil(dur.get("value", 0) / 60)
 
 
-async def _fetch_traffic_variants(
-    origin: str, destination: str, departure_time: int, primary_minutes: int
-) -> tuple[int, int]:
-    """Return (pessimistic, optimistic) duration in minutes via parallel Distance Matrix calls."""
-    try:
-        async with httpx.AsyncClient() as client:
-            pessimistic_min, optimistic_min = await asyncio.gather(
-                _fetch_distance_matrix(client, origin, destination, departure_time, "pessimistic"),
-                _fetch_distance_matrix(client, origin, destination, departure_time, "optimistic"),
-            )
-    except Exception:
-        pessimistic_min, optimistic_min = None, None
+def _traffic_result(
+    best: dict | None, pessimistic: dict | None, optimistic: dict | None, label: str
+) -> dict | None:
+    """Drive-time result from the three traffic models' matrix elements, or None
+    when the best_guess element is missing."""
+    minutes = _element_minutes(best)
+    if minutes is None:
+        return None
+    duration_info = best.get("duration_in_traffic") or best.get("duration")
+    return {
+        "duration_minutes": minutes,
+        "duration_pessimistic": _element_minutes(pessimistic) or math.ceil(minutes * 1.3),
+        "duration_optimistic": _element_minutes(optimistic) or math.ceil(minutes * 0.85),
+        "duration_text": duration_info.get("text", "~45 mins (estimate)"),
+        "distance_text": (best.get("distance") or {}).get("text", "unknown"),
+        "source": "google_maps",
+        "label": label,
+    }
+
+
+def _untimed_result(element: dict | None, has_departure: bool, label: str) -> dict | None:
+    """Drive-time result from one matrix element without traffic models
+    (transit, or live traffic with no departure time)."""
+    minutes = _element_minutes(element)
+    if minutes is None:
+        return None
+    duration_info = element.get("duration_in_traffic") or element.get("duration")
+    return {
+        "duration_minutes": minutes,
+        # Transit has no traffic_model support
+        "duration_pessimistic": minutes + 10 if has_departure else minutes,
+        "duration_optimistic": minutes,
+        "duration_text": duration_info.get("text", "~45 mins (estimate)"),
+        "distance_text": (element.get("distance") or {}).get("text", "unknown"),
+        "source": "google_maps",
+        "label": label,
+    }
+
 
-    if pessimistic_min is None:
-        pessimistic_min = math.ceil(primary_minutes * 1.3)
-    if optimistic_min is None:
-        optimistic_min = math.ceil(primary_minutes * 0.85)
+def _estimated_spread(minutes: int, mode: str) -> tuple[int, int]:
+    """(pessimistic, optimistic) minutes assumed for a timed answer without traffic models.
 
-    return pessimistic_min, optimistic_min
+    ``mode`` is Google's travel mode (see ``_mode_params``).
+    """
+    if mode == "driving":
+        return math.ceil(minutes * 1.3), math.ceil(minutes * 0.85)
+    # Transit: no traffic_model support
+    return minutes + 10, minutes
+
+
+def _fallback_drive_time(label: str) -> dict:
+    return {
+        "duration_minutes": 45,
+        "duration_pessimistic": 45,
+        "duration_optimistic": 45,
+        "duration_text": "~45 mins (estimate)",
+        "distance_text": "unknown",
+        "source": "fallback",
+        "label": label,
+    }
+
+
+def fallback_drive_time(airport_iata: str, transport_mode: str = "rideshare") -> dict:
+    """The 45-minute estimate ``get_drive_time`` returns when Google fails.
+
+    For callers that give up on ``get_drive_time`` before it answers.
+    """
+    return _fallback_drive_time(_travel_label(transport_mode, airport_iata or "airport"))
 
 
 async def get_drive_time(
@@ -212,111 +347,191 @@ async def get_drive_time(
     departure_time: int | None = None,
     terminal: str | None = None,
 ) -> dict:
-    """Get duration and distance from origin to airport via Google Directions API."""
+    """Get duration and distance from origin to airport via Google Directions API.
+
+    Estimates are cached by origin geohash cell, airport, terminal, mode and
+    departure bucket (see ``drive_time_cache``); the origin is geocoded
+    through the geocode cache to find its cell. Departures more than
+    PROFILE_HORIZON out are answered from the learned drive-time profile
+    when it has enough samples (see ``drive_time_profiles``). Concurrent
+    misses for the same key share one set of Google requests, and every
+    Google answer is recorded into the profiles. Under a request budget
+    (see ``app.core.deadline``) Google calls stop once it is spent and the
+    45-minute fallback is returned.
+    """
+    now = datetime.now(tz=timezone.utc)
+    cell = await _origin_cell(origin_address)
+    key = _drive_time_key(
+        cell, airport_iata, airport_name, transport_mode, departure_time, terminal, now
+    )
+    cached = await drive_time_cache.get_cached_drive_time(key, now=now)
+    if cached is not None:
+        return cached
+    profiled = await _profile_drive_time(cell, airport_iata, transport_mode, departure_time, now)
+    if profiled is not None:
+        return profiled
+    result = await _inflight_drive_times.do(
+        key,
+        _load_drive_time,
+        key,
+        cell,
+        origin_address,
+        airport_iata,
+        airport_name,
+        transport_mode,
+        departure_time,
+        terminal,
+    )
+    return dict(result)
+
+
+async def _origin_cell(origin_address: str) -> str:
+    coords = await geocode_address(origin_address) if origin_address else None
+    return drive_time_cache.origin_cell(origin_address, coords)
+
+
+def _drive_time_key(
+    cell: str,
+    airport_iata: str,
+    airport_name: str | None,
+    transport_mode: str,
+    departure_time: int | None,
+    terminal: str | None,
+    now: datetime,
+) -> str:
+    return drive_time_cache.cache_key(
+        cell,
+        airport_iata,
+        terminal,
+        transport_mode,
+        drive_time_cache.departure_bucket(departure_time, now),
+        airport_name,
+    )
+
+
+async def _profile_drive_time(
+    cell: str,
+    airport_iata: str,
+    transport_mode: str,
+    departure_time: int | None,
+    now: datetime,
+) -> dict | None:
+    """Drive time from the learned profile for departures beyond PROFILE_HORIZON, else None."""
+    if (
+        departure_time is None
+        or departure_time - now.timestamp() <= drive_time_profiles.PROFILE_HORIZON
+    ):
+        return None
+    profile = await drive_time_profiles.get_profile(
+        cell, airport_iata, transport_mode, datetime.fromtimestamp(departure_time, tz=timezone.utc)
+    )
+    if profile is None:
+        return None
+    return {
+        "duration_minutes": profile["p50"],
+        # Never less cautious than the spread assumed for an answer without traffic models
+        "duration_pessimistic": max(
+            profile["p90"], _estimated_spread(profile["p50"], _mode_params(transport_mode)["mode"])[0]
+        ),
+        "duration_optimistic": profile["p10"],
+        "duration_text": f"~{profile['p50']} mins (typical)",
+        "distance_text": profile["distance_text"] or "unknown",
+        "source": "profile",
+        "label": _travel_label(transport_mode, airport_iata or "airport"),
+    }
+
+
+async def _record_profile(
+    cell: str,
+    airport_iata: str,
+    transport_mode: str,
+    departure_time: int | None,
+    result: dict,
+    now: datetime,
+) -> None:
+    """Feed a Google answer into its drive-time profile."""
+    if result.get("source") != "google_maps":
+        return
+    if departure_time is not None and departure_time > now.timestamp():
+        when = datetime.fromtimestamp(departure_time, tz=timezone.utc)
+    else:
+        when = now
+    await drive_time_profiles.record_drive_time(
+        cell, airport_iata, transport_mode, when, result["duration_minutes"],
+        result.get("distance_text"),
+        pessimistic=result.get("duration_pessimistic"),
+        optimistic=result.get("duration_optimistic"),
+        now=now,
+    )
+
+
+async def _load_drive_time(
+    key: str,
+    cell: str,
+    origin_address: str,
+    airport_iata: str,
+    airport_name: str | None,
+    transport_mode: str,
+    departure_time: int | None,
+    terminal: str | None,
+) -> dict:
+    result = await _fetch_drive_time(
+        origin_address, airport_iata, airport_name, transport_mode, departure_time, terminal
+    )
+    await drive_time_cache.store_drive_time(key, result, departure_time)
+    await _record_profile(
+        cell, airport_iata, transport_mode, departure_time, result, datetime.now(tz=timezone.utc)
+    )
+    return result
+
+
+async def _fetch_drive_time(
+    origin_address: str,
+    airport_iata: str,
+    airport_name: str | None,
+    transport_mode: str,
+    departure_time: int | None,
+    terminal: str | None,
+) -> dict:
+    """One origin's drive time from Google, or the 45-minute fallback.
+
+    Driving with a future departure fetches the best_guess, pessimistic and
+    optimistic traffic models concurrently from Distance Matrix, whose
+    elements also carry the duration and distance text, so the segment
+    costs one round trip. Directions is only called for transit, for live
+    traffic (no future departure), or when the best_guess element is missing.
+    """
+    label = _travel_label(transport_mode, airport_iata or "airport")
     try:
-        base_name = get_airport_destination(airport_iata)
-        if terminal and base_name != f"{airport_iata or ''} Airport":
-            destination = f"{base_name} Terminal {terminal} departures"
-        else:
-            destination = airport_name or base_name
-        url = "https://maps.googleapis.com/maps/api/directions/json"
-        mode = "driving"
-        params: dict[str, str] = {
-            "origin": origin_address,
-            "destination": destination,
-            "key": settings.google_maps_api_key,
-            "mode": mode,
-        }
-        if transport_mode == "train":
-            params["mode"] = "transit"
-            params["transit_mode"] = "rail"
-        elif transport_mode == "bus":
-            params["mode"] = "transit"
-            params["transit_mode"] = "bus"
-        else:
-            # rideshare, driving, other
-            params["mode"] = "driving"
-
-        if departure_time is not None and departure_time > int(time.time()):
-            params["departure_time"] = str(departure_time)
-
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-
-        label = _travel_label(transport_mode, airport_iata or "airport")
-
-        routes = data.get("routes") or []
-        if not routes:
-            logger.warning("Google Directions returned no routes for %s -> %s", origin_address, airport_iata)
-            return {
-                "duration_minutes": 45,
-                "duration_pessimistic": 45,
-                "duration_optimistic": 45,
-                "duration_text": "~45 mins (estimate)",
-                "distance_text": "unknown",
-                "source": "fallback",
-                "label": label,
-            }
-
-        leg = (routes[0].get("legs") or [None])[0]
-        if not leg:
-            logger.warning("Google Directions returned no legs for %s -> %s", origin_address, airport_iata)
-            return {
-                "duration_minutes": 45,
-                "duration_pessimistic": 45,
-                "duration_optimistic": 45,
-                "duration_text": "~45 mins (estimate)",
-                "distance_text": "unknown",
-                "source": "fallback",
-                "label": label,
-            }
-
-        duration_info = leg.get("duration_in_traffic") or leg.get("duration")
-        if not duration_info:
-            logger.warning("Google Directions leg has no duration for %s -> %s", origin_address, airport_iata)
-            return {
-                "duration_minutes": 45,
-                "duration_pessimistic": 45,
-                "duration_optimistic": 45,
-                "duration_text": "~45 mins (estimate)",
-                "distance_text": "unknown",
-                "source": "fallback",
-                "label": label,
-            }
-
-        duration_seconds = duration_info.get("value", 0)
-        duration_minutes = math.ceil(duration_seconds / 60)
-        duration_text = duration_info.get("text", "~45 mins (estimate)")
-        distance_text = (leg.get("distance") or {}).get("text", "unknown")
-
-        # Compute pessimistic/optimistic traffic variants
-        is_driving = params.get("mode") == "driving"
+        destination = _drive_destination(airport_iata, airport_name, terminal)
+        mode_params = _mode_params(transport_mode)
         has_departure = departure_time is not None and departure_time > int(time.time())
 
-        if has_departure and is_driving:
-            dur_pessimistic, dur_optimistic = await _fetch_traffic_variants(
-                origin_address, destination, departure_time, duration_minutes
+        if has_departure and mode_params["mode"] == "driving":
+            rows = await asyncio.gather(
+                *(
+                    _fetch_matrix_elements(
+                        [origin_address], destination, mode_params, departure_time, model
+                    )
+                    for model in TRAFFIC_MODELS
+                )
             )
-        elif has_departure and not is_driving:
-            # Transit: no traffic_model support
-            dur_pessimistic = duration_minutes + 10
-            dur_optimistic = duration_minutes
-        else:
-            # No departure_time — no traffic data available
-            dur_pessimistic = duration_minutes
-            dur_optimistic = duration_minutes
-
-        return {
-            "duration_minutes": duration_minutes,
-            "duration_pessimistic": dur_pessimistic,
-            "duration_optimistic": dur_optimistic,
-            "duration_text": duration_text,
-            "distance_text": distance_text,
-            "source": "google_maps",
-            "label": label,
-        }
+            result = _traffic_result(*(row[0] for row in rows), label)
+            if result is not None:
+                return result
+            logger.warning(
+                "Distance Matrix returned no route for %s -> %s; trying Directions",
+                origin_address, airport_iata,
+            )
+
+        return await _fetch_directions(
+            origin_address,
+            airport_iata,
+            destination,
+            mode_params,
+            departure_time if has_departure else None,
+            label,
+        )
     except Exception as e:
         logger.exception(
             "Google Directions failed for %s -> %s: %s",
@@ -324,12 +539,173 @@ async def get_drive_time(
             airport_iata,
             e,
         )
-        return {
-            "duration_minutes": 45,
-            "duration_pessimistic": 45,
-            "duration_optimistic": 45,
-            "duration_text": "~45 mins (estimate)",
-            "distance_text": "unknown",
-            "source": "fallback",
-            "label": _travel_label(transport_mode, airport_iata or "airport"),
-        }
+        return _fallback_drive_time(label)
+
+
+async def _fetch_directions(
+    origin_address: str,
+    airport_iata: str,
+    destination: str,
+    mode_params: dict[str, str],
+    departure_time: int | None,
+    label: str,
+) -> dict:
+    params: dict[str, str] = {
+        "origin": origin_address,
+        "destination": destination,
+        "key": settings.google_maps_api_key,
+        **mode_params,
+    }
+    if departure_time is not None:
+        params["departure_time"] = str(departure_time)
+
+    timeout = deadline.call_timeout(DRIVE_TIME_TIMEOUT)
+    if timeout is None:
+        deadline.mark_degraded("drive_time")
+        return _fallback_drive_time(label)
+    try:
+        response = await get_client().get(DIRECTIONS_URL, params=params, timeout=timeout)
+    except httpx.TimeoutException:
+        if timeout < DRIVE_TIME_TIMEOUT:
+            deadline.mark_degraded("drive_time")
+        raise
+    response.raise_for_status()
+    data = response.json()
+
+    routes = data.get("routes") or []
+    if not routes:
+        logger.warning("Google Directions returned no routes for %s -> %s", origin_address, airport_iata)
+        return _fallback_drive_time(label)
+
+    leg = (routes[0].get("legs") or [None])[0]
+    if not leg:
+        logger.warning("Google Directions returned no legs for %s -> %s", origin_address, airport_iata)
+        return _fallback_drive_time(label)
+
+    duration_info = leg.get("duration_in_traffic") or leg.get("duration")
+    if not duration_info:
+        logger.warning("Google Directions leg has no duration for %s -> %s", origin_address, airport_iata)
+        return _fallback_drive_time(label)
+
+    duration_minutes = math.ceil(duration_info.get("value", 0) / 60)
+
+    if departure_time is not None:
+        # Traffic models unavailable (see _fetch_drive_time): estimate the spread
+        dur_pessimistic, dur_optimistic = _estimated_spread(duration_minutes, mode_params["mode"])
+    else:
+        # No departure_time — no traffic data available
+        dur_pessimistic = duration_minutes
+        dur_optimistic = duration_minutes
+
+    return {
+        "duration_minutes": duration_minutes,
+        "duration_pessimistic": dur_pessimistic,
+        "duration_optimistic": dur_optimistic,
+        "duration_text": duration_info.get("text", "~45 mins (estimate)"),
+        "distance_text": (leg.get("distance") or {}).get("text", "unknown"),
+        "source": "google_maps",
+        "label": label,
+    }
+
+
+# --- Batched drive times (polling agent) ---
+
+MATRIX_MAX_ORIGINS = 25  # Distance Matrix limit on origins per request
+
+
+async def prefetch_drive_times(requests: list[dict]) -> int:
+    """Warm the drive-time cache for many trips with multi-origin Distance Matrix calls.
+
+    ``requests`` are ``get_drive_time`` keyword arguments. Requests already
+    cached or answerable from a drive-time profile are dropped; the rest are grouped by destination, transport mode
+    and departure bucket, and each group is fetched MATRIX_MAX_ORIGINS
+    origins at a time, one call per traffic model, instead of a Directions
+    call plus two Distance Matrix calls per trip. Results are stored under
+    the keys ``get_drive_time`` reads, so each trip's own compute hits the
+    cache. Origins Google can't route are left uncached and go through the
+    per-trip path.
+
+    Returns the number of Distance Matrix requests made.
+    """
+    now = datetime.now(tz=timezone.utc)
+    cells = await asyncio.gather(*(_origin_cell(r["origin_address"]) for r in requests))
+    groups: dict[tuple, dict[str, tuple[str, dict]]] = {}
+    for request, cell in zip(requests, cells):
+        key = _drive_time_key(
+            cell,
+            request["airport_iata"],
+            request.get("airport_name"),
+            request["transport_mode"],
+            request.get("departure_time"),
+            request.get("terminal"),
+            now,
+        )
+        if await drive_time_cache.get_cached_drive_time(key, now=now) is not None:
+            continue
+        if await _profile_drive_time(
+            cell, request["airport_iata"], request["transport_mode"],
+            request.get("departure_time"), now,
+        ) is not None:
+            continue
+        group = (
+            request["airport_iata"],
+            request.get("airport_name"),
+            request.get("terminal"),
+            request["transport_mode"],
+            drive_time_cache.departure_bucket(request.get("departure_time"), now),
+        )
+        # One origin per cache key: trips from the same cell share a row.
+        groups.setdefault(group, {}).setdefault(key, (cell, request))
+
+    chunks = []
+    for by_key in groups.values():
+        items = list(by_key.items())
+        for i in range(0, len(items), MATRIX_MAX_ORIGINS):
+            chunks.append(items[i : i + MATRIX_MAX_ORIGINS])
+    calls = await asyncio.gather(*(_prefetch_matrix_chunk(chunk, now) for chunk in chunks))
+    return sum(calls)
+
+
+async def _prefetch_matrix_chunk(
+    items: list[tuple[str, tuple[str, dict]]], now: datetime
+) -> int:
+    """Fetch and cache drive times for up to MATRIX_MAX_ORIGINS origins to one destination.
+
+    ``items`` are ``(cache key, (origin cell, request))`` pairs.
+    """
+    first = items[0][1][1]
+    airport_iata = first["airport_iata"]
+    transport_mode = first["transport_mode"]
+    destination = _drive_destination(airport_iata, first.get("airport_name"), first.get("terminal"))
+    mode_params = _mode_params(transport_mode)
+    # Every request in the chunk shares a departure bucket; Google takes one time.
+    departures = [
+        r["departure_time"] for _, (_, r) in items
+        if r.get("departure_time") is not None and r["departure_time"] > int(now.timestamp())
+    ]
+    departure_time = min(departures) if departures else None
+    is_driving = mode_params["mode"] == "driving"
+    models = TRAFFIC_MODELS if is_driving and departure_time else (None,)
+
+    origins = [r["origin_address"] for _, (_, r) in items]
+    rows = await asyncio.gather(
+        *(
+            _fetch_matrix_elements(origins, destination, mode_params, departure_time, model)
+            for model in models
+        )
+    )
+    label = _travel_label(transport_mode, airport_iata or "airport")
+    for i, (key, (cell, request)) in enumerate(items):
+        if len(rows) == len(TRAFFIC_MODELS):
+            result = _traffic_result(rows[0][i], rows[1][i], rows[2][i], label)
+        else:
+            result = _untimed_result(rows[0][i], departure_time is not None, label)
+        if result is None:
+            continue
+        await drive_time_cache.store_drive_time(
+            key, result, request.get("departure_time"), now=now
+        )
+        await _record_profile(
+            cell, airport_iata, transport_mode, request.get("departure_time"), result, now
+        )
+    return len(models)
@@ -0,0 +1,191 @@
+"""Client-side RapidAPI quota manager for AeroDataBox calls.
+
+A token bucket (per-second rate with a burst allowance) plus a daily request
+budget, shared by every ADB call in the process. Callers are ranked by
+priority class so background work can't spend the quota user-facing lookups
+need:
+
+    INTERACTIVE  /v1/flights lookups, search, recommendation previews
+    TRACK        track-time snapshot + flight_info population
+    POLLING      background polling agent refreshes
+    BACKFILL     one-off scripts
+
+Higher classes may spend the bucket down to zero and wait briefly for a
+token; lower classes must leave a reserve in both the bucket and the daily
+budget. Polling waits a moment for the reserve to refill, long enough for
+one tick's concurrent fan-out to go through at the plan's rate, and is
+deferred only past that; a deferred polling refresh skips the tick and
+keeps the data it already has.
+
+The priority is carried in a contextvar so it follows a request or agent
+tick through build_flight_snapshot / lookup_flights without threading a
+parameter through every layer; the default is INTERACTIVE.
+
+Budgets are per process. With several replicas, size ADB_DAILY_BUDGET and
+ADB_RATE_PER_SECOND to each replica's share of the plan.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import enum
+import time
+from datetime import datetime, timezone
+
+from app.core.config import settings
+
+
+class Priority(enum.IntEnum):
+    INTERACTIVE = 0
+    TRACK = 1
+    POLLING = 2
+    BACKFILL = 3
+
+
+# Share of the bucket's burst that must remain after a class takes a token.
+TOKEN_RESERVE = {
+    Priority.INTERACTIVE: 0.0,
+    Priority.TRACK: 0.0,
+    Priority.POLLING: 0.5,
+    Priority.BACKFILL: 0.75,
+}
+# Share of the daily budget that must remain after a class spends a request.
+DAILY_RESERVE = {
+    Priority.INTERACTIVE: 0.0,
+    Priority.TRACK: 0.05,
+    Priority.POLLING: 0.20,
+    Priority.BACKFILL: 0.40,
+}
+# Longest a class will wait for a token before it is deferred. Polling's
+# wait covers a tick's fan-out (ADB slots + FIDS prefetch) at the default
+# rate without queueing behind sustained interactive load.
+MAX_WAIT = {
+    Priority.INTERACTIVE: 5.0,
+    Priority.TRACK: 5.0,
+    Priority.POLLING: 2.0,
+    Priority.BACKFILL: 30.0,
+}
+
+_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "adb_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextlib.contextmanager
+def use_priority(priority: Priority):
+    """Run the enclosed ADB calls (and tasks spawned inside) at ``priority``."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+class QuotaManager:
+    """Token bucket + daily budget with priority reserves.
+
+    ``rate_per_second <= 0`` disables the bucket and ``daily_budget <= 0``
+    disables the daily cap.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        daily_budget: int,
+        clock=time.monotonic,
+    ) -> None:
+        self.rate = rate_per_second
+        self.burst = max(burst, 1)
+        self.daily_budget = daily_budget
+        self._clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """Refill the bucket and zero today's usage and counters."""
+        self._tokens = float(self.burst)
+        self._refilled_at = self._clock()
+        self._day = self._today()
+        self.used_today = 0
+        self.granted = {p: 0 for p in Priority}
+        self.deferred = {p: 0 for p in Priority}
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(tz=timezone.utc).date().isoformat()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if self.rate > 0:
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._refilled_at) * self.rate
+            )
+        self._refilled_at = now
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self.used_today = 0
+
+    def _daily_headroom(self, priority: Priority) -> bool:
+        if self.daily_budget <= 0:
+            return True
+        remaining = self.daily_budget - self.used_today
+        return remaining - 1 >= self.daily_budget * DAILY_RESERVE[priority]
+
+    def _token_shortfall(self, priority: Priority) -> float:
+        """Tokens still missing before ``priority`` may take one (0 = go)."""
+        if self.rate <= 0:
+            return 0.0
+        needed = 1 + self.burst * TOKEN_RESERVE[priority]
+        return max(0.0, needed - self._tokens)
+
+    def _defer(self, priority: Priority) -> bool:
+        self.deferred[priority] += 1
+        return False
+
+    async def acquire(self, priority: Priority | None = None) -> bool:
+        """Spend one request for ``priority``; False means deferred."""
+        priority = current_priority() if priority is None else priority
+        waited = 0.0
+        while True:
+            self._refill()
+            if not self._daily_headroom(priority):
+                return self._defer(priority)
+            shortfall = self._token_shortfall(priority)
+            if shortfall <= 0:
+                if self.rate > 0:
+                    self._tokens -= 1
+                self.used_today += 1
+                self.granted[priority] += 1
+                return True
+            wait = shortfall / self.rate
+            if waited + wait > MAX_WAIT[priority]:
+                return self._defer(priority)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def status(self) -> dict:
+        self._refill()
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "tokens_available": round(self._tokens, 2) if self.rate > 0 else None,
+            "daily_budget": self.daily_budget if self.daily_budget > 0 else None,
+            "used_today": self.used_today,
+            "remaining_today": (
+                max(self.daily_budget - self.used_today, 0) if self.daily_budget > 0 else None
+            ),
+            "granted": {p.name.lower(): n for p, n in self.granted.items()},
+            "deferred": {p.name.lower(): n for p, n in self.deferred.items()},
+        }
+
+
+quota = QuotaManager(
+    rate_per_second=settings.adb_rate_per_second,
+    burst=settings.adb_burst,
+    daily_budget=settings.adb_daily_budget,
+)
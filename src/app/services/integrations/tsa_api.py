@@ -5,16 +5,22 @@ import time
 
 import httpx
 
+from app.core import deadline
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 _cache: dict[str, tuple[float, dict]] = {}
 CACHE_TTL = 900  # 15 minutes
+TSA_TIMEOUT = 5.0  # seconds
 
 
 async def fetch_live_tsa_wait(airport_iata: str) -> dict | None:
-    """Fetch live TSA wait from TSAWaitTimes.com. Returns dict or None on failure."""
+    """Fetch live TSA wait from TSAWaitTimes.com. Returns dict or None on failure.
+
+    Under a request budget (see ``app.core.deadline``) the call is skipped
+    once the budget is spent; the caller then uses the baseline TSA model.
+    """
     if not settings.tsa_wait_times_api_key:
         return None
 
@@ -26,8 +32,13 @@ async def fetch_live_tsa_wait(airport_iata: str) -> dict | None:
         if now - ts < CACHE_TTL:
             return data
 
+    timeout = deadline.call_timeout(TSA_TIMEOUT)
+    if timeout is None:
+        deadline.mark_degraded("tsa")
+        return None
+
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
+        async with httpx.AsyncClient(timeout=timeout) as client:
             resp = await client.get(
                 f"https://api.tsawaittimes.com/api/airport/{cache_key}/json",
                 headers={"x-api-key": settings.tsa_wait_times_api_key},
@@ -40,6 +51,11 @@ async def fetch_live_tsa_wait(airport_iata: str) -> dict | None:
             }
             _cache[cache_key] = (now, result)
             return result
+    except httpx.TimeoutException:
+        if timeout < TSA_TIMEOUT:
+            deadline.mark_degraded("tsa")
+        logger.debug("TSA API request timed out for %s", cache_key, exc_info=True)
+        return None
     except Exception:
         logger.debug("TSA API request failed for %s", cache_key, exc_info=True)
         return None
@@ -1,24 +1,40 @@
 """Background polling agent that monitors active trips and sends push notifications."""
 
 import asyncio
+import contextlib
+import heapq
 import json
 import logging
+import os
+import socket
+import time
+import uuid
+import zlib
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 
 from datetime import timedelta
 
+from app.core.config import settings
 from app.db.models import Event, Trip, User
 from app.schemas.recommendations import RecommendationRecomputeRequest
+from app.schemas.trips import TransportMode
+from app.services import flight_cache
+from app.services.flight_record import FlightIndex
 from app.services.flight_snapshot_service import (
     _select_flight,
     build_flight_info_and_status,
+    lookup_flights_cached,
     snapshot_from_columns,
 )
-from app.services.integrations.aerodatabox import AeroDataBoxError, lookup_flights
+from app.services.integrations.aerodatabox import (
+    DEPARTURE_WINDOWS,
+    AeroDataBoxError,
+    lookup_airport_departures,
+)
 from app.services.notifications import (
     CANCELLATION,
     GATE_CHANGE,
@@ -30,9 +46,15 @@ from app.services.notifications import (
     should_notify_leave_by_shift,
 )
 from app.services.integrations.airport_defaults import AIRPORT_TIMEZONES
+from app.services.integrations.rapidapi_quota import Priority, use_priority
+from app.services.integrations.google_maps import prefetch_drive_times
 from app.services.recommendation_service import (
     build_latest_recommendation_jsonb,
+    drive_time_request,
+    needs_drive_time,
+    recommendation_input_fingerprint,
     recompute_recommendation,
+    segment_sources,
 )
 from app.services.trip_state import (
     MONITORABLE_STATUSES,
@@ -51,23 +73,95 @@ POLL_INTERVALS = [
 ]
 
 DEFAULT_SLEEP = 60
+MIN_SLEEP = 1               # floor on the scheduler wake-up so a due trip can't spin the loop
+DISCOVERY_INTERVAL = DEFAULT_SLEEP  # how often the monitorable-trip table is re-scanned
 STARTUP_DELAY = 10          # seconds to wait before first poll
 BACKOFF_BASE = 60           # initial retry interval on error
 BACKOFF_MAX = 900           # max retry interval (15 minutes)
 MAX_CONSECUTIVE_ERRORS = 20 # stop polling after this many consecutive failures
+LEASE_SECONDS = 120         # how long a claimed trip stays owned after its slot is due
+
+# Identifies this process when claiming trip leases, so several agent replicas
+# can run side by side without polling (and notifying) the same trip twice.
+REPLICA_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Per-upstream concurrency caps for the worker pool, keyed by upstream name.
+# Populated by _init_upstream_limits() inside polling_loop so the semaphores
+# bind to the agent's event loop. Empty (unbounded) when _process_trip is
+# driven directly, e.g. from tests.
+ADB_UPSTREAM = "aerodatabox"
+GOOGLE_UPSTREAM = "google_maps"
+_upstream_limits: dict[str, asyncio.Semaphore] = {}
+
+
+def _init_upstream_limits() -> None:
+    """Create the per-upstream semaphores that keep RapidAPI / Google quotas safe."""
+    _upstream_limits[ADB_UPSTREAM] = asyncio.Semaphore(max(settings.polling_adb_concurrency, 1))
+    _upstream_limits[GOOGLE_UPSTREAM] = asyncio.Semaphore(
+        max(settings.polling_google_concurrency, 1)
+    )
+
+
+# Connections one in-flight trip can hold at once: its own session (kept for
+# the whole of _process_trip) plus one opened by a helper it awaits
+# (get_trip_context, the airport / flight / drive-time caches).
+CONNECTIONS_PER_TRIP = 2
 
 
-async def _get_active_trips(session) -> list:
-    """Query trips with monitorable statuses, with user relationship loaded."""
+def _worker_limit() -> int:
+    """In-flight trips per tick: ``polling_concurrency``, capped by the DB pool.
+
+    Workers may use at most ``db_pool_size`` connections between them, so the
+    overflow stays free for the API sharing the engine.
+    """
+    return max(min(settings.polling_concurrency, settings.db_pool_size // CONNECTIONS_PER_TRIP), 1)
+
+
+def _upstream_slot(name: str):
+    """Async context manager holding one slot of the named upstream's semaphore."""
+    sem = _upstream_limits.get(name)
+    return sem if sem is not None else contextlib.nullcontext()
+
+
+async def _get_active_trips(session, trip_ids: list | None = None) -> list:
+    """Query trips with monitorable statuses, with user relationship loaded.
+
+    ``trip_ids`` restricts the query to the trips the scheduler says are due.
+    """
     stmt = (
         select(Trip)
         .where(Trip.trip_status.in_(list(MONITORABLE_STATUSES)))
         .options(selectinload(Trip.user))
     )
+    if trip_ids is not None:
+        stmt = stmt.where(Trip.id.in_(trip_ids))
     result = await session.execute(stmt)
     return list(result.scalars().all())
 
 
+async def _get_schedule_rows(session, trip_ids: list | None = None) -> list:
+    """Lightweight scan of monitorable trips: just the columns the scheduler needs.
+
+    Runs every DISCOVERY_INTERVAL (and for each tick's claimed trips), so it
+    deliberately avoids loading full rows, JSON payloads other than
+    projected_timeline, and the user relationship.
+    """
+    stmt = select(
+        Trip.id,
+        Trip.user_id,
+        Trip.flight_number,
+        Trip.origin_iata,
+        Trip.selected_departure_utc,
+        Trip.departure_date,
+        Trip.projected_timeline,
+        Trip.time_to_go_push_sent_at,
+    ).where(Trip.trip_status.in_(list(MONITORABLE_STATUSES)))
+    if trip_ids is not None:
+        stmt = stmt.where(Trip.id.in_(trip_ids))
+    result = await session.execute(stmt)
+    return list(result.all())
+
+
 def _seconds_to_departure(trip_row) -> float | None:
     """Return seconds until departure, or None if unparseable."""
     if trip_row.selected_departure_utc:
@@ -123,7 +217,6 @@ def _format_local_time(utc_dt: datetime, airport_iata: str | None) -> str:
     return local_dt.strftime("%I:%M %p").lstrip("0")
 
 
-INTERACTION_SIGNALS = {"timetogo_tap", "rideshare_tap", "nav_tap"}
 
 # Phase B thresholds — skip ADB refresh when the trip is far out, status is
 # stable, and last_updated_at is within one polling interval. Final 30 minutes
@@ -147,6 +240,13 @@ def _parse_iso_utc(s: str | None) -> datetime | None:
     return dt
 
 
+def _as_utc(dt: datetime | None) -> datetime | None:
+    """Normalize a DB datetime to aware UTC (SQLite hands back naive values)."""
+    if dt is None:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
 def _should_skip_refresh(trip_row, secs_to_dep: float | None, now: datetime) -> bool:
     """Return True if we can safely skip the ADB refresh this tick (Path B).
 
@@ -174,18 +274,241 @@ def _should_skip_refresh(trip_row, secs_to_dep: float | None, now: datetime) ->
     return age < _get_poll_interval(secs_to_dep)
 
 
-async def refresh_flight_status(trip_row, session) -> tuple[bool, dict]:
+def _normalize_flight_key(flight_number: str, departure_date) -> tuple[str, str]:
+    return (flight_number.replace(" ", "").upper(), str(departure_date))
+
+
+def _flight_key(trip_row) -> tuple[str, str] | None:
+    """Group key for trips on the same flight: normalized number + departure date."""
+    flight_number = getattr(trip_row, "flight_number", None)
+    departure_date = getattr(trip_row, "departure_date", None)
+    if not flight_number or not departure_date:
+        return None
+    return _normalize_flight_key(flight_number, departure_date)
+
+
+def _fids_window(trip_row, airport: str, date_str: str) -> tuple[str, str] | None:
+    """The FIDS window (airport-local half day) holding the trip's departure, if known."""
+    departure = _parse_iso_utc(getattr(trip_row, "selected_departure_utc", None))
+    tz_name = AIRPORT_TIMEZONES.get(airport)
+    if departure is None or tz_name is None:
+        return None
+    local = departure.astimezone(ZoneInfo(tz_name))
+    if local.date().isoformat() != date_str[:10]:
+        return None
+    return DEPARTURE_WINDOWS[0] if local.hour < 12 else DEPARTURE_WINDOWS[1]
+
+
+class FlightLookupBatch:
+    """Per-tick fan-in of ADB lookups: one call per (flight_number, departure_date).
+
+    Families and popular routes put many tracked trips on the same flight;
+    every trip in the group awaits the same lookup instead of issuing its
+    own. Failures are shared too, so a rate-limited flight is not retried
+    once per trip within the tick.
+
+    ``prefetch_airports`` goes one step further for hub airports: when one
+    FIDS departures pull is cheaper than the per-flight lookups it would
+    replace, trips there are served from the airport-wide board instead.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[tuple[str, str], tuple[FlightIndex | None, Exception | None]] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        # (flight_number, departure_date) -> FIDS rows from prefetch_airports
+        self._airport_flights: dict[tuple[str, str], FlightIndex] = {}
+        self.calls = 0
+        self.airport_calls = 0
+
+    async def prefetch_airports(self, trip_rows: list) -> None:
+        """Pull FIDS departures for airports where that beats per-flight lookups.
+
+        Only trips inside the always-refresh band (≤ 6 h out, see Path B)
+        are counted, since farther trips may skip the refresh entirely. Per
+        (origin airport, departure date) the per-flight cost is the number of
+        distinct flights not already fresh in the flight cache; the FIDS cost
+        is the number of half-day windows those trips depart in. FIDS wins
+        only when strictly cheaper, so a single trip never triggers it.
+
+        FIDS rows lack arrival details, so they feed status refreshes only
+        and are not written to the flight cache. Failures just leave the
+        per-flight path in place.
+        """
+        groups: dict[tuple[str, str], list] = {}
+        for row in trip_rows:
+            origin = getattr(row, "origin_iata", None)
+            key = _flight_key(row)
+            secs_to_dep = _seconds_to_departure(row)
+            if (
+                not origin
+                or key is None
+                or secs_to_dep is None
+                or secs_to_dep > PATH_B_MIN_SECONDS_TO_DEPARTURE
+            ):
+                continue
+            groups.setdefault((origin.strip().upper(), key[1]), []).append(row)
+
+        await asyncio.gather(
+            *(
+                self._prefetch_airport(airport, date_str, rows)
+                for (airport, date_str), rows in groups.items()
+            )
+        )
+
+    async def _prefetch_airport(self, airport: str, date_str: str, trip_rows: list) -> None:
+        flight_keys = {_flight_key(row) for row in trip_rows}
+        uncached = 0
+        for flight_number, departure_date in flight_keys:
+            if await flight_cache.get_cached_flights(flight_number, departure_date) is None:
+                uncached += 1
+
+        windows = {_fids_window(row, airport, date_str) for row in trip_rows}
+        if None in windows:
+            windows = set(DEPARTURE_WINDOWS)
+        if len(windows) >= uncached:
+            return
+
+        self.airport_calls += 1
+        try:
+            async with _upstream_slot(ADB_UPSTREAM):
+                departures = await lookup_airport_departures(
+                    airport,
+                    date_str,
+                    windows=tuple(sorted(windows)),
+                    flight_numbers={flight_number for flight_number, _ in flight_keys},
+                )
+        except AeroDataBoxError as e:
+            logger.warning(
+                "FIDS refresh for %s on %s failed (%s); using per-flight lookups",
+                airport, date_str, type(e).__name__,
+            )
+            return
+        except Exception:
+            logger.exception("FIDS refresh for %s on %s raised", airport, date_str)
+            return
+
+        by_flight: dict[tuple[str, str], list[dict]] = {}
+        for flight in departures:
+            if flight.get("flight_number"):
+                key = _normalize_flight_key(flight["flight_number"], date_str)
+                by_flight.setdefault(key, []).append(flight)
+        for key, flights in by_flight.items():
+            self._airport_flights[key] = FlightIndex.from_dicts(flights)
+        logger.info(
+            "FIDS refresh for %s on %s: %d window call(s) instead of %d flight lookups",
+            airport, date_str, len(windows), uncached,
+        )
+
+    def _airport_match(self, key: tuple[str, str], selected_utc: str | None) -> FlightIndex | None:
+        """FIDS rows for the flight matching the trip's departure, or None to fall back."""
+        flights = self._airport_flights.get(key)
+        if not flights:
+            return None
+        if not (selected_utc or "").strip():
+            return flights
+        match = flights.find(selected_utc)
+        return FlightIndex([match]) if match is not None else None
+
+    async def lookup(
+        self, flight_number: str, departure_date: str, selected_utc: str | None = None
+    ) -> FlightIndex:
+        key = _normalize_flight_key(flight_number, departure_date)
+        airport_flights = self._airport_match(key, selected_utc)
+        if airport_flights is not None:
+            return airport_flights
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key not in self._results:
+                self.calls += 1
+                try:
+                    flights = await lookup_flights_cached(
+                        flight_number, str(departure_date),
+                        upstream_slot=_upstream_slot(ADB_UPSTREAM),
+                    )
+                    self._results[key] = (flights, None)
+                except Exception as e:
+                    self._results[key] = (None, e)
+            flights, error = self._results[key]
+        if error is not None:
+            raise error
+        return flights
+
+
+def _drive_time_prefetch_request(trip_row, now: datetime) -> dict | None:
+    """``get_drive_time`` arguments an active-phase recompute of this trip would use.
+
+    None when the recompute would not call Google for the transport segment:
+    trip not in the active phase or not pro, no stored flight snapshot,
+    unchanged recompute fingerprint, or a still-fresh stored transport result.
+    Mirrors the checks in _process_trip / _compute_segments.
+    """
+    if get_trip_status(trip_row) != "active" or not is_pro_user(trip_row.user):
+        return None
+    home_address = getattr(trip_row, "home_address", None)
+    flight_info = getattr(trip_row, "flight_info", None)
+    if not home_address or not flight_info:
+        return None
+    snapshot = snapshot_from_columns(flight_info, getattr(trip_row, "flight_status", None))
+    if snapshot is None or not snapshot.origin_airport_code:
+        return None
+    fingerprint = recommendation_input_fingerprint(
+        snapshot, getattr(trip_row, "preferences_json", None), home_address, now
+    )
+    if (
+        fingerprint == getattr(trip_row, "recommendation_fingerprint", None)
+        and getattr(trip_row, "latest_recommendation", None)
+    ):
+        return None
+    transport_mode = _get_transport_mode(trip_row) or TransportMode.driving.value
+    request = drive_time_request(home_address, snapshot, transport_mode)
+    if not needs_drive_time(getattr(trip_row, "segment_sources", None), request, now):
+        return None
+    return request
+
+
+async def _prefetch_drive_times(trip_rows: list, now: datetime) -> None:
+    """Warm the drive-time cache for the tick's recomputes in batched Distance Matrix calls.
+
+    Trips to the same airport / terminal in the same departure bucket share
+    multi-origin requests (see ``google_maps.prefetch_drive_times``); each
+    trip's recompute then reads its transport segment from the cache.
+    Failures leave the per-trip path in place.
+    """
+    requests = [r for r in (_drive_time_prefetch_request(row, now) for row in trip_rows) if r]
+    if len(requests) < 2:
+        return  # a lone trip gains nothing over its own get_drive_time call
+    try:
+        async with _upstream_slot(GOOGLE_UPSTREAM):
+            calls = await prefetch_drive_times(requests)
+    except Exception:
+        logger.exception("Batched drive-time refresh raised; using per-trip lookups")
+        return
+    logger.info(
+        "Batched drive-time refresh: %d Distance Matrix call(s) for %d trip(s)",
+        calls, len(requests),
+    )
+
+
+async def refresh_flight_status(
+    trip_row, session, flight_lookups: FlightLookupBatch | None = None
+) -> tuple[bool, dict]:
     """Path A: fetch live ADB data and update flight_status on the trip row.
 
     Returns ``(was_called, changes)`` where ``was_called`` is True iff a live
-    ADB response was successfully parsed into a new flight_status. ``changes``
+    ADB response was successfully parsed into a new flight_status (during an
+    outage: cached last known good data newer than the trip's own). ``changes``
     is ``{field: (old, new)}`` for any tracked field that moved
     (gate / status / delay_minutes / cancelled / terminal).
 
     flight_info is immutable at the snapshot level; the single documented
     exception is ``terminal``, which may be reassigned by airlines after track.
     When terminal changes, we log at info level and update only that key
-    inside flight_info, preserving all other frozen fields.
+    inside flight_info, preserving all other frozen fields. A trip tracked
+    while ADB was down has no flight_info; it is frozen from the first live
+    (not last known good) response.
+
+    ``flight_lookups`` lets the agent share one ADB response across every
+    trip on the same flight in a tick; without it the lookup is made directly.
     """
     flight_number = getattr(trip_row, "flight_number", None)
     departure_date = getattr(trip_row, "departure_date", None)
@@ -193,7 +516,17 @@ async def refresh_flight_status(trip_row, session) -> tuple[bool, dict]:
         return (False, {})
 
     try:
-        flights = lookup_flights(flight_number, str(departure_date))
+        if flight_lookups is not None:
+            flights = await flight_lookups.lookup(
+                flight_number,
+                str(departure_date),
+                getattr(trip_row, "selected_departure_utc", None),
+            )
+        else:
+            flights = await lookup_flights_cached(
+                flight_number, str(departure_date),
+                upstream_slot=_upstream_slot(ADB_UPSTREAM),
+            )
     except AeroDataBoxError as e:
         logger.warning(
             "refresh_flight_status skipped (trip %s): %s",
@@ -215,6 +548,12 @@ async def refresh_flight_status(trip_row, session) -> tuple[bool, dict]:
         return (False, {})
 
     old_status = getattr(trip_row, "flight_status", None) or {}
+    if (selected.stale or selected.fetched_at) and not _is_newer(
+        new_status.get("last_updated_at"), old_status.get("last_updated_at")
+    ):
+        # Cached (or last known good) data is no newer than what the trip
+        # already holds; keep the trip's own state rather than regress it.
+        return (False, {})
     changes: dict = {}
     for field in TRACKED_STATUS_FIELDS:
         old_v = old_status.get(field)
@@ -225,7 +564,15 @@ async def refresh_flight_status(trip_row, session) -> tuple[bool, dict]:
     old_info = getattr(trip_row, "flight_info", None) or {}
     old_terminal = old_info.get("terminal")
     new_terminal = (new_info or {}).get("terminal")
-    if new_terminal is not None and new_terminal != old_terminal:
+    if not old_info:
+        # Tracked during an ADB outage: freeze flight_info from the first
+        # live response instead of the last known good data.
+        if new_info and not selected.stale:
+            trip_row.flight_info = new_info
+            trip_row.origin_iata = new_info.get("origin_iata")
+            trip_row.destination_iata = new_info.get("destination_iata")
+            trip_row.airline = new_info.get("airline")
+    elif new_terminal is not None and new_terminal != old_terminal:
         changes["terminal"] = (old_terminal, new_terminal)
         logger.info(
             "Trip %s terminal changed: %s -> %s",
@@ -243,6 +590,14 @@ async def refresh_flight_status(trip_row, session) -> tuple[bool, dict]:
     return (True, changes)
 
 
+def _is_newer(candidate: str | None, current: str | None) -> bool:
+    candidate_dt = _parse_iso_utc(candidate)
+    current_dt = _parse_iso_utc(current)
+    if candidate_dt is None:
+        return False
+    return current_dt is None or candidate_dt > current_dt
+
+
 async def _handle_status_change_notifications(
     trip_row, session, changes: dict
 ) -> None:
@@ -322,28 +677,56 @@ def _get_timeline_dt(trip_row, key: str) -> datetime | None:
         return None
 
 
-async def _check_interaction_signals(trip_row, user_id, session, since: datetime) -> datetime | None:
-    """Check events table for interaction signals since a given time. Returns event timestamp or None."""
+async def _load_interaction_index(session, trip_rows: list, now: datetime) -> dict:
+    """Load the timetogo taps that can still block SMS escalation, in one query.
+
+    Only trips with a pending TIME_TO_GO push need the check, so the lookback
+    starts at the oldest such push. Returns ``{user_id: [(event_name,
+    created_at), ...]}`` newest first.
+    """
+    pending = [
+        row for row in trip_rows
+        if row.user_id is not None and getattr(row, "time_to_go_push_sent_at", None) is not None
+    ]
+    if not pending:
+        return {}
+    since = min(_as_utc(row.time_to_go_push_sent_at) for row in pending)
+
     stmt = (
-        select(Event)
+        select(Event.user_id, Event.event_name, Event.created_at)
         .where(
-            Event.user_id == user_id,
-            Event.event_name.in_(INTERACTION_SIGNALS),
+            Event.user_id.in_({row.user_id for row in pending}),
+            Event.event_name == "timetogo_tap",
             Event.created_at >= since,
         )
         .order_by(Event.created_at.desc())
-        .limit(1)
     )
-    event = (await session.execute(stmt)).scalar_one_or_none()
-    if event:
-        return event.created_at
+    index: dict = {}
+    for user_id, event_name, created_at in (await session.execute(stmt)).all():
+        index.setdefault(user_id, []).append((event_name, _as_utc(created_at)))
+    return index
+
+
+def _find_interaction(
+    interactions: dict, user_id, since: datetime, names
+) -> datetime | None:
+    """Newest indexed event for ``user_id`` named in ``names`` at or after ``since``."""
+    since = _as_utc(since)
+    for event_name, created_at in interactions.get(user_id, ()):
+        if created_at < since:
+            break
+        if event_name in names:
+            return created_at
     return None
 
 
 async def _advance_trip_state(trip_row, session, now: datetime) -> None:
-    """Advance trip state based on time triggers and interaction signals."""
+    """Advance trip state based on time triggers.
+
+    Interaction signals (taps) are applied by POST /v1/events as they arrive,
+    so the agent only handles the time-based transitions here.
+    """
     current = get_trip_status(trip_row)
-    user = trip_row.user
     dep_utc = _get_departure_utc(trip_row)
 
     # Force close: departure + 24h
@@ -363,17 +746,6 @@ async def _advance_trip_state(trip_row, session, now: datetime) -> None:
             await session.commit()
             logger.info("Trip %s advanced to en_route (time-based)", trip_row.id)
             return
-        # Interaction signal: tap within last 10 min
-        if user:
-            signal_ts = await _check_interaction_signals(
-                trip_row, user.id, session, now - timedelta(minutes=10)
-            )
-            if signal_ts:
-                advance_status(trip_row, "en_route")
-                trip_row.actual_depart_at = signal_ts
-                await session.commit()
-                logger.info("Trip %s advanced to en_route (interaction signal)", trip_row.id)
-                return
 
     elif current == "en_route":
         arrive_at = _get_timeline_dt(trip_row, "arrive_airport_at")
@@ -430,8 +802,17 @@ async def _handle_feedback_request(trip_row, session, now: datetime) -> None:
             logger.exception("Failed to set feedback_requested_at for trip %s", trip_row.id)
 
 
-async def _process_trip(trip_row, session) -> None:
-    """Process a single trip: activate, advance state, recompute, notify."""
+async def _process_trip(
+    trip_row,
+    session,
+    flight_lookups: FlightLookupBatch | None = None,
+    interactions: dict | None = None,
+) -> None:
+    """Process a single trip: activate, advance state, recompute, notify.
+
+    ``flight_lookups`` and ``interactions`` are the polling tick's shared
+    ADB fan-in and preloaded timetogo taps; direct callers can omit them.
+    """
     now = datetime.now(tz=timezone.utc)
 
     # Activate if within 24 hours
@@ -464,7 +845,9 @@ async def _process_trip(trip_row, session) -> None:
         and not _should_skip_refresh(trip_row, secs_to_dep, now)
     ):
         try:
-            was_called, changes = await refresh_flight_status(trip_row, session)
+            was_called, changes = await refresh_flight_status(
+                trip_row, session, flight_lookups=flight_lookups
+            )
             if was_called:
                 try:
                     await session.commit()
@@ -518,45 +901,74 @@ async def _process_trip(trip_row, session) -> None:
                 trip_row.id,
             )
 
-    try:
-        payload = RecommendationRecomputeRequest(trip_id=str(trip_row.id))
-        response = await recompute_recommendation(
-            payload, user=user, prefetched_snapshot=prefetched_snapshot
+    # Skip the recompute (and its Directions / Distance Matrix / TSA / geocode
+    # calls) when none of its inputs moved since the stored recommendation.
+    fingerprint = None
+    reused_leave_at = None
+    if prefetched_snapshot is not None:
+        fingerprint = recommendation_input_fingerprint(
+            prefetched_snapshot,
+            getattr(trip_row, "preferences_json", None),
+            getattr(trip_row, "home_address", None),
+            now,
         )
-        if response is None:
+        if (
+            fingerprint == getattr(trip_row, "recommendation_fingerprint", None)
+            and getattr(trip_row, "latest_recommendation", None)
+        ):
+            reused_leave_at = _get_timeline_dt(trip_row, "leave_home_at")
+
+    if reused_leave_at is not None:
+        logger.debug("Trip %s recompute inputs unchanged; reusing stored recommendation", trip_row.id)
+        new_leave_at = reused_leave_at
+        origin_code = prefetched_snapshot.origin_airport_code
+    else:
+        try:
+            payload = RecommendationRecomputeRequest(trip_id=str(trip_row.id))
+            response = await recompute_recommendation(
+                payload,
+                user=user,
+                prefetched_snapshot=prefetched_snapshot,
+                previous_segment_sources=getattr(trip_row, "segment_sources", None),
+                maps_slot=_upstream_slot(GOOGLE_UPSTREAM),
+            )
+            if response is None:
+                return
+        except Exception:
+            logger.exception("Failed to recompute recommendation for trip %s", trip_row.id)
             return
-    except Exception:
-        logger.exception("Failed to recompute recommendation for trip %s", trip_row.id)
-        return
 
-    new_leave_at = response.leave_home_at
+        new_leave_at = response.leave_home_at
+        origin_code = response.origin_airport_code
 
-    # Persist latest_recommendation so the Active Trip Screen can render segments +
-    # map coordinates from the trip row (no round-trip to /v1/recommendations).
-    trip_row.latest_recommendation = build_latest_recommendation_jsonb(response)
+        # Persist latest_recommendation so the Active Trip Screen can render segments +
+        # map coordinates from the trip row (no round-trip to /v1/recommendations).
+        trip_row.latest_recommendation = build_latest_recommendation_jsonb(response)
+        trip_row.segment_sources = segment_sources(response)
+        trip_row.recommendation_fingerprint = fingerprint
 
-    # Update projected_timeline from recommendation segments
-    if response.segments:
-        from app.api.routes.trips import _build_projected_timeline
+        # Update projected_timeline from recommendation segments
+        if response.segments:
+            from app.api.routes.trips import _build_projected_timeline
 
-        dep_utc = _get_departure_utc(trip_row)
-        timeline = _build_projected_timeline(
-            response, dep_utc.isoformat() if dep_utc else None
-        )
-        if timeline:
-            trip_row.projected_timeline = timeline
+            dep_utc = _get_departure_utc(trip_row)
+            timeline = _build_projected_timeline(
+                response, dep_utc.isoformat() if dep_utc else None
+            )
+            if timeline:
+                trip_row.projected_timeline = timeline
 
-    try:
-        await session.commit()
-    except Exception:
-        logger.exception(
-            "Failed to commit projected_timeline / latest_recommendation for trip %s",
-            trip_row.id,
-        )
+        try:
+            await session.commit()
+        except Exception:
+            logger.exception(
+                "Failed to commit projected_timeline / latest_recommendation for trip %s",
+                trip_row.id,
+            )
 
     # Check for leave-by shift notification
     if should_notify_leave_by_shift(trip_row.last_pushed_leave_home_at, new_leave_at):
-        local_time_str = _format_local_time(new_leave_at, response.origin_airport_code)
+        local_time_str = _format_local_time(new_leave_at, origin_code)
 
         if trip_row.last_pushed_leave_home_at:
             body = f"Your leave-by time changed to {local_time_str}"
@@ -615,16 +1027,21 @@ async def _process_trip(trip_row, session) -> None:
     ):
         from app.services.notifications.sms_service import send_sms
 
-        tap_stmt = (
-            select(Event)
-            .where(
-                Event.user_id == user.id,
-                Event.event_name == "timetogo_tap",
-                Event.created_at >= time_to_go_sent,
+        if interactions is not None:
+            tap = _find_interaction(
+                interactions, user.id, time_to_go_sent, names={"timetogo_tap"}
             )
-            .limit(1)
-        )
-        tap = (await session.execute(tap_stmt)).scalar_one_or_none()
+        else:
+            tap_stmt = (
+                select(Event)
+                .where(
+                    Event.user_id == user.id,
+                    Event.event_name == "timetogo_tap",
+                    Event.created_at >= time_to_go_sent,
+                )
+                .limit(1)
+            )
+            tap = (await session.execute(tap_stmt)).scalar_one_or_none()
 
         if tap is None:
             flight = trip_row.flight_number or "your flight"
@@ -644,79 +1061,396 @@ def compute_backoff(consecutive_errors: int) -> int:
     return min(BACKOFF_BASE * (2 ** (consecutive_errors - 1)), BACKOFF_MAX)
 
 
-def compute_backoff(consecutive_errors: int) -> int:
-    """Compute backoff interval: 60s, 120s, 240s, ..., capped at 900s."""
-    return min(BACKOFF_BASE * (2 ** (consecutive_errors - 1)), BACKOFF_MAX)
-
+def _jitter_offset(key, interval: int) -> int:
+    """Stable per-trip phase within ``interval`` seconds.
 
-async def polling_loop() -> None:
-    """Infinite loop that polls active trips and processes them."""
-    import app.db as _db
+    Derived from the trip id (or flight key) rather than ``random`` so the
+    spread survives restarts: after a redeploy every trip lands back on its
+    own slot instead of all coming due on the first tick.
+    """
+    return zlib.crc32(str(key).encode()) % max(interval, 1)
 
-    # Startup delay — let the container and pooler stabilize
-    await asyncio.sleep(STARTUP_DELAY)
 
-    consecutive_errors = 0
+def _next_milestone(trip_row, now: datetime) -> datetime | None:
+    """Earliest future moment at which this trip's state or cadence can change.
 
-    # Startup delay — let the container and pooler stabilize
-    await asyncio.sleep(STARTUP_DELAY)
+    Covers the projected_timeline transitions, activation 24h before
+    departure, the auto-complete/force-close deadlines, and the
+    POLL_INTERVALS band edges — so a trip on a 30-min cadence is still
+    picked up right when it needs attention.
+    """
+    candidates: list[datetime] = []
+    for key in ("leave_home_at", "arrive_airport_at", "clear_security_at"):
+        dt = _get_timeline_dt(trip_row, key)
+        if dt is not None:
+            candidates.append(dt)
+    dep_utc = _get_departure_utc(trip_row)
+    if dep_utc is not None:
+        candidates.append(dep_utc - timedelta(hours=24))
+        candidates.append(dep_utc + timedelta(minutes=30))
+        candidates.append(dep_utc + timedelta(hours=24))
+        for threshold, _ in POLL_INTERVALS[:-1]:
+            candidates.append(dep_utc - timedelta(seconds=threshold))
+    future = [dt for dt in candidates if dt > now]
+    return min(future) if future else None
+
+
+def _next_due_at(trip_row, now: datetime) -> float:
+    """Return the epoch timestamp at which the trip should next be processed.
+
+    Trips sit on a grid of their ``_get_poll_interval`` cadence, phase-shifted
+    by ``_jitter_offset``; an upcoming milestone pulls the slot forward.
+    Trips on the same flight share a phase so they come due in the same tick
+    and their status refresh fans in to one ADB lookup.
+    """
+    interval = _get_poll_interval(_seconds_to_departure(trip_row))
+    now_ts = now.timestamp()
+    offset = _jitter_offset(_flight_key(trip_row) or trip_row.id, interval)
+    due = now_ts + interval - ((now_ts - offset) % interval)
+    milestone = _next_milestone(trip_row, now)
+    if milestone is not None:
+        due = min(due, milestone.timestamp())
+    return due
+
+
+def _schedule_signature(row) -> tuple:
+    """The schedule-relevant fields of a trip; a change means the trip was edited."""
+    return (
+        getattr(row, "flight_number", None),
+        getattr(row, "selected_departure_utc", None),
+        getattr(row, "departure_date", None),
+    )
 
-    consecutive_errors = 0
 
-    while True:
-        if _db.async_session_factory is None:
-            await asyncio.sleep(DEFAULT_SLEEP)
-            continue
+class TripScheduler:
+    """Min-heap of per-trip next-due times.
 
-        sleep_interval = DEFAULT_SLEEP
-        try:
-            async with _db.async_session_factory() as session:
-                trips = await _get_active_trips(session)
+    The polling loop wakes only when the earliest trip is due, so CPU and DB
+    work scale with the trips that need attention rather than with every
+    tracked trip. Discovery of new, edited and departed trips runs on its
+    own DISCOVERY_INTERVAL cadence (see ``needs_sync``). Heap entries are
+    invalidated lazily: ``_due`` holds the authoritative due time per trip
+    and stale heap entries are skipped.
+    """
 
-                if not trips:
-                    consecutive_errors = 0  # successful DB query
-                    await asyncio.sleep(DEFAULT_SLEEP)
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, object]] = []
+        self._due: dict[object, float] = {}
+        self._signatures: dict[object, tuple] = {}
+        self.synced_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, trip_id) -> bool:
+        return trip_id in self._due
+
+    def schedule(self, trip_id, due_at: float) -> None:
+        self._due[trip_id] = due_at
+        heapq.heappush(self._heap, (due_at, trip_id))
+
+    def needs_sync(self, now_ts: float) -> bool:
+        """Whether the monitorable-trip set is due for a rescan."""
+        return self.synced_at is None or now_ts - self.synced_at >= DISCOVERY_INTERVAL
+
+    def sync(self, rows, now: datetime) -> None:
+        """Add newly monitorable trips and forget trips that left the set.
+
+        On the first sync every trip takes its jittered slot, so a restart
+        doesn't make them all due at once. After that, trips that are new or
+        whose flight/departure changed are due immediately rather than
+        waiting up to a full interval for their first poll.
+        """
+        now_ts = now.timestamp()
+        first = self.synced_at is None
+        live: set = set()
+        for row in rows:
+            live.add(row.id)
+            signature = _schedule_signature(row)
+            previous = self._signatures.get(row.id)
+            self._signatures[row.id] = signature
+            if row.id in self._due:
+                if previous is None or previous == signature:
                     continue
+                self.schedule(row.id, now_ts)
+            elif previous is None and not first:
+                self.schedule(row.id, now_ts)
+            else:
+                self.schedule(row.id, _next_due_at(row, now))
+        for key in [k for k in self._due if k not in live]:
+            del self._due[key]
+        for key in [k for k in self._signatures if k not in live]:
+            del self._signatures[key]
+        self.synced_at = now_ts
+
+    def pop_due(self, now_ts: float) -> list:
+        """Remove and return every trip id whose due time is <= ``now_ts``."""
+        due: list = []
+        while self._heap and self._heap[0][0] <= now_ts:
+            due_at, key = heapq.heappop(self._heap)
+            if self._due.get(key) != due_at:
+                continue  # superseded or forgotten entry
+            del self._due[key]
+            due.append(key)
+        return due
+
+    def next_due_at(self) -> float | None:
+        """Earliest due timestamp, or None when nothing is scheduled."""
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def seconds_until_next(self, now_ts: float, cap: float = DEFAULT_SLEEP) -> float:
+        """Sleep duration until the next due trip or discovery scan, whichever is first."""
+        if self.synced_at is not None:
+            cap = min(cap, self.synced_at + DISCOVERY_INTERVAL - now_ts)
+        next_due = self.next_due_at()
+        if next_due is None:
+            return max(MIN_SLEEP, cap)
+        return max(MIN_SLEEP, min(cap, next_due - now_ts))
+
+
+async def _claim_due_trips(session, trip_ids: list, now: datetime) -> tuple[list, dict]:
+    """Take the poll lease on whichever due trips no other replica currently owns.
+
+    Rows are locked with ``FOR UPDATE SKIP LOCKED`` so replicas claiming at
+    the same moment never block on, or double-claim, each other's trips.
+    A trip is claimable when its lease is unset, expired, or already ours.
+
+    Returns ``(claimed_ids, lost)`` where ``lost`` maps each trip held by
+    another replica to when this replica should next try it.
+    """
+    stmt = (
+        select(Trip.id, Trip.poll_lease_owner, Trip.poll_lease_expires_at)
+        .where(Trip.id.in_(trip_ids))
+        .with_for_update(skip_locked=True)
+    )
+    rows = (await session.execute(stmt)).all()
+
+    claimed: list = []
+    lost: dict = {}
+    for row in rows:
+        expires = _as_utc(row.poll_lease_expires_at)
+        if row.poll_lease_owner in (None, REPLICA_ID) or expires is None or expires <= now:
+            claimed.append(row.id)
+        else:
+            lost[row.id] = expires.timestamp()
+
+    # Rows skipped because another replica holds the lock right now
+    seen = {row.id for row in rows}
+    for trip_id in trip_ids:
+        if trip_id not in seen:
+            lost[trip_id] = now.timestamp() + DEFAULT_SLEEP
+
+    if claimed:
+        await session.execute(
+            update(Trip)
+            .where(Trip.id.in_(claimed))
+            .values(
+                poll_lease_owner=REPLICA_ID,
+                poll_lease_expires_at=now + timedelta(seconds=LEASE_SECONDS),
+            )
+        )
+    await session.commit()
+    return claimed, lost
 
-                # Determine shortest needed interval
-                min_interval = DEFAULT_SLEEP
-                for trip in trips:
-                    secs = _seconds_to_departure(trip)
-                    interval = _get_poll_interval(secs)
-                    min_interval = min(min_interval, interval)
 
-                sleep_interval = min_interval
+async def _renew_lease(session, trip_id) -> bool:
+    """Restart our lease on ``trip_id`` as a worker picks it up; False if it was lost.
 
-                for trip in trips:
-                    try:
-                        await _process_trip(trip, session)
-                    except Exception:
-                        logger.exception("Error processing trip %s", trip.id)
+    Claimed trips can queue behind the worker pool for longer than
+    LEASE_SECONDS. Renewing only while we are still the owner means a trip
+    whose lease lapsed and was taken over by a peer is skipped here instead
+    of being processed (and notified) twice.
+    """
+    result = await session.execute(
+        update(Trip)
+        .where(Trip.id == trip_id, Trip.poll_lease_owner == REPLICA_ID)
+        .values(
+            poll_lease_expires_at=datetime.now(tz=timezone.utc) + timedelta(seconds=LEASE_SECONDS)
+        )
+    )
+    await session.commit()
+    return result.rowcount > 0
 
-            # Success — reset backoff
-            consecutive_errors = 0
 
-        except Exception:
-            consecutive_errors += 1
-            backoff = compute_backoff(consecutive_errors)
-            logger.exception(
-                "Polling loop error (consecutive_errors=%d, next_retry=%ds)",
-                consecutive_errors, backoff,
+async def _finish_lease(session, trip_id, next_due_at: float | None) -> None:
+    """Hold our lease until the trip's next slot (plus grace), or release it.
+
+    Keeping the lease past the next due time makes ownership sticky: this
+    replica re-claims the trip first, and others only take over once it has
+    been silent for LEASE_SECONDS.
+    """
+    if next_due_at is None:
+        values = {"poll_lease_owner": None, "poll_lease_expires_at": None}
+    else:
+        values = {
+            "poll_lease_expires_at": datetime.fromtimestamp(next_due_at, tz=timezone.utc)
+            + timedelta(seconds=LEASE_SECONDS),
+        }
+    await session.execute(
+        update(Trip)
+        .where(Trip.id == trip_id, Trip.poll_lease_owner == REPLICA_ID)
+        .values(**values)
+    )
+    await session.commit()
+
+
+async def _release_leases(session_factory) -> None:
+    """Drop every lease this replica holds so peers can pick the trips up at once."""
+    async with session_factory() as session:
+        await session.execute(
+            update(Trip)
+            .where(Trip.poll_lease_owner == REPLICA_ID)
+            .values(poll_lease_owner=None, poll_lease_expires_at=None)
+        )
+        await session.commit()
+
+
+async def _process_due_trip(
+    session_factory,
+    trip_id,
+    scheduler: TripScheduler,
+    flight_lookups: FlightLookupBatch | None = None,
+    interactions: dict | None = None,
+) -> None:
+    """Load and process one claimed trip in its own session, then reschedule it.
+
+    A dedicated session per trip keeps failures isolated: a rollback or a
+    broken connection in one trip can't poison the others in the same tick.
+    """
+    try:
+        async with session_factory() as session:
+            if not await _renew_lease(session, trip_id):
+                logger.info("Lease on trip %s was taken over before processing", trip_id)
+                scheduler.schedule(trip_id, time.time() + DEFAULT_SLEEP)
+                return
+            trips = await _get_active_trips(session, [trip_id])
+            if not trips:
+                await _finish_lease(session, trip_id, None)
+                return  # no longer monitorable; sync() will forget it
+            trip = trips[0]
+            failed = False
+            try:
+                await _process_trip(
+                    trip, session, flight_lookups=flight_lookups, interactions=interactions
+                )
+            except Exception:
+                failed = True
+                logger.exception("Error processing trip %s", trip.id)
+
+            next_due = None
+            if get_trip_status(trip) in MONITORABLE_STATUSES:
+                next_due = _next_due_at(trip, datetime.now(tz=timezone.utc))
+                scheduler.schedule(trip_id, next_due)
+            if failed:
+                await session.rollback()
+            await _finish_lease(session, trip_id, next_due)
+    except Exception:
+        logger.exception("Failed to load trip %s for processing", trip_id)
+        scheduler.schedule(trip_id, time.time() + DEFAULT_SLEEP)
+
+
+async def _run_due_trips(session_factory, scheduler: TripScheduler) -> None:
+    """Claim the trips due in the scheduler and process them on a bounded worker pool.
+
+    The monitorable-trip table is only rescanned every DISCOVERY_INTERVAL;
+    in between, due trips come from the heap alone. A tick finishes in roughly the slowest trip's latency instead of the sum
+    of all of them; ``_worker_limit()`` caps in-flight trips.
+    Due trips leased by another replica are pushed back to when their lease
+    lapses. Trips on the same flight share one ADB lookup for the tick,
+    busy airports are refreshed from one FIDS pull when that is cheaper,
+    drive times for the tick's recomputes are fetched in multi-origin
+    Distance Matrix calls, and the taps gating SMS escalation are loaded in
+    a single query.
+    """
+    now = datetime.now(tz=timezone.utc)
+    if scheduler.needs_sync(now.timestamp()):
+        async with session_factory() as session:
+            rows = await _get_schedule_rows(session)
+        scheduler.sync(rows, now)
+
+    due_ids = scheduler.pop_due(now.timestamp())
+    if not due_ids:
+        return
+
+    async with session_factory() as session:
+        claimed, lost = await _claim_due_trips(session, due_ids, now)
+        for trip_id, retry_at in lost.items():
+            scheduler.schedule(trip_id, retry_at)
+        if not claimed:
+            return
+        claimed_rows = await _get_schedule_rows(session, claimed)
+        interactions = await _load_interaction_index(session, claimed_rows, now)
+        claimed_trips = await _get_active_trips(session, claimed)
+
+    pool = asyncio.Semaphore(_worker_limit())
+    flight_lookups = FlightLookupBatch()
+    await flight_lookups.prefetch_airports(claimed_rows)
+    await _prefetch_drive_times(claimed_trips, now)
+
+    async def _worker(trip_id) -> None:
+        async with pool:
+            await _process_due_trip(
+                session_factory, trip_id, scheduler, flight_lookups, interactions
             )
 
-            if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
-                logger.error(
-                    "Polling agent stopped after %d consecutive errors "
-                    "(approximately 4 hours of failures). "
-                    "Manual restart required via redeploy.",
-                    consecutive_errors,
+    await asyncio.gather(*(_worker(trip_id) for trip_id in claimed))
+
+
+async def polling_loop() -> None:
+    """Infinite loop that wakes for due trips and processes them."""
+    import app.db as _db
+
+    # Startup delay — let the container and pooler stabilize
+    await asyncio.sleep(STARTUP_DELAY)
+
+    consecutive_errors = 0
+    scheduler = TripScheduler()
+    _init_upstream_limits()
+
+    try:
+        while True:
+            if _db.async_session_factory is None:
+                await asyncio.sleep(DEFAULT_SLEEP)
+                continue
+
+            try:
+                # Background refreshes yield RapidAPI budget to user-facing lookups
+                with use_priority(Priority.POLLING):
+                    await _run_due_trips(_db.async_session_factory, scheduler)
+
+                # Success — reset backoff
+                consecutive_errors = 0
+
+            except Exception:
+                consecutive_errors += 1
+                backoff = compute_backoff(consecutive_errors)
+                logger.exception(
+                    "Polling loop error (consecutive_errors=%d, next_retry=%ds)",
+                    consecutive_errors, backoff,
                 )
-                return  # exit the loop entirely
 
-            await asyncio.sleep(backoff)
-            continue  # skip the normal sleep below
+                if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                    logger.error(
+                        "Polling agent stopped after %d consecutive errors "
+                        "(approximately 4 hours of failures). "
+                        "Manual restart required via redeploy.",
+                        consecutive_errors,
+                    )
+                    return  # exit the loop entirely
+
+                await asyncio.sleep(backoff)
+                continue  # skip the normal sleep below
 
-        await asyncio.sleep(sleep_interval)
+            await asyncio.sleep(scheduler.seconds_until_next(time.time()))
+    finally:
+        _upstream_limits.clear()
+        if _db.async_session_factory is not None:
+            try:
+                await _release_leases(_db.async_session_factory)
+            except Exception:
+                logger.exception("Failed to release poll leases on shutdown")
 
 
 async def start_polling_agent() -> None:
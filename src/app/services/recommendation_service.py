@@ -1,8 +1,14 @@
 """Recommendation engine: lead time from preferences, flight snapshot, and integrations."""
 
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
 import math
 from datetime import datetime, timedelta, timezone
 
+from app.core import deadline
 from app.schemas.flight_snapshot import FlightSnapshot
 from app.schemas.recommendations import (
     ConfidenceLevel,
@@ -21,6 +27,7 @@ from app.services.flight_snapshot_service import build_flight_snapshot
 from app.services.integrations.airport_defaults import get_airport_timings
 from app.services.integrations.airport_graph import resolve_walking_times
 from app.services.integrations.google_maps import (
+    fallback_drive_time,
     geocode_address,
     get_drive_time,
     get_terminal_coordinates,
@@ -30,6 +37,8 @@ from app.services.integrations.tsa_model import estimate_tsa_wait
 from app.services.trial import get_tier_info
 from app.services.trip_intake import get_trip_context
 
+logger = logging.getLogger(__name__)
+
 CONFIDENCE_SCORES: dict[ConfidenceProfile, float] = {
     ConfidenceProfile.safety: 0.92,
     ConfidenceProfile.sweet: 0.85,
@@ -45,6 +54,141 @@ GATE_BUFFER_MINUTES: dict[ConfidenceProfile, int] = {
 }
 
 
+# Width of the wall-clock buckets folded into the recompute fingerprint. Live
+# TSA waits are re-read once an hour; traffic is re-read hourly while the
+# departure is far off and every 20 minutes inside the final two hours.
+TSA_FINGERPRINT_BUCKET_SECONDS = 3600
+DRIVE_FINGERPRINT_BUCKET_SECONDS = 3600
+DRIVE_FINGERPRINT_BUCKET_NEAR_SECONDS = 1200
+DRIVE_FINGERPRINT_NEAR_HOURS = 2
+
+
+# Freshness TTLs for the segment inputs that come from network calls. Inputs
+# without an entry (coordinates) only change when their key does. The other
+# segments (parking, at_airport, bag_drop/checkin, walk_to_gate, gate_buffer)
+# are pure functions of the snapshot and preferences and are re-derived on
+# every compute at no I/O cost.
+SEGMENT_TTL_SECONDS: dict[str, int] = {
+    "transport": 1200,  # traffic estimate
+    "tsa": 900,         # live TSA wait, same as tsa_api.CACHE_TTL
+}
+
+
+# Deadline for the concurrent segment-input fetches of a budgeted
+# (user-facing) recommendation build (see _fetch_segment_inputs), further
+# capped by the request budget. Inputs still outstanding when it passes fall
+# back as if their upstream had failed. Unbudgeted builds (the polling agent)
+# wait for their inputs: a fallback drive time there could move leave-by and
+# push a spurious shift notification.
+SEGMENT_INPUTS_DEADLINE_SECONDS = 12.0
+
+
+def _hash_inputs(inputs: dict) -> str:
+    blob = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def _reuse_source(previous: dict | None, name: str, key: str, now: datetime) -> tuple[bool, object]:
+    """Return ``(True, data)`` if the stored source ``name`` matches ``key`` and is fresh."""
+    entry = (previous or {}).get(name)
+    if not isinstance(entry, dict) or entry.get("key") != key:
+        return False, None
+    ttl = SEGMENT_TTL_SECONDS.get(name)
+    if ttl is not None:
+        try:
+            computed_at = datetime.fromisoformat(entry.get("computed_at"))
+        except (TypeError, ValueError):
+            return False, None
+        if (now - computed_at).total_seconds() > ttl:
+            return False, None
+    return True, entry.get("data")
+
+
+def _record_source(sources: dict | None, name: str, key: str, now: datetime, data) -> None:
+    if sources is not None:
+        sources[name] = {"key": key, "computed_at": now.isoformat(), "data": data}
+
+
+def drive_time_request(
+    home_address: str | None, snapshot: FlightSnapshot, transport_mode: str
+) -> dict:
+    """``get_drive_time`` arguments for the transport segment of ``snapshot``.
+
+    Traffic is estimated for a departure three hours before the flight.
+    Shared with the polling agent, which prefetches these in batches.
+    """
+    approx_leave = snapshot.scheduled_departure - timedelta(hours=3)
+    return {
+        "origin_address": home_address,
+        "airport_iata": snapshot.origin_airport_code or "",
+        "transport_mode": transport_mode,
+        "departure_time": int(approx_leave.timestamp()),
+        "terminal": snapshot.departure_terminal,
+    }
+
+
+def _transport_key(drive_request: dict) -> str:
+    return _hash_inputs({
+        "home_address": drive_request["origin_address"],
+        "origin": drive_request["airport_iata"],
+        "terminal": drive_request["terminal"],
+        "transport_mode": drive_request["transport_mode"],
+        "departure_time": drive_request["departure_time"],
+    })
+
+
+def _reuse_transport(previous_sources: dict | None, key: str, now: datetime) -> tuple[bool, object]:
+    reused, drive_data = _reuse_source(previous_sources, "transport", key, now)
+    # Fallback estimates are never reused: retry Google on the next compute.
+    if not reused or not isinstance(drive_data, dict) or drive_data.get("source") == "fallback":
+        return False, None
+    return True, drive_data
+
+
+def needs_drive_time(previous_sources: dict | None, drive_request: dict, now: datetime) -> bool:
+    """Whether a compute with ``drive_request`` would call ``get_drive_time``.
+
+    False when the trip's stored ``segment_sources`` still hold a fresh
+    transport result for the same inputs (see _compute_segments).
+    """
+    reused, _ = _reuse_transport(previous_sources, _transport_key(drive_request), now)
+    return not reused
+
+
+def recommendation_input_fingerprint(
+    snapshot: FlightSnapshot,
+    preferences_json: str | None,
+    home_address: str | None,
+    now: datetime,
+) -> str:
+    """Hash everything a background recompute depends on.
+
+    Two recomputes with the same fingerprint would make the same upstream
+    calls and produce the same leave-home time, so the polling agent reuses
+    the stored latest_recommendation instead. The TSA and drive-time buckets
+    make the fingerprint roll over on their own as live data goes stale.
+    """
+    now_ts = int(now.timestamp())
+    hours_out = (snapshot.scheduled_departure - now).total_seconds() / 3600
+    drive_bucket = (
+        DRIVE_FINGERPRINT_BUCKET_NEAR_SECONDS
+        if hours_out <= DRIVE_FINGERPRINT_NEAR_HOURS
+        else DRIVE_FINGERPRINT_BUCKET_SECONDS
+    )
+    inputs = {
+        "scheduled_departure": snapshot.scheduled_departure.isoformat(),
+        "origin": snapshot.origin_airport_code,
+        "terminal": snapshot.departure_terminal,
+        "gate": snapshot.departure_gate,
+        "departure_local_hour": snapshot.departure_local_hour,
+        "preferences": preferences_json,
+        "home_address": home_address,
+        "tsa_bucket": now_ts // TSA_FINGERPRINT_BUCKET_SECONDS,
+        "drive_bucket": f"{drive_bucket}:{now_ts // drive_bucket}",
+    }
+    return _hash_inputs(inputs)
+
+
 def build_latest_recommendation_jsonb(response) -> dict:
     """Marshal a RecommendationResponse into the latest_recommendation JSONB shape.
 
@@ -62,12 +206,23 @@ def build_latest_recommendation_jsonb(response) -> dict:
         }
         for seg in (response.segments or [])
     ]
-    return {
+    result = {
         "segments": segments,
         "home_coordinates": response.home_coordinates,
         "terminal_coordinates": response.terminal_coordinates,
         "computed_at": now_iso,
     }
+    return result
+
+
+def segment_sources(response) -> dict | None:
+    """The inputs behind ``response``'s segments, for the trip's ``segment_sources`` column.
+
+    Internal recompute state: kept out of latest_recommendation, which the
+    trip endpoints return as-is.
+    """
+    sources = getattr(response, "_segment_sources", None)
+    return sources if isinstance(sources, dict) and sources else None
 
 
 def _effective_context(
@@ -97,22 +252,149 @@ def _effective_context(
     return context.model_copy(update={"preferences": new_prefs})
 
 
-async def _compute_segments(context: TripContext, snapshot: FlightSnapshot) -> list[SegmentDetail]:
+async def _in_slot(slot, fetch, *args):
+    """Await ``fetch(*args)`` while holding ``slot`` (if any)."""
+    async with slot or contextlib.nullcontext():
+        return await fetch(*args)
+
+
+async def _fetch_segment_inputs(
+    context: TripContext,
+    snapshot: FlightSnapshot,
+    previous_sources: dict | None,
+    sources: dict | None,
+    now: datetime,
+    maps_slot=None,
+) -> dict:
+    """Resolve the network-backed inputs of a recommendation concurrently.
+
+    Returns ``{"transport", "tsa", "terminal_coordinates", "home_coordinates"}``.
+    ``previous_sources`` is the trip's stored ``segment_sources`` map: an input is reused from it when its key is
+    unchanged and within SEGMENT_TTL_SECONDS, so e.g. a gate change re-derives
+    the segments without network I/O. The rest are fetched as concurrent
+    tasks and joined, so the build waits for the slowest one rather than
+    their sum. Under a request budget, fetches still running after
+    SEGMENT_INPUTS_DEADLINE_SECONDS, or when the budget runs out, are
+    cancelled, fall back (45-minute
+    drive, baseline-only TSA, no coordinates) without being recorded, and
+    mark the budget degraded. The results used are written to ``sources``.
+    ``maps_slot`` is an async context manager held around each Google Maps
+    fetch only (the polling agent's Google concurrency cap).
+    """
+    origin_iata = snapshot.origin_airport_code or ""
+    drive_request = drive_time_request(
+        context.home_address, snapshot, context.preferences.transport_mode.value
+    )
+    keys = {
+        "transport": _transport_key(drive_request),
+        "tsa": _hash_inputs({"origin": origin_iata}),
+        "terminal_coordinates": _hash_inputs(
+            {"origin": origin_iata, "terminal": snapshot.departure_terminal}
+        ),
+        "home_coordinates": _hash_inputs({"home_address": context.home_address}),
+    }
+    inputs: dict = {}
+    calls: dict = {}
+    reused_names: list[str] = []
+
+    reused, drive_data = _reuse_transport(previous_sources, keys["transport"], now)
+    if reused:
+        inputs["transport"] = drive_data
+        reused_names.append("transport")
+    else:
+        calls["transport"] = _in_slot(maps_slot, lambda: get_drive_time(**drive_request))
+
+    reused, live_tsa = _reuse_source(previous_sources, "tsa", keys["tsa"], now)
+    if reused:
+        inputs["tsa"] = live_tsa
+        reused_names.append("tsa")
+    elif origin_iata:
+        calls["tsa"] = fetch_live_tsa_wait(origin_iata)
+    else:
+        inputs["tsa"] = None
+        _record_source(sources, "tsa", keys["tsa"], now, None)
+
+    reused, terminal_coords = _reuse_source(
+        previous_sources, "terminal_coordinates", keys["terminal_coordinates"], now
+    )
+    if reused and terminal_coords is not None:
+        inputs["terminal_coordinates"] = terminal_coords
+        reused_names.append("terminal_coordinates")
+    else:
+        calls["terminal_coordinates"] = _in_slot(
+            maps_slot, get_terminal_coordinates, origin_iata, snapshot.departure_terminal
+        )
+
+    reused, home_coords = _reuse_source(
+        previous_sources, "home_coordinates", keys["home_coordinates"], now
+    )
+    if reused and home_coords is not None:
+        inputs["home_coordinates"] = home_coords
+        reused_names.append("home_coordinates")
+    else:
+        calls["home_coordinates"] = _in_slot(maps_slot, geocode_address, context.home_address)
+
+    # Reused inputs carry their stored entry forward unchanged.
+    if sources is not None:
+        for name in reused_names:
+            sources[name] = previous_sources[name]
+
+    tasks = {name: asyncio.ensure_future(call) for name, call in calls.items()}
+    budget = deadline.current_budget()
+    if tasks:
+        timeout = None
+        if budget is not None:
+            timeout = min(SEGMENT_INPUTS_DEADLINE_SECONDS, budget.remaining())
+        _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    for name, task in tasks.items():
+        if not task.cancelled() and task.exception() is None:
+            inputs[name] = task.result()
+            # A live TSA wait skipped for the budget is retried next compute.
+            if not (name == "tsa" and budget is not None and "tsa" in budget.degraded):
+                _record_source(sources, name, keys[name], now, inputs[name])
+            continue
+        if task.cancelled():
+            deadline.mark_degraded(name)
+            logger.warning("Segment input %s for %s missed its deadline", name, origin_iata)
+        else:
+            logger.warning(
+                "Segment input %s for %s failed", name, origin_iata, exc_info=task.exception()
+            )
+        if name == "transport":
+            inputs[name] = fallback_drive_time(origin_iata, drive_request["transport_mode"])
+        else:
+            inputs[name] = None
+    return inputs
+
+
+async def _compute_segments(
+    context: TripContext,
+    snapshot: FlightSnapshot,
+    previous_sources: dict | None = None,
+    sources: dict | None = None,
+    now: datetime | None = None,
+    inputs: dict | None = None,
+) -> list[SegmentDetail]:
+    """Build the journey segments for ``context`` / ``snapshot``.
+
+    ``inputs`` are the network-backed inputs from _fetch_segment_inputs;
+    when omitted they are fetched here with ``previous_sources`` /
+    ``sources``.
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    if inputs is None:
+        inputs = await _fetch_segment_inputs(context, snapshot, previous_sources, sources, now)
     origin_iata = snapshot.origin_airport_code or ""
     timings = get_airport_timings(origin_iata)
     prefs = context.preferences
     segments: list[SegmentDetail] = []
 
     # 1. Transport to airport (travel time)
-    approx_leave = snapshot.scheduled_departure - timedelta(hours=3)
-    departure_ts = int(approx_leave.timestamp())
-    drive_data = await get_drive_time(
-        context.home_address,
-        origin_iata,
-        transport_mode=prefs.transport_mode.value,
-        departure_time=departure_ts,
-        terminal=snapshot.departure_terminal,
-    )
+    drive_data = inputs["transport"]
     if prefs.confidence_profile == ConfidenceProfile.safety:
         drive_minutes = drive_data["duration_pessimistic"]
     elif prefs.confidence_profile == ConfidenceProfile.risk:
@@ -274,7 +556,7 @@ async def _compute_segments(context: TripContext, snapshot: FlightSnapshot) -> l
     if departure_hour is None:
         departure_hour = snapshot.scheduled_departure.hour if snapshot.scheduled_departure else 12
     dow = snapshot.scheduled_departure.weekday()  # 0=Monday
-    live_tsa = await fetch_live_tsa_wait(origin_iata) if origin_iata else None
+    live_tsa = inputs["tsa"]
     tsa = estimate_tsa_wait(
         airport_iata=origin_iata,
         departure_hour=departure_hour,
@@ -348,9 +630,19 @@ async def _build_response(
     snapshot: FlightSnapshot,
     computed_at: datetime,
     user=None,
+    previous_sources: dict | None = None,
+    maps_slot=None,
 ) -> RecommendationResponse:
+    """Assemble the recommendation; ``previous_sources`` is the trip's stored segment_sources."""
     prefs = context.preferences
-    segments = await _compute_segments(context, snapshot)
+    sources: dict = {}
+    inputs = await _fetch_segment_inputs(
+        context, snapshot, previous_sources, sources, computed_at, maps_slot=maps_slot
+    )
+    segments = await _compute_segments(
+        context, snapshot, previous_sources=previous_sources, sources=sources,
+        now=computed_at, inputs=inputs,
+    )
     raw_total = sum(s.duration_minutes for s in segments)
 
     # Additional buffers
@@ -403,12 +695,14 @@ async def _build_response(
 
     tier, remaining_pro_trips = get_tier_info(user)
 
-    # Resolve coordinates for map display
     origin_iata = snapshot.origin_airport_code or ""
-    terminal_coords = get_terminal_coordinates(origin_iata, snapshot.departure_terminal)
-    home_coords = geocode_address(context.home_address)
-
-    return RecommendationResponse(
+    budget = deadline.current_budget()
+    degraded = budget is not None and bool(budget.degraded)
+    if degraded:
+        logger.warning(
+            "Recommendation for trip %s degraded: %s", trip_id, ", ".join(sorted(budget.degraded))
+        )
+    response = RecommendationResponse(
         trip_id=trip_id,
         leave_home_at=leave_home_at,
         gate_arrival_utc=gate_arrival_at,
@@ -420,10 +714,14 @@ async def _build_response(
         leave_home_in_past=leave_home_in_past,
         tier=tier,
         remaining_pro_trips=remaining_pro_trips,
-        terminal_coordinates=terminal_coords,
-        home_coordinates=home_coords,
+        terminal_coordinates=inputs["terminal_coordinates"],
+        home_coordinates=inputs["home_coordinates"],
         origin_airport_code=origin_iata,
+        flight_data_stale=snapshot.is_stale,
+        degraded=degraded,
     )
+    response._segment_sources = sources
+    return response
 
 
 async def compute_recommendation(
@@ -443,7 +741,7 @@ async def compute_recommendation(
     context = await get_trip_context(payload.trip_id)
     if context is None:
         return None
-    snapshot = build_flight_snapshot(context, strict=strict)
+    snapshot = await build_flight_snapshot(context, strict=strict)
     now = datetime.now(tz=timezone.utc)
     return await _build_response(str(context.trip_id), context, snapshot, now, user=user)
 
@@ -453,6 +751,8 @@ async def recompute_recommendation(
     user=None,
     *,
     prefetched_snapshot: FlightSnapshot | None = None,
+    previous_segment_sources: dict | None = None,
+    maps_slot=None,
     strict: bool = False,
 ) -> RecommendationResponse | None:
     """
@@ -465,6 +765,13 @@ async def recompute_recommendation(
     (flight_number / departure_date / selected_departure_utc) force the fresh
     build_flight_snapshot path even if a prefetched snapshot is passed —
     edit-mode preview can't trust the stored snapshot.
+
+    ``previous_segment_sources`` is the trip's stored segment_sources;
+    segment inputs recorded there are reused when still valid (see
+    _compute_segments). Edit-mode previews ignore it too.
+
+    ``maps_slot`` is held around each Google Maps fetch only, so the rest of
+    the build (TSA, snapshot, segment math) doesn't occupy it.
     """
     context = await get_trip_context(payload.trip_id)
     if context is None:
@@ -483,10 +790,14 @@ async def recompute_recommendation(
         # Edit-mode preview: stored flight_info is for the saved flight, not the
         # hypothetical one being previewed. Force fresh ADB path.
         prefetched_snapshot = None
+        previous_segment_sources = None
 
-    snapshot = prefetched_snapshot or build_flight_snapshot(context, strict=strict)
+    snapshot = prefetched_snapshot or await build_flight_snapshot(context, strict=strict)
     now = datetime.now(tz=timezone.utc)
-    response = await _build_response(payload.trip_id, context, snapshot, now, user=user)
+    response = await _build_response(
+        payload.trip_id, context, snapshot, now, user=user,
+        previous_sources=previous_segment_sources, maps_slot=maps_slot,
+    )
     if payload.reason:
         response.explanation = f"[Recompute: {payload.reason}] " + response.explanation
     return response
@@ -4,6 +4,8 @@ from datetime import datetime, timezone
 
 STATUS_ORDER = ["draft", "created", "active", "en_route", "at_airport", "at_gate", "complete"]
 MONITORABLE_STATUSES = {"active", "en_route", "at_airport", "at_gate"}
+# Taps that mean the user is leaving for the airport now
+INTERACTION_SIGNALS = {"timetogo_tap", "rideshare_tap", "nav_tap"}
 
 
 def get_trip_status(trip_row) -> str:
@@ -46,6 +48,19 @@ def advance_status(trip_row, new_status: str) -> None:
     trip_row.trip_status = new_status
 
 
+def apply_interaction_signal(trip_row, signal_at: datetime) -> bool:
+    """Move an active trip to en_route on an interaction signal.
+
+    Records ``signal_at`` as the actual departure. Returns True if the trip
+    advanced; trips in any other status are left untouched.
+    """
+    if get_trip_status(trip_row) != "active":
+        return False
+    advance_status(trip_row, "en_route")
+    trip_row.actual_depart_at = signal_at
+    return True
+
+
 def _parse_departure_time(trip_row) -> datetime | None:
     """Parse departure time from trip row. Uses selected_departure_utc if available, else noon UTC on departure_date."""
     if trip_row.selected_departure_utc:
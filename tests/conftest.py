@@ -86,11 +86,47 @@ def _default_adb_lookup_returns_empty():
     """
     with (
         patch("app.services.flight_snapshot_service.lookup_flights", return_value=[]),
-        patch("app.services.polling_agent.lookup_flights", return_value=[]),
     ):
         yield
 
 
+@pytest.fixture(autouse=True)
+def _clear_flight_cache():
+    """Start every test with empty in-process flight, departures-board,
+    geocode and drive-time caches, no drive-time profiles, a full ADB quota
+    and a closed ADB circuit breaker.
+
+    The DB layer is already inert (async_session_factory is None), but the
+    memory layers would otherwise carry one test's mocked flights, geocodes
+    and drive times into the next, the RapidAPI token bucket would drain
+    across the suite, and a run of mocked 5xx responses would leave the
+    breaker open for later tests.
+    """
+    from app.services import (
+        departures_board,
+        drive_time_cache,
+        drive_time_profiles,
+        flight_cache,
+        geocode_cache,
+    )
+    from app.services.integrations.aerodatabox import breaker
+    from app.services.integrations.rapidapi_quota import quota
+
+    flight_cache.clear_memory()
+    departures_board.clear()
+    geocode_cache.clear_memory()
+    drive_time_cache.clear_memory()
+    drive_time_profiles.clear_memory()
+    quota.reset()
+    breaker.reset()
+    yield
+    flight_cache.clear_memory()
+    departures_board.clear()
+    geocode_cache.clear_memory()
+    drive_time_cache.clear_memory()
+    drive_time_profiles.clear_memory()
+
+
 # ---------------------------------------------------------------------------
 # Existing fixture (db=None) — untouched, used by existing tests
 # ---------------------------------------------------------------------------
@@ -0,0 +1,141 @@
+"""Shared AeroDataBox client: one pooled AsyncClient per event loop, closed on shutdown;
+concurrent identical lookups coalesced into one request."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.integrations import aerodatabox
+
+
+class TestSharedClient:
+    @pytest.mark.asyncio
+    async def test_reused_within_loop(self):
+        try:
+            first = aerodatabox.get_client()
+            assert aerodatabox.get_client() is first
+            assert str(first.base_url).rstrip("/") == aerodatabox.ADB_BASE_URL
+            assert first.headers["x-rapidapi-host"] == "aerodatabox.p.rapidapi.com"
+        finally:
+            await aerodatabox.close_client()
+
+    @pytest.mark.asyncio
+    async def test_close_client_resets(self):
+        first = aerodatabox.get_client()
+        await aerodatabox.close_client()
+        assert first.is_closed
+        try:
+            assert aerodatabox.get_client() is not first
+        finally:
+            await aerodatabox.close_client()
+
+    def test_new_loop_gets_new_client(self):
+        async def _grab():
+            return aerodatabox.get_client()
+
+        first = asyncio.run(_grab())
+        second = asyncio.run(_grab())
+        assert first is not second
+        asyncio.run(aerodatabox.close_client())
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class TestCoalescedLookups:
+    @pytest.mark.asyncio
+    async def test_concurrent_flight_lookups_share_one_request(self):
+        async def _get(url, **kwargs):
+            await asyncio.sleep(0.01)
+            return _Response([{"number": "UA 100", "departure": {}, "arrival": {}}])
+
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=_get)
+        with patch.object(aerodatabox, "get_client", return_value=client):
+            results = await asyncio.gather(
+                aerodatabox.lookup_flights("UA100", "2026-06-01"),
+                aerodatabox.lookup_flights(" ua100 ", "2026-06-01"),
+                aerodatabox.lookup_flights("UA100", "2026-06-01"),
+            )
+
+        assert client.get.await_count == 1
+        assert results[0] == results[1] == results[2]
+        # Callers get their own rows; enriching one doesn't leak into another
+        results[0][0]["catchable"] = False
+        assert "catchable" not in results[1][0]
+
+    @pytest.mark.asyncio
+    async def test_different_dates_are_separate_requests(self):
+        client = MagicMock()
+        client.get = AsyncMock(return_value=_Response([]))
+        with patch.object(aerodatabox, "get_client", return_value=client):
+            await asyncio.gather(
+                aerodatabox.lookup_flights("UA100", "2026-06-01"),
+                aerodatabox.lookup_flights("UA100", "2026-06-02"),
+            )
+        assert client.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_departure_boards_share_one_fetch(self):
+        client = MagicMock()
+        client.get = AsyncMock(return_value=_Response({"departures": []}))
+        with patch.object(aerodatabox, "get_client", return_value=client):
+            await asyncio.gather(
+                aerodatabox.lookup_airport_departures("sfo", "2026-06-01"),
+                aerodatabox.lookup_airport_departures("SFO", "2026-06-01"),
+            )
+        # One fetch = two windows
+        assert client.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_departure_board_can_fetch_one_window(self):
+        client = MagicMock()
+        client.get = AsyncMock(return_value=_Response({"departures": []}))
+        with patch.object(aerodatabox, "get_client", return_value=client):
+            await aerodatabox.lookup_airport_departures(
+                "SFO", "2026-06-01", windows=aerodatabox.DEPARTURE_WINDOWS[1:]
+            )
+        assert client.get.await_count == 1
+        assert client.get.await_args.args[0] == (
+            "/flights/airports/iata/SFO/2026-06-01T12:00/2026-06-01T23:59"
+        )
+
+
+class TestFilterBeforeParse:
+    _BOARD = {
+        "departures": [
+            {"number": "UA 100", "movement": {"airport": {"iata": "LAX"}}},
+            {"number": "DL 5", "movement": {"airport": {"iata": "JFK"}}},
+            {"number": "AA 20", "movement": {"airport": {"iata": "LAX"}}},
+        ]
+    }
+
+    @pytest.mark.asyncio
+    async def test_only_matching_rows_are_parsed(self):
+        async def _get(url, **kwargs):
+            # Whole board in the morning window, nothing in the afternoon
+            return _Response(self._BOARD if "T00:00" in url else {"departures": []})
+
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=_get)
+        with patch.object(aerodatabox, "get_client", return_value=client), patch.object(
+            aerodatabox, "parse_departure", wraps=aerodatabox.parse_departure
+        ) as parse:
+            to_lax = await aerodatabox.lookup_airport_departures(
+                "SFO", "2026-06-01", destination="lax"
+            )
+            tracked = await aerodatabox.lookup_airport_departures(
+                "SFO", "2026-06-01", flight_numbers={"dl5", "AA20"}
+            )
+
+        assert [f["flight_number"] for f in to_lax] == ["UA 100", "AA 20"]
+        assert [f["flight_number"] for f in tracked] == ["DL 5", "AA 20"]
+        assert parse.call_count == len(to_lax) + len(tracked)
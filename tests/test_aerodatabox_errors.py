@@ -1,7 +1,8 @@
 """Tests for differentiated AeroDataBox error handling.
 
 Covers:
-    * Integration layer: lookup_flights, lookup_airport_departures raising
+    * Integration layer: lookup_flights, lookup_airport_departures (on the
+      shared async client) raising
       typed AeroDataBoxError subclasses per failure mode.
     * Route layer: /v1/flights/{n}/{date} and /v1/flights/search translating
       those to HTTP 404 / 503 with distinct error codes and Retry-After.
@@ -9,6 +10,7 @@ Covers:
     * polling_agent.refresh_flight_status narrow exception + warning log.
 """
 
+import asyncio
 import uuid
 from datetime import date as _date
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -45,20 +47,20 @@ class _MockResponse:
 
 
 def _patch_httpx_get(response_or_side_effect):
-    """Return a context manager that patches aerodatabox.httpx.Client.get.
+    """Return a patcher that swaps the shared AeroDataBox client's .get.
 
     Pass either a _MockResponse instance (returned from .get) or an exception
     instance (raised from .get).
     """
-    patcher = patch("app.services.integrations.aerodatabox.httpx.Client")
-    mock_cls = patcher.start()
-    mock_cls.return_value.__enter__ = lambda s: s
-    mock_cls.return_value.__exit__ = lambda s, *a: None
-
+    client = MagicMock()
     if isinstance(response_or_side_effect, Exception):
-        mock_cls.return_value.get = MagicMock(side_effect=response_or_side_effect)
+        client.get = AsyncMock(side_effect=response_or_side_effect)
     else:
-        mock_cls.return_value.get = MagicMock(return_value=response_or_side_effect)
+        client.get = AsyncMock(return_value=response_or_side_effect)
+    patcher = patch(
+        "app.services.integrations.aerodatabox.get_client", return_value=client
+    )
+    patcher.start()
     return patcher
 
 
@@ -66,90 +68,101 @@ def _patch_httpx_get(response_or_side_effect):
 
 
 class TestLookupFlightsErrors:
-    def test_404_raises_not_found(self):
+    @pytest.mark.asyncio
+    async def test_404_raises_not_found(self):
         patcher = _patch_httpx_get(_MockResponse(404, payload=None))
         try:
             with pytest.raises(AeroDataBoxNotFound):
-                lookup_flights("AA999", "2026-06-01")
+                await lookup_flights("AA999", "2026-06-01")
         finally:
             patcher.stop()
 
-    def test_429_raises_rate_limited(self):
+    @pytest.mark.asyncio
+    async def test_429_raises_rate_limited(self):
         patcher = _patch_httpx_get(_MockResponse(429, payload=None))
         try:
             with pytest.raises(AeroDataBoxRateLimited):
-                lookup_flights("AA123", "2026-06-01")
+                await lookup_flights("AA123", "2026-06-01")
         finally:
             patcher.stop()
 
-    def test_500_raises_unavailable(self):
+    @pytest.mark.asyncio
+    async def test_500_raises_unavailable(self):
         patcher = _patch_httpx_get(_MockResponse(500, payload=None))
         try:
             with pytest.raises(AeroDataBoxUnavailable):
-                lookup_flights("AA123", "2026-06-01")
+                await lookup_flights("AA123", "2026-06-01")
         finally:
             patcher.stop()
 
-    def test_503_raises_unavailable(self):
+    @pytest.mark.asyncio
+    async def test_503_raises_unavailable(self):
         patcher = _patch_httpx_get(_MockResponse(503, payload=None))
         try:
             with pytest.raises(AeroDataBoxUnavailable):
-                lookup_flights("AA123", "2026-06-01")
+                await lookup_flights("AA123", "2026-06-01")
         finally:
             patcher.stop()
 
-    def test_read_timeout_raises_timeout(self):
+    @pytest.mark.asyncio
+    async def test_read_timeout_raises_timeout(self):
         patcher = _patch_httpx_get(httpx.ReadTimeout("read timed out"))
         try:
             with pytest.raises(AeroDataBoxTimeout):
-                lookup_flights("AA123", "2026-06-01")
+                await lookup_flights("AA123", "2026-06-01")
         finally:
             patcher.stop()
 
-    def test_connect_error_raises_unavailable(self):
+    @pytest.mark.asyncio
+    async def test_connect_error_raises_unavailable(self):
         patcher = _patch_httpx_get(httpx.ConnectError("connect refused"))
         try:
             with pytest.raises(AeroDataBoxUnavailable):
-                lookup_flights("AA123", "2026-06-01")
+                await lookup_flights("AA123", "2026-06-01")
         finally:
             patcher.stop()
 
-    def test_malformed_json_raises_unavailable(self):
+    @pytest.mark.asyncio
+    async def test_malformed_json_raises_unavailable(self):
         patcher = _patch_httpx_get(_MockResponse(200, raises_json=True))
         try:
             with pytest.raises(AeroDataBoxUnavailable):
-                lookup_flights("AA123", "2026-06-01")
+                await lookup_flights("AA123", "2026-06-01")
         finally:
             patcher.stop()
 
-    def test_non_list_response_raises_unavailable(self):
+    @pytest.mark.asyncio
+    async def test_non_list_response_raises_unavailable(self):
         """Upstream sometimes returns 200 with a dict (error body) instead of a list."""
         patcher = _patch_httpx_get(_MockResponse(200, payload={"error": "oops"}))
         try:
             with pytest.raises(AeroDataBoxUnavailable):
-                lookup_flights("AA123", "2026-06-01")
+                await lookup_flights("AA123", "2026-06-01")
         finally:
             patcher.stop()
 
-    def test_empty_list_returns_empty_no_exception(self):
+    @pytest.mark.asyncio
+    async def test_empty_list_returns_empty_no_exception(self):
         """A legitimate 200 + empty list is a valid "no matches" result, not an error."""
         patcher = _patch_httpx_get(_MockResponse(200, payload=[]))
         try:
-            assert lookup_flights("AA123", "2026-06-01") == []
+            assert await lookup_flights("AA123", "2026-06-01") == []
         finally:
             patcher.stop()
 
-    def test_204_no_content_returns_empty_no_exception(self):
+    @pytest.mark.asyncio
+    async def test_204_no_content_returns_empty_no_exception(self):
         """AeroDataBox returns 204 No Content when the flight number is not
         recognized. Per RFC 7231 that's a success response — treat it as an
         empty list, not an error. This mirrors the 200+empty-list behavior."""
         patcher = _patch_httpx_get(_MockResponse(204, payload=None))
         try:
-            assert lookup_flights("UA99999", "2026-05-01") == []
+            assert await lookup_flights("UA99999", "2026-05-01") == []
         finally:
             patcher.stop()
 
-    def test_204_does_not_attempt_json_parse(self):
+    @pytest.mark.asyncio
+    async def test_204_does_not_attempt_json_parse(self):
         """HTTP 204 responses have an empty body by spec. Calling .json() on
         an empty body would raise JSONDecodeError. Verify lookup_flights
         short-circuits on status==204 before reaching the JSON parser."""
@@ -164,7 +177,7 @@ class TestLookupFlightsErrors:
         patcher = _patch_httpx_get(_ExplodingJsonResponse())
         try:
             # Should return [] without ever hitting .json()
-            assert lookup_flights("UA99999", "2026-05-01") == []
+            assert await lookup_flights("UA99999", "2026-05-01") == []
         finally:
             patcher.stop()
 
@@ -186,27 +199,30 @@ class TestLookupAirportDeparturesPartialSuccess:
         return _get
 
     def _patch_paired(self, morning, afternoon):
-        patcher = patch("app.services.integrations.aerodatabox.httpx.Client")
-        mock_cls = patcher.start()
-        mock_cls.return_value.__enter__ = lambda s: s
-        mock_cls.return_value.__exit__ = lambda s, *a: None
-        mock_cls.return_value.get = MagicMock(side_effect=self._paired_windows(morning, afternoon))
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=self._paired_windows(morning, afternoon))
+        patcher = patch(
+            "app.services.integrations.aerodatabox.get_client", return_value=client
+        )
+        patcher.start()
         return patcher
 
     _GOOD = _MockResponse(200, payload={"departures": []})
 
-    def test_both_windows_fail_same_type_reraises(self):
+    @pytest.mark.asyncio
+    async def test_both_windows_fail_same_type_reraises(self):
         patcher = self._patch_paired(
             _MockResponse(500, payload=None),
             _MockResponse(500, payload=None),
         )
         try:
             with pytest.raises(AeroDataBoxUnavailable):
-                lookup_airport_departures("SFO", "2026-06-01")
+                await lookup_airport_departures("SFO", "2026-06-01")
         finally:
             patcher.stop()
 
-    def test_partial_success_morning_window_only(self):
+    @pytest.mark.asyncio
+    async def test_partial_success_morning_window_only(self):
         """Window 1 succeeds, window 2 raises → return window 1 data, swallow error."""
         morning = _MockResponse(200, payload={"departures": [
             {
@@ -225,13 +241,14 @@ class TestLookupAirportDeparturesPartialSuccess:
         ]})
         patcher = self._patch_paired(morning, _MockResponse(503, payload=None))
         try:
-            result = lookup_airport_departures("SFO", "2026-06-01")
+            result = await lookup_airport_departures("SFO", "2026-06-01")
             assert len(result) == 1
             assert result[0]["flight_number"] == "UA300"
         finally:
             patcher.stop()
 
-    def test_partial_success_afternoon_window_only(self):
+    @pytest.mark.asyncio
+    async def test_partial_success_afternoon_window_only(self):
         """Window 1 raises, window 2 succeeds → return window 2 data."""
         afternoon = _MockResponse(200, payload={"departures": [
             {
@@ -250,13 +267,14 @@ class TestLookupAirportDeparturesPartialSuccess:
         ]})
         patcher = self._patch_paired(_MockResponse(503, payload=None), afternoon)
         try:
-            result = lookup_airport_departures("SFO", "2026-06-01")
+            result = await lookup_airport_departures("SFO", "2026-06-01")
             assert len(result) == 1
             assert result[0]["flight_number"] == "AA200"
         finally:
             patcher.stop()
 
-    def test_both_fail_different_severities_worst_wins(self):
+    @pytest.mark.asyncio
+    async def test_both_fail_different_severities_worst_wins(self):
         """Window 1 NotFound, Window 2 Unavailable → Unavailable is more severe, wins."""
         patcher = self._patch_paired(
             _MockResponse(404, payload=None),
@@ -264,11 +282,12 @@ class TestLookupAirportDeparturesPartialSuccess:
         )
         try:
             with pytest.raises(AeroDataBoxUnavailable):
-                lookup_airport_departures("XXX", "2026-06-01")
+                await lookup_airport_departures("XXX", "2026-06-01")
         finally:
             patcher.stop()
 
-    def test_both_windows_204_returns_empty_no_exception(self):
+    @pytest.mark.asyncio
+    async def test_both_windows_204_returns_empty_no_exception(self):
         """Both departure windows returning 204 No Content (airport known but
         zero departures that day) should produce an empty list, not raise.
         Parallel to the 200+empty case — 204 is a success per RFC 7231."""
@@ -277,12 +296,42 @@ class TestLookupAirportDeparturesPartialSuccess:
             _MockResponse(204, payload=None),
         )
         try:
-            result = lookup_airport_departures("SFO", "2026-06-01")
+            result = await lookup_airport_departures("SFO", "2026-06-01")
             assert result == []
         finally:
             patcher.stop()
 
 
+    @pytest.mark.asyncio
+    async def test_windows_fetched_concurrently(self):
+        """Both windows are in flight at once; results keep window order."""
+        in_flight = 0
+        peak = 0
+
+        async def _get(url, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            number = "UA1" if "T00:00" in url else "UA2"
+            return _MockResponse(200, payload={"departures": [{
+                "number": number,
+                "movement": {
+                    "airport": {"iata": "LAX"},
+                    "scheduledTime": {"utc": "2026-06-01 08:00Z"},
+                },
+            }]})
+
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=_get)
+        with patch("app.services.integrations.aerodatabox.get_client", return_value=client):
+            result = await lookup_airport_departures("SFO", "2026-06-01")
+
+        assert peak == 2
+        assert [f["flight_number"] for f in result] == ["UA1", "UA2"]
+
+
 # ── Route layer: /v1/flights/{flight_number}/{date} ──────────────────────────
 
 
@@ -367,15 +416,7 @@ class TestFlightsByNumberRouteTranslation:
 class TestFlightsSearchRouteTranslation:
     def _patch_both_windows(self, response_or_exc):
         """Both departure windows share one mock response/exception."""
-        patcher = patch("app.services.integrations.aerodatabox.httpx.Client")
-        mock_cls = patcher.start()
-        mock_cls.return_value.__enter__ = lambda s: s
-        mock_cls.return_value.__exit__ = lambda s, *a: None
-        if isinstance(response_or_exc, Exception):
-            mock_cls.return_value.get = MagicMock(side_effect=response_or_exc)
-        else:
-            mock_cls.return_value.get = MagicMock(return_value=response_or_exc)
-        return patcher
+        return _patch_httpx_get(response_or_exc)
 
     def test_both_windows_503_returns_503(self, client: TestClient):
         patcher = self._patch_both_windows(_MockResponse(503, payload=None))
@@ -432,7 +473,8 @@ class TestBuildFlightSnapshotStrictMode:
     """The strict flag controls AeroDataBoxError handling; unexpected errors
     always fall back in both modes (hybrid behavior documented in the code)."""
 
-    def test_strict_true_propagates_unavailable(self):
+    @pytest.mark.asyncio
+    async def test_strict_true_propagates_unavailable(self):
         from app.services import flight_snapshot_service
 
         with patch.object(
@@ -443,9 +485,10 @@ class TestBuildFlightSnapshotStrictMode:
             # Use a fresh cache key to avoid hitting the module-level cache
             ctx = _make_trip_context(flight_number="TESTSTRICT1")
             with pytest.raises(AeroDataBoxUnavailable):
-                flight_snapshot_service.build_flight_snapshot(ctx, strict=True)
+                await flight_snapshot_service.build_flight_snapshot(ctx, strict=True)
 
-    def test_strict_true_propagates_rate_limited(self):
+    @pytest.mark.asyncio
+    async def test_strict_true_propagates_rate_limited(self):
         from app.services import flight_snapshot_service
 
         with patch.object(
@@ -455,9 +498,10 @@ class TestBuildFlightSnapshotStrictMode:
         ):
             ctx = _make_trip_context(flight_number="TESTSTRICT2")
             with pytest.raises(AeroDataBoxRateLimited):
-                flight_snapshot_service.build_flight_snapshot(ctx, strict=True)
+                await flight_snapshot_service.build_flight_snapshot(ctx, strict=True)
 
-    def test_strict_false_falls_back_on_adb_error(self):
+    @pytest.mark.asyncio
+    async def test_strict_false_falls_back_on_adb_error(self):
         from app.services import flight_snapshot_service
 
         with patch.object(
@@ -466,13 +510,14 @@ class TestBuildFlightSnapshotStrictMode:
             side_effect=AeroDataBoxUnavailable("upstream down"),
         ):
             ctx = _make_trip_context(flight_number="TESTSTRICT3")
-            snapshot = flight_snapshot_service.build_flight_snapshot(ctx, strict=False)
+            snapshot = await flight_snapshot_service.build_flight_snapshot(ctx, strict=False)
             assert snapshot is not None
             # Fallback snapshot has the canonical 10 AM UTC scheduled_departure
             assert snapshot.scheduled_departure.hour == 10
             assert snapshot.departure_local_hour == 10
 
-    def test_strict_true_unexpected_exception_still_falls_back(self):
+    @pytest.mark.asyncio
+    async def test_strict_true_unexpected_exception_still_falls_back(self):
         """Hybrid behavior: typed AeroDataBoxError propagates; random exceptions
         are still caught by the outer except Exception and fall back."""
         from app.services import flight_snapshot_service
@@ -484,7 +529,7 @@ class TestBuildFlightSnapshotStrictMode:
         ):
             ctx = _make_trip_context(flight_number="TESTSTRICT4")
             # Should NOT raise — outer except Exception handles it.
-            snapshot = flight_snapshot_service.build_flight_snapshot(ctx, strict=True)
+            snapshot = await flight_snapshot_service.build_flight_snapshot(ctx, strict=True)
             assert snapshot is not None
             assert snapshot.scheduled_departure.hour == 10
 
@@ -495,7 +540,7 @@ class TestBuildFlightSnapshotStrictMode:
 class TestPollingAgentNarrowsAdbError:
     @pytest.mark.asyncio
     async def test_refresh_flight_status_catches_adb_error_logs_class_name(self, caplog):
-        from app.services import polling_agent
+        from app.services import flight_snapshot_service, polling_agent
 
         trip_row = MagicMock()
         trip_row.id = uuid.uuid4()
@@ -503,7 +548,7 @@ class TestPollingAgentNarrowsAdbError:
         trip_row.departure_date = "2026-06-01"
 
         with patch.object(
-            polling_agent,
+            flight_snapshot_service,
             "lookup_flights",
             side_effect=AeroDataBoxTimeout("timed out"),
         ):
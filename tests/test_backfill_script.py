@@ -324,3 +324,23 @@ class TestBackfillScript:
         assert counts["written"] == 0
         row = _read_trip(factory, trip_id)
         assert row.flight_info is None
+
+    def test_skips_when_quota_defers(self, test_session):
+        """Backfill runs at the lowest quota class; a deferral skips the trip."""
+        from app.services.integrations.aerodatabox import AeroDataBoxQuotaDeferred
+
+        factory, _ = test_session
+        trip_id = uuid.uuid4()
+        _seed_trip_needs_api(
+            factory, uuid.uuid4(), trip_id, datetime(2026, 4, 1, 12, 0, 0)
+        )
+
+        with patch(
+            "scripts.backfill_flight_snapshots.lookup_flights",
+            side_effect=AeroDataBoxQuotaDeferred("reserved"),
+        ):
+            counts = _run_script(factory, dry_run=False)
+
+        assert counts["skipped"] == 1
+        assert counts["written"] == 0
+        assert _read_trip(factory, trip_id).flight_info is None
@@ -0,0 +1,325 @@
+"""ADB circuit breaker and stale-while-revalidate fallback for flight data."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.core.deadline import request_budget
+from app.schemas.trips import TripContext, TripPreferences
+from app.services import flight_cache, flight_snapshot_service, polling_agent
+from app.services.integrations import aerodatabox
+from app.services.integrations.aerodatabox import (
+    AeroDataBoxCircuitOpen,
+    AeroDataBoxTimeout,
+    AeroDataBoxUnavailable,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_fails_fast(self):
+        clock = _Clock()
+        b = CircuitBreaker("t", failure_threshold=3, reset_timeout=30, clock=clock)
+        for _ in range(2):
+            b.record_failure()
+        assert b.state == CLOSED and b.allow()
+        b.record_failure()
+        assert b.state == OPEN
+        assert not b.allow()
+
+    def test_success_resets_failure_count(self):
+        b = CircuitBreaker("t", failure_threshold=2, clock=_Clock())
+        b.record_failure()
+        b.record_success()
+        b.record_failure()
+        assert b.state == CLOSED
+
+    def test_half_open_allows_one_probe(self):
+        clock = _Clock()
+        b = CircuitBreaker("t", failure_threshold=1, reset_timeout=30, clock=clock)
+        b.record_failure()
+        clock.now = 31
+        assert b.allow()
+        assert b.state == HALF_OPEN
+        assert not b.allow()  # probe already in flight
+
+    def test_probe_failure_reopens_and_success_closes(self):
+        clock = _Clock()
+        b = CircuitBreaker("t", failure_threshold=1, reset_timeout=30, clock=clock)
+        b.record_failure()
+        clock.now = 31
+        assert b.allow()
+        b.record_failure()
+        assert b.state == OPEN and not b.allow()
+        clock.now = 62
+        assert b.allow()
+        b.record_success()
+        assert b.state == CLOSED and b.allow()
+
+    def test_refusing_does_not_claim_probe(self):
+        clock = _Clock()
+        b = CircuitBreaker("t", failure_threshold=1, reset_timeout=30, clock=clock)
+        assert not b.refusing()
+        b.record_failure()
+        assert b.refusing()
+        clock.now = 31
+        assert not b.refusing() and not b.refusing()
+        assert b.allow()
+        assert b.refusing()
+
+
+class TestAdbBreaker:
+    @pytest.mark.asyncio
+    async def test_repeated_timeouts_open_circuit(self):
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=httpx.ReadTimeout("slow"))
+        with patch.object(aerodatabox, "get_client", return_value=client):
+            for _ in range(aerodatabox.breaker.failure_threshold):
+                with pytest.raises(AeroDataBoxTimeout):
+                    await aerodatabox.lookup_flights("UA100", "2026-06-01")
+            with pytest.raises(AeroDataBoxCircuitOpen):
+                await aerodatabox.lookup_flights("UA100", "2026-06-01")
+
+        assert client.get.await_count == aerodatabox.breaker.failure_threshold
+        # Open circuit still maps to the Unavailable handling in routes
+        assert issubclass(AeroDataBoxCircuitOpen, AeroDataBoxUnavailable)
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip_breaker(self):
+        response = MagicMock(status_code=404)
+        client = MagicMock()
+        client.get = AsyncMock(return_value=response)
+        with patch.object(aerodatabox, "get_client", return_value=client):
+            for _ in range(aerodatabox.breaker.failure_threshold + 1):
+                with pytest.raises(aerodatabox.AeroDataBoxNotFound):
+                    await aerodatabox.lookup_flights("XX1", "2026-06-01")
+        assert aerodatabox.breaker.state == CLOSED
+
+    def _half_open(self):
+        breaker = CircuitBreaker("adb", failure_threshold=1, reset_timeout=30, clock=_Clock())
+        breaker.record_failure()
+        breaker._clock.now = 31
+        return breaker
+
+    @pytest.mark.asyncio
+    async def test_budget_expiry_releases_half_open_probe(self):
+        breaker = self._half_open()
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=httpx.ReadTimeout("slow"))
+        with patch.object(aerodatabox, "breaker", breaker), \
+                patch.object(aerodatabox, "get_client", return_value=client), \
+                request_budget(4):
+            with pytest.raises(aerodatabox.AeroDataBoxBudgetSpent):
+                await aerodatabox.lookup_flights("UA100", "2026-06-01")
+        # No verdict on the upstream: still half-open, and the next call may probe
+        assert breaker.state == HALF_OPEN
+        assert not breaker.refusing()
+        assert breaker.allow()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_is_released(self):
+        breaker = self._half_open()
+        started = asyncio.Event()
+
+        async def _hang(*args, **kwargs):
+            started.set()
+            await asyncio.sleep(10)
+
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=_hang)
+        with patch.object(aerodatabox, "breaker", breaker), \
+                patch.object(aerodatabox, "get_client", return_value=client):
+            task = asyncio.ensure_future(
+                aerodatabox._send("http://adb", {}, 10.0, "UA100")
+            )
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+
+    @pytest.mark.asyncio
+    async def test_quota_deferral_keeps_half_open_probe(self):
+        breaker = CircuitBreaker("adb", failure_threshold=1, reset_timeout=30, clock=_Clock())
+        breaker.record_failure()
+        breaker._clock.now = 31
+        response = MagicMock(status_code=200)
+        response.json.return_value = []
+        client = MagicMock()
+        client.get = AsyncMock(return_value=response)
+        acquire = AsyncMock(side_effect=[False, True])
+        with patch.object(aerodatabox, "breaker", breaker), \
+                patch.object(aerodatabox, "get_client", return_value=client), \
+                patch.object(aerodatabox.quota, "acquire", new=acquire):
+            with pytest.raises(aerodatabox.AeroDataBoxQuotaDeferred):
+                await aerodatabox.lookup_flights("UA100", "2026-06-01")
+            # The deferred call never claimed the probe, so the next one can
+            assert await aerodatabox.lookup_flights("UA100", "2026-06-01") == []
+        assert breaker.state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_spends_no_quota(self):
+        acquire = AsyncMock(return_value=True)
+        for _ in range(aerodatabox.breaker.failure_threshold):
+            aerodatabox.breaker.record_failure()
+        with patch.object(aerodatabox.quota, "acquire", new=acquire):
+            with pytest.raises(AeroDataBoxCircuitOpen):
+                await aerodatabox.lookup_flights("UA100", "2026-06-01")
+        acquire.assert_not_awaited()
+
+
+def _flight(dep: datetime, gate: str) -> dict:
+    return {
+        "flight_number": "UA100",
+        "origin_iata": "SFO",
+        "departure_time_utc": dep.strftime("%Y-%m-%d %H:%MZ"),
+        "departure_time_local": dep.strftime("%Y-%m-%d %H:%M"),
+        "departure_terminal": "3",
+        "departure_gate": gate,
+        "status": "Scheduled",
+    }
+
+
+class TestStaleFallback:
+    def _context(self, dep: datetime) -> TripContext:
+        return TripContext(
+            trip_id=uuid.uuid4(),
+            input_mode="flight_number",
+            flight_number="UA100",
+            departure_date=dep.date(),
+            home_address="1 Market St",
+            created_at="2026-06-01T00:00:00+00:00",
+            preferences=TripPreferences(),
+        )
+
+    @pytest.mark.asyncio
+    async def test_strict_snapshot_serves_last_known_good(self):
+        dep = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+        past = datetime.now(tz=timezone.utc) - timedelta(hours=1)
+        await flight_cache.store_flights(
+            "UA100", dep.date().isoformat(), [_flight(dep, "B7")], now=past
+        )
+
+        with patch.object(
+            flight_snapshot_service,
+            "lookup_flights",
+            side_effect=AeroDataBoxCircuitOpen("open"),
+        ):
+            snapshot = await flight_snapshot_service.build_flight_snapshot(
+                self._context(dep), strict=True
+            )
+
+        assert snapshot.is_stale is True
+        assert snapshot.departure_gate == "B7"
+
+    @pytest.mark.asyncio
+    async def test_strict_snapshot_raises_without_cached_data(self):
+        dep = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+        with patch.object(
+            flight_snapshot_service,
+            "lookup_flights",
+            side_effect=AeroDataBoxCircuitOpen("open"),
+        ):
+            with pytest.raises(AeroDataBoxCircuitOpen):
+                await flight_snapshot_service.build_flight_snapshot(
+                    self._context(dep), strict=True
+                )
+
+    @pytest.mark.asyncio
+    async def test_not_found_is_never_served_stale(self):
+        dep = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+        past = datetime.now(tz=timezone.utc) - timedelta(hours=1)
+        await flight_cache.store_flights(
+            "UA100", dep.date().isoformat(), [_flight(dep, "B7")], now=past
+        )
+        with patch.object(
+            flight_snapshot_service,
+            "lookup_flights",
+            side_effect=aerodatabox.AeroDataBoxNotFound("gone"),
+        ):
+            with pytest.raises(aerodatabox.AeroDataBoxNotFound):
+                await flight_snapshot_service.build_flight_snapshot(
+                    self._context(dep), strict=True
+                )
+
+    def _trip(self, dep: datetime, last_updated_at: str | None):
+        return SimpleNamespace(
+            id=uuid.uuid4(),
+            flight_number="UA100",
+            departure_date=dep.date().isoformat(),
+            selected_departure_utc=None,
+            flight_info={"terminal": "3"},
+            flight_status=(
+                {"gate": "A1", "status": "Scheduled", "last_updated_at": last_updated_at}
+                if last_updated_at else None
+            ),
+        )
+
+    @pytest.mark.asyncio
+    async def test_agent_applies_stale_data_newer_than_trip(self):
+        dep = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+        fetched = datetime.now(tz=timezone.utc) - timedelta(minutes=30)
+        await flight_cache.store_flights(
+            "UA100", dep.date().isoformat(), [_flight(dep, "B7")], now=fetched
+        )
+        trip = self._trip(dep, (fetched - timedelta(hours=1)).isoformat())
+
+        with patch.object(
+            flight_snapshot_service, "lookup_flights", side_effect=AeroDataBoxTimeout("slow")
+        ):
+            was_called, changes = await polling_agent.refresh_flight_status(trip, None)
+
+        assert was_called is True
+        assert changes["gate"] == ("A1", "B7")
+        assert "stale" not in trip.flight_status
+        assert trip.flight_status["last_updated_at"] == fetched.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_agent_does_not_freeze_flight_info_from_stale_data(self):
+        dep = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+        fetched = datetime.now(tz=timezone.utc) - timedelta(minutes=30)
+        await flight_cache.store_flights(
+            "UA100", dep.date().isoformat(), [_flight(dep, "B7")], now=fetched
+        )
+        trip = self._trip(dep, None)
+        trip.flight_info = None
+
+        with patch.object(
+            flight_snapshot_service, "lookup_flights", side_effect=AeroDataBoxTimeout("slow")
+        ):
+            was_called, _ = await polling_agent.refresh_flight_status(trip, None)
+
+        assert was_called is True
+        assert trip.flight_status["gate"] == "B7"
+        assert trip.flight_info is None
+
+    @pytest.mark.asyncio
+    async def test_agent_keeps_trip_state_newer_than_stale_data(self):
+        dep = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+        fetched = datetime.now(tz=timezone.utc) - timedelta(minutes=30)
+        await flight_cache.store_flights(
+            "UA100", dep.date().isoformat(), [_flight(dep, "B7")], now=fetched
+        )
+        trip = self._trip(dep, datetime.now(tz=timezone.utc).isoformat())
+
+        with patch.object(
+            flight_snapshot_service, "lookup_flights", side_effect=AeroDataBoxTimeout("slow")
+        ):
+            was_called, changes = await polling_agent.refresh_flight_status(trip, None)
+
+        assert (was_called, changes) == (False, {})
+        assert trip.flight_status["gate"] == "A1"
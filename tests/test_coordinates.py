@@ -1,13 +1,31 @@
 """Tests for terminal_coordinates lookup, geocode_address, and response schema fields."""
 
-from unittest.mock import patch, MagicMock
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.services import geocode_cache
 from app.services.integrations import google_maps
 from app.schemas.recommendations import RecommendationResponse
 
 
+def _geocode_response(lat: float, lng: float) -> MagicMock:
+    fake_response = MagicMock()
+    fake_response.json.return_value = {
+        "results": [{"geometry": {"location": {"lat": lat, "lng": lng}}}]
+    }
+    fake_response.raise_for_status = MagicMock()
+    return fake_response
+
+
+def _mock_client(get) -> MagicMock:
+    client = MagicMock()
+    client.get = get
+    return client
+
+
 class TestGetTerminalCoordinates:
     """Tests for get_terminal_coordinates static lookup and geocoding fallback."""
 
@@ -15,97 +33,170 @@ class TestGetTerminalCoordinates:
         # Reset the module-level cache so each test loads fresh data
         google_maps._terminal_coords_cache = None
 
-    def test_known_airport_and_terminal(self):
+    @pytest.mark.asyncio
+    async def test_known_airport_and_terminal(self):
         """Known airport + terminal returns coordinates from static file."""
-        result = google_maps.get_terminal_coordinates("SFO", "1")
+        result = await google_maps.get_terminal_coordinates("SFO", "1")
         assert result is not None
         assert "lat" in result
         assert "lng" in result
 
-    def test_unknown_terminal_falls_back_to_default(self):
+    @pytest.mark.asyncio
+    async def test_unknown_terminal_falls_back_to_default(self):
         """Unknown terminal for a known airport falls back to 'default'."""
-        result = google_maps.get_terminal_coordinates("SFO", "ZZZ")
-        default = google_maps.get_terminal_coordinates("SFO", None)
+        result = await google_maps.get_terminal_coordinates("SFO", "ZZZ")
+        default = await google_maps.get_terminal_coordinates("SFO", None)
         assert result is not None
         assert result == default
 
-    def test_unknown_airport_no_destination_returns_none(self):
+    @pytest.mark.asyncio
+    async def test_unknown_airport_no_destination_returns_none(self):
         """Airport not in static file AND not in AIRPORT_DESTINATIONS returns None."""
-        result = google_maps.get_terminal_coordinates("XXX", "1")
+        result = await google_maps.get_terminal_coordinates("XXX", "1")
         assert result is None
 
-    def test_geocoding_fallback_for_missing_airport(self):
-        """Airport not in static file but in AIRPORT_DESTINATIONS triggers geocoding API."""
+    @pytest.mark.asyncio
+    async def test_geocoding_fallback_for_missing_airport(self):
+        """Airport not in static file but in AIRPORT_DESTINATIONS triggers geocoding API, once."""
         # Temporarily remove SFO from static coords to simulate a missing airport
         google_maps._terminal_coords_cache = None
         coords = google_maps._load_terminal_coords()
         saved = coords.pop("SFO")
 
-        fake_response = MagicMock()
-        fake_response.json.return_value = {
-            "results": [{"geometry": {"location": {"lat": 37.621, "lng": -122.379}}}]
-        }
-        fake_response.raise_for_status = MagicMock()
-
-        with patch("app.services.integrations.google_maps.httpx.Client") as mock_client:
-            mock_instance = MagicMock()
-            mock_client.return_value.__enter__ = MagicMock(return_value=mock_instance)
-            mock_client.return_value.__exit__ = MagicMock(return_value=False)
-            mock_instance.get.return_value = fake_response
-
-            result = google_maps.get_terminal_coordinates("SFO", "1")
-
-        assert result == {"lat": 37.621, "lng": -122.379}
-        mock_instance.get.assert_called_once()
+        get = AsyncMock(return_value=_geocode_response(37.621, -122.379))
+        try:
+            with patch(
+                "app.services.integrations.google_maps.get_client",
+                return_value=_mock_client(get),
+            ):
+                result = await google_maps.get_terminal_coordinates("SFO", "1")
+                again = await google_maps.get_terminal_coordinates("SFO", "1")
+        finally:
+            coords["SFO"] = saved
 
-        # Restore
-        coords["SFO"] = saved
+        assert result == again == {"lat": 37.621, "lng": -122.379}
+        get.assert_awaited_once()
 
 
 class TestGeocodeAddress:
     """Tests for geocode_address with caching."""
 
-    def setup_method(self):
-        google_maps._geocode_cache.clear()
-
-    def test_geocode_returns_lat_lng(self):
+    @pytest.mark.asyncio
+    async def test_geocode_returns_lat_lng(self):
         """geocode_address returns lat/lng dict on success."""
-        fake_response = MagicMock()
-        fake_response.json.return_value = {
-            "results": [{"geometry": {"location": {"lat": 37.7749, "lng": -122.4194}}}]
-        }
-        fake_response.raise_for_status = MagicMock()
-
-        with patch("app.services.integrations.google_maps.httpx.Client") as mock_client:
-            mock_instance = MagicMock()
-            mock_client.return_value.__enter__ = MagicMock(return_value=mock_instance)
-            mock_client.return_value.__exit__ = MagicMock(return_value=False)
-            mock_instance.get.return_value = fake_response
-
-            result = google_maps.geocode_address("123 Main St, SF, CA")
+        get = AsyncMock(return_value=_geocode_response(37.7749, -122.4194))
+        with patch(
+            "app.services.integrations.google_maps.get_client", return_value=_mock_client(get)
+        ):
+            result = await google_maps.geocode_address("123 Main St, SF, CA")
 
         assert result == {"lat": 37.7749, "lng": -122.4194}
 
-    def test_geocode_caching(self):
+    @pytest.mark.asyncio
+    async def test_geocode_caching(self):
         """Second call with same address uses cache — no HTTP request."""
-        fake_response = MagicMock()
-        fake_response.json.return_value = {
-            "results": [{"geometry": {"location": {"lat": 1.0, "lng": 2.0}}}]
-        }
-        fake_response.raise_for_status = MagicMock()
-
-        with patch("app.services.integrations.google_maps.httpx.Client") as mock_client:
-            mock_instance = MagicMock()
-            mock_client.return_value.__enter__ = MagicMock(return_value=mock_instance)
-            mock_client.return_value.__exit__ = MagicMock(return_value=False)
-            mock_instance.get.return_value = fake_response
-
-            result1 = google_maps.geocode_address("456 Oak Ave")
-            result2 = google_maps.geocode_address("456 Oak Ave")
+        get = AsyncMock(return_value=_geocode_response(1.0, 2.0))
+        with patch(
+            "app.services.integrations.google_maps.get_client", return_value=_mock_client(get)
+        ):
+            result1 = await google_maps.geocode_address("456 Oak Ave")
+            result2 = await google_maps.geocode_address("456 Oak Ave")
 
         assert result1 == result2 == {"lat": 1.0, "lng": 2.0}
-        # HTTP client should only be constructed once (first call)
-        assert mock_client.call_count == 1
+        assert get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_normalized_spellings_share_an_entry(self):
+        """Case, punctuation and suffix spelling differences hit the same cache entry."""
+        get = AsyncMock(return_value=_geocode_response(5.0, 6.0))
+        with patch(
+            "app.services.integrations.google_maps.get_client", return_value=_mock_client(get)
+        ):
+            await google_maps.geocode_address("123 Main Street,  San Francisco, CA.")
+            result = await google_maps.geocode_address("123 main st, san francisco, ca")
+
+        assert result == {"lat": 5.0, "lng": 6.0}
+        assert get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_geocode_is_not_cached(self):
+        """An address Google can't resolve is retried on the next call."""
+        empty = MagicMock()
+        empty.json.return_value = {"results": []}
+        empty.raise_for_status = MagicMock()
+        get = AsyncMock(return_value=empty)
+        with patch(
+            "app.services.integrations.google_maps.get_client", return_value=_mock_client(get)
+        ):
+            assert await google_maps.geocode_address("nowhere") is None
+            assert await google_maps.geocode_address("nowhere") is None
+
+        assert get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_request(self):
+        """Overlapping lookups for an uncached address make one HTTP request."""
+        fake_response = _geocode_response(3.0, 4.0)
+
+        async def _slow_get(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return fake_response
+
+        get = AsyncMock(side_effect=_slow_get)
+        with patch(
+            "app.services.integrations.google_maps.get_client", return_value=_mock_client(get)
+        ):
+            results = await asyncio.gather(
+                *(google_maps.geocode_address("789 Pine St") for _ in range(5))
+            )
+
+        assert results == [{"lat": 3.0, "lng": 4.0}] * 5
+        assert get.await_count == 1
+
+
+class TestGeocodeCache:
+    """Tests for the geocode_cache memory and DB layers."""
+
+    def test_normalize_address(self):
+        assert geocode_cache.normalize_address(
+            "123 Main Street,  San Francisco, CA."
+        ) == "123 main st, san francisco, ca"
+        assert geocode_cache.normalize_address("1 N. Oak Avenue Apt 4") == "1 n oak ave apt 4"
+
+    @pytest.mark.asyncio
+    async def test_memory_layer_is_bounded_lru(self, monkeypatch):
+        monkeypatch.setattr(geocode_cache, "MEMORY_MAX_ENTRIES", 2)
+        await geocode_cache.store_geocode("a st", {"lat": 1.0, "lng": 1.0})
+        await geocode_cache.store_geocode("b st", {"lat": 2.0, "lng": 2.0})
+        # Touch "a" so "b" is least recently used
+        assert await geocode_cache.get_cached_geocode("a st") is not None
+        await geocode_cache.store_geocode("c st", {"lat": 3.0, "lng": 3.0})
+
+        assert await geocode_cache.get_cached_geocode("b st") is None
+        assert await geocode_cache.get_cached_geocode("a st") == {"lat": 1.0, "lng": 1.0}
+        assert await geocode_cache.get_cached_geocode("c st") == {"lat": 3.0, "lng": 3.0}
+
+    def test_db_layer_survives_memory_clear(self, test_session):
+        factory, _ = test_session
+
+        async def _do():
+            await geocode_cache.store_geocode(
+                "10 Market St", {"lat": 37.79, "lng": -122.39}, session_factory=factory
+            )
+            geocode_cache.clear_memory()  # simulate a restart / another worker
+            return await geocode_cache.get_cached_geocode(
+                "10 market street", session_factory=factory
+            )
+
+        assert asyncio.run(_do()) == {"lat": 37.79, "lng": -122.39}
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_a_miss(self):
+        fetched = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        await geocode_cache.store_geocode("1 Old Rd", {"lat": 1.0, "lng": 2.0}, now=fetched)
+
+        later = fetched + geocode_cache.GEOCODE_TTL + timedelta(seconds=1)
+        assert await geocode_cache.get_cached_geocode("1 Old Rd", now=later) is None
 
 
 class TestRecommendationResponseSchema:
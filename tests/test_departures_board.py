@@ -0,0 +1,108 @@
+"""Indexed departures boards behind /v1/flights/search."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.api.routes.flights import _window_hours
+from app.services import departures_board
+from app.services.departures_board import DeparturesBoard, airline_code
+
+
+def _raw(number: str, dest: str, local: str | None, airline: str = "United Airlines") -> dict:
+    """Raw FIDS departure object, as AeroDataBox sends it."""
+    return {
+        "number": number,
+        "status": "Expected",
+        "airline": {"name": airline},
+        "movement": {
+            "airport": {"iata": dest, "name": f"{dest} Airport"} if dest else {"name": "?"},
+            "scheduledTime": {"local": local} if local else {},
+        },
+    }
+
+
+BOARD = [
+    _raw("UA 300", "LAX", "2026-04-01 08:00-07:00"),
+    _raw("DL 100", "LAX", "2026-04-01 09:00-07:00", "Delta Air Lines"),
+    _raw("UA 400", "LAX", "2026-04-01 23:30-07:00"),
+    _raw("AA 200", "LAX", "2026-04-01 03:15-07:00", "American Airlines"),
+    _raw("B6 10", "JFK", "2026-04-01 14:00-07:00", "JetBlue Airways"),
+    _raw("UA 500", "LAX", None),
+    _raw("XX 1", "", "2026-04-01 10:00-07:00", "Mystery Air"),
+]
+
+
+def _board() -> DeparturesBoard:
+    return DeparturesBoard("SFO", BOARD)
+
+
+class TestDeparturesBoard:
+    def test_destination_keeps_board_order(self):
+        board = _board()
+        assert [f["flight_number"] for f in board.search("lax")] == [
+            "UA 300", "DL 100", "UA 400", "AA 200", "UA 500",
+        ]
+        assert board.search("ORD") == []
+
+    def test_time_window_including_wraparound(self):
+        board = _board()
+        morning = board.search("LAX", hours=_window_hours("morning"))
+        red_eye = board.search("LAX", hours=_window_hours("red_eye"))
+        # Flights without a local time can't be filtered out
+        assert [f["flight_number"] for f in morning] == ["UA 300", "DL 100", "UA 500"]
+        assert [f["flight_number"] for f in red_eye] == ["UA 400", "AA 200", "UA 500"]
+        assert _window_hours("unknown") is None
+
+    def test_airline_matches_code_or_name(self):
+        board = _board()
+        assert [f["flight_number"] for f in board.search("LAX", airline="dl")] == ["DL 100"]
+        assert [f["flight_number"] for f in board.search("LAX", airline="american")] == ["AA 200"]
+        assert len(board.search("LAX", airline="  ")) == 5
+
+    def test_results_are_parsed_copies(self):
+        board = _board()
+        first = board.search("LAX")[0]
+        assert first["origin_iata"] == "SFO"
+        assert first["departure_time_local"] == "2026-04-01 08:00"
+        first["catchable"] = False
+        assert "catchable" not in board.search("LAX")[0]
+
+    def test_only_returned_rows_are_parsed(self):
+        board = _board()
+        assert board.parsed_count == 0
+        board.search("JFK")
+        board.search("LAX", airline="DL")
+        assert board.parsed_count == 2
+        assert board.search("") == []
+
+    def test_airline_code(self):
+        assert airline_code("UA300") == "UA"
+        assert airline_code("ua 300") == "UA"
+        assert airline_code(None) == ""
+
+
+class TestBoardCache:
+    @pytest.mark.asyncio
+    async def test_cached_per_origin_and_date(self):
+        with patch.object(
+            departures_board, "lookup_raw_departures", new=AsyncMock(return_value=BOARD)
+        ) as mock_fids:
+            first = await departures_board.get_departures_board("sfo", "2026-04-01")
+            again = await departures_board.get_departures_board("SFO", "2026-04-01")
+            await departures_board.get_departures_board("SFO", "2026-04-02")
+        assert first is again
+        assert mock_fids.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_board_is_refetched(self):
+        with patch.object(
+            departures_board, "lookup_raw_departures", new=AsyncMock(return_value=[])
+        ) as mock_fids:
+            await departures_board.get_departures_board("SFO", "2026-04-01")
+            with patch.object(
+                departures_board.time, "monotonic",
+                return_value=departures_board.time.monotonic() + departures_board.BOARD_TTL + 1,
+            ):
+                await departures_board.get_departures_board("SFO", "2026-04-01")
+        assert mock_fids.await_count == 2
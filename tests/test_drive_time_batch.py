@@ -0,0 +1,196 @@
+"""Batched Distance Matrix drive-time refresh for the polling agent."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import polling_agent
+from app.services.integrations import google_maps
+
+
+def _origin(i: int) -> str:
+    return f"{i} Origin St"
+
+
+def _coords(address: str) -> dict:
+    # Origins ~5 km apart, so every one lands in its own geohash cell.
+    i = int(address.split()[0])
+    return {"lat": 37.0 + i * 0.05, "lng": -122.0}
+
+
+def _element(minutes: int) -> dict:
+    return {
+        "status": "OK",
+        "duration": {"value": minutes * 60, "text": f"{minutes} mins"},
+        "duration_in_traffic": {"value": minutes * 60, "text": f"{minutes} mins"},
+        "distance": {"text": "10 mi"},
+    }
+
+
+def _matrix_get(minutes_by_model: dict | None = None, fail_origin: str | None = None):
+    """Fake client.get answering every origin with the traffic model's minutes."""
+    minutes_by_model = minutes_by_model or {"best_guess": 30, "pessimistic": 40, "optimistic": 25}
+
+    async def _get(url, params=None, **kwargs):
+        minutes = minutes_by_model.get(params.get("traffic_model"), 30)
+        rows = [
+            {"elements": [{"status": "NOT_FOUND"} if o == fail_origin else _element(minutes)]}
+            for o in params["origins"].split("|")
+        ]
+        resp = MagicMock()
+        resp.raise_for_status = MagicMock()
+        resp.json.return_value = {"rows": rows}
+        return resp
+
+    return AsyncMock(side_effect=_get)
+
+
+def _request(i: int, departure_time: int | None, **overrides) -> dict:
+    request = {
+        "origin_address": _origin(i),
+        "airport_iata": "SFO",
+        "transport_mode": "driving",
+        "departure_time": departure_time,
+        "terminal": "2",
+    }
+    request.update(overrides)
+    return request
+
+
+@pytest.fixture
+def departure():
+    ts = int((datetime.now(tz=timezone.utc) + timedelta(hours=8)).timestamp())
+    return ts - ts % 900
+
+
+@pytest.fixture
+def google():
+    """Patch geocoding, the shared client and the per-trip Directions path."""
+    get = _matrix_get()
+    client = MagicMock()
+    client.get = get
+    with patch.object(google_maps, "geocode_address", AsyncMock(side_effect=_coords)), \
+         patch.object(google_maps, "get_client", return_value=client), \
+         patch.object(google_maps, "_fetch_drive_time", AsyncMock()) as single:
+        yield get, single
+
+
+class TestPrefetchDriveTimes:
+    @pytest.mark.asyncio
+    async def test_one_call_per_traffic_model_per_25_origins(self, google, departure):
+        get, single = google
+        requests = [_request(i, departure) for i in range(30)]
+
+        calls = await google_maps.prefetch_drive_times(requests)
+
+        # 30 origins -> 2 chunks, 3 traffic models each
+        assert calls == get.await_count == 6
+        assert max(len(c.kwargs["params"]["origins"].split("|")) for c in get.await_args_list) == 25
+
+        result = await google_maps.get_drive_time(**requests[7])
+        assert single.await_count == 0
+        assert result["duration_minutes"] == 30
+        assert result["duration_pessimistic"] == 40
+        assert result["duration_optimistic"] == 25
+        assert result["source"] == "google_maps"
+        assert result["label"] == "Drive to SFO"
+
+    @pytest.mark.asyncio
+    async def test_groups_by_terminal_and_skips_cached(self, google, departure):
+        get, _ = google
+        requests = [_request(1, departure), _request(2, departure, terminal="3")]
+        assert await google_maps.prefetch_drive_times(requests) == 6
+
+        assert await google_maps.prefetch_drive_times(requests) == 0
+        assert get.await_count == 6
+
+    @pytest.mark.asyncio
+    async def test_transit_uses_one_call_without_traffic_models(self, google, departure):
+        get, _ = google
+        requests = [_request(i, departure, transport_mode="train") for i in range(3)]
+
+        assert await google_maps.prefetch_drive_times(requests) == 1
+        params = get.await_args.kwargs["params"]
+        assert params["mode"] == "transit" and "traffic_model" not in params
+
+        result = await google_maps.get_drive_time(**requests[0])
+        assert result["duration_pessimistic"] == result["duration_minutes"] + 10
+
+    @pytest.mark.asyncio
+    async def test_unroutable_origin_falls_back_to_per_trip_call(self, google, departure):
+        get, single = google
+        get.side_effect = _matrix_get(fail_origin=_origin(1)).side_effect
+        single.return_value = {"duration_minutes": 50, "source": "google_maps"}
+        requests = [_request(0, departure), _request(1, departure)]
+
+        await google_maps.prefetch_drive_times(requests)
+        await google_maps.get_drive_time(**requests[0])
+        assert single.await_count == 0
+        await google_maps.get_drive_time(**requests[1])
+        assert single.await_count == 1
+
+
+def _make_trip(i: int, departure: datetime, **overrides):
+    trip = MagicMock()
+    trip.id = f"trip-{i}"
+    trip.trip_status = "active"
+    trip.home_address = _origin(i)
+    trip.preferences_json = '{"transport_mode": "driving"}'
+    trip.flight_info = {
+        "origin_iata": "SFO",
+        "scheduled_departure_at": departure.isoformat(),
+        "terminal": "2",
+        "departure_local_hour": 9,
+    }
+    trip.flight_status = {"gate": "B10", "status": "Scheduled"}
+    trip.latest_recommendation = None
+    trip.recommendation_fingerprint = None
+    trip.user = MagicMock(trip_count=1, subscription_status="active")
+    for name, value in overrides.items():
+        setattr(trip, name, value)
+    return trip
+
+
+class TestAgentDriveTimeRefresh:
+    @pytest.mark.asyncio
+    async def test_recompute_reads_batched_result(self, google):
+        get, single = google
+        now = datetime.now(tz=timezone.utc)
+        departure = now + timedelta(hours=8)
+        trips = [_make_trip(i, departure) for i in range(4)]
+
+        await polling_agent._prefetch_drive_times(trips, now)
+
+        assert get.await_count == 3
+        request = polling_agent._drive_time_prefetch_request(trips[2], now)
+        await google_maps.get_drive_time(**request)
+        assert single.await_count == 0
+
+    def test_only_trips_that_would_call_google(self):
+        now = datetime.now(tz=timezone.utc)
+        departure = now + timedelta(hours=8)
+
+        assert polling_agent._drive_time_prefetch_request(_make_trip(1, departure), now) is not None
+        assert polling_agent._drive_time_prefetch_request(
+            _make_trip(1, departure, trip_status="en_route"), now
+        ) is None
+        assert polling_agent._drive_time_prefetch_request(
+            _make_trip(1, departure, flight_info=None), now
+        ) is None
+
+        unchanged = _make_trip(1, departure, latest_recommendation={"segments": []})
+        unchanged.recommendation_fingerprint = polling_agent.recommendation_input_fingerprint(
+            polling_agent.snapshot_from_columns(unchanged.flight_info, unchanged.flight_status),
+            unchanged.preferences_json,
+            unchanged.home_address,
+            now,
+        )
+        assert polling_agent._drive_time_prefetch_request(unchanged, now) is None
+
+    @pytest.mark.asyncio
+    async def test_single_trip_is_left_to_its_own_recompute(self, google):
+        get, _ = google
+        now = datetime.now(tz=timezone.utc)
+        await polling_agent._prefetch_drive_times([_make_trip(1, now + timedelta(hours=8))], now)
+        assert get.await_count == 0
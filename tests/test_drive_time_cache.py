@@ -0,0 +1,149 @@
+"""Tests for the drive-time cache and its use in get_drive_time."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services import drive_time_cache
+from app.services.drive_time_cache import (
+    DRIVE_TIME_TTLS,
+    LIVE_TRAFFIC_TTL,
+    cache_key,
+    departure_bucket,
+    drive_time_ttl,
+    geohash,
+    get_cached_drive_time,
+    origin_cell,
+    store_drive_time,
+)
+from app.services.integrations import google_maps
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _estimate(minutes: int = 30, source: str = "google_maps") -> dict:
+    return {
+        "duration_minutes": minutes,
+        "duration_pessimistic": minutes + 10,
+        "duration_optimistic": minutes - 5,
+        "duration_text": f"{minutes} mins",
+        "distance_text": "12 mi",
+        "source": source,
+        "label": "Drive to SFO",
+    }
+
+
+class TestKeys:
+    def test_geohash_reference_point(self):
+        assert geohash(57.64911, 10.40744, precision=11) == "u4pruydqqvj"
+
+    def test_nearby_origins_share_a_cell(self):
+        a = origin_cell("1 Main St", {"lat": 37.77490, "lng": -122.41940})
+        b = origin_cell("3 Main St", {"lat": 37.77510, "lng": -122.41920})
+        far = origin_cell("Oakland", {"lat": 37.80440, "lng": -122.27120})
+        assert a == b
+        assert a != far
+
+    def test_ungeocoded_origin_uses_normalized_address(self):
+        assert origin_cell("1 Main Street", None) == origin_cell("1 main st", None)
+
+    def test_departure_bucket(self):
+        ts = int((NOW + timedelta(hours=5)).timestamp())
+        assert departure_bucket(ts, NOW) == departure_bucket(ts + 60, NOW)
+        assert departure_bucket(ts, NOW) != departure_bucket(ts + 3600, NOW)
+        assert departure_bucket(None, NOW) == "now"
+        assert departure_bucket(int(NOW.timestamp()) - 60, NOW) == "now"
+
+    def test_cache_key_includes_airport_name_only_when_given(self):
+        assert cache_key("9q8yyk", "sfo", None, "driving", "now") == "9q8yyk|SFO||driving|now"
+        assert cache_key("9q8yyk", "SFO", "1", "driving", "now", "SFO Intl").endswith("|SFO Intl")
+
+
+class TestTtl:
+    @pytest.mark.parametrize(
+        "hours_out,expected",
+        [(48, DRIVE_TIME_TTLS[0][1]), (12, DRIVE_TIME_TTLS[1][1]),
+         (3, DRIVE_TIME_TTLS[2][1]), (1, DRIVE_TIME_TTLS[3][1])],
+    )
+    def test_ttl_shrinks_near_departure(self, hours_out, expected):
+        ts = int((NOW + timedelta(hours=hours_out)).timestamp())
+        assert drive_time_ttl(ts, NOW) == expected
+
+    def test_live_traffic_ttl(self):
+        assert drive_time_ttl(None, NOW) == LIVE_TRAFFIC_TTL
+        assert drive_time_ttl(int(NOW.timestamp()) - 60, NOW) == LIVE_TRAFFIC_TTL
+
+
+class TestStore:
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_a_miss(self):
+        ts = int((NOW + timedelta(minutes=90)).timestamp())
+        await store_drive_time("k", _estimate(), ts, now=NOW)
+        assert await get_cached_drive_time("k", now=NOW + timedelta(minutes=5)) is not None
+        assert await get_cached_drive_time("k", now=NOW + timedelta(minutes=11)) is None
+
+    @pytest.mark.asyncio
+    async def test_fallback_is_not_cached(self):
+        await store_drive_time("k", _estimate(45, "fallback"), None, now=NOW)
+        assert await get_cached_drive_time("k", now=NOW) is None
+
+    def test_db_layer_survives_memory_clear(self, test_session):
+        factory, _ = test_session
+
+        async def _do():
+            await store_drive_time("k", _estimate(), None, now=NOW, session_factory=factory)
+            drive_time_cache.clear_memory()  # simulate a restart / another worker
+            return await get_cached_drive_time(
+                "k", now=NOW + timedelta(minutes=1), session_factory=factory
+            )
+
+        assert asyncio.run(_do()) == _estimate()
+
+
+class TestGetDriveTime:
+    @pytest.fixture
+    def google(self):
+        """Patch geocoding and the Google fetch behind get_drive_time."""
+        coords = {
+            "1 Main St": {"lat": 37.77490, "lng": -122.41940},
+            "3 Main St": {"lat": 37.77510, "lng": -122.41920},
+        }
+        geocode = AsyncMock(side_effect=lambda address: coords.get(address))
+        fetch = AsyncMock(return_value=_estimate())
+        with patch.object(google_maps, "geocode_address", geocode), \
+             patch.object(google_maps, "_fetch_drive_time", fetch):
+            yield fetch
+
+    @pytest.mark.asyncio
+    async def test_same_cell_and_bucket_skip_google(self, google):
+        departure = int((datetime.now(tz=timezone.utc) + timedelta(hours=8)).timestamp())
+        departure -= departure % drive_time_cache.DEPARTURE_BUCKET_SECONDS
+        first = await google_maps.get_drive_time("1 Main St", "SFO", departure_time=departure)
+        second = await google_maps.get_drive_time(
+            "3 Main St", "SFO", departure_time=departure + 120
+        )
+        assert first == second == _estimate()
+        assert google.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_terminal_and_mode_are_part_of_the_key(self, google):
+        await google_maps.get_drive_time("1 Main St", "SFO", terminal="1")
+        await google_maps.get_drive_time("1 Main St", "SFO", terminal="2")
+        await google_maps.get_drive_time("1 Main St", "SFO", terminal="2", transport_mode="train")
+        assert google.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_fallback_retries_google(self, google):
+        google.return_value = _estimate(45, "fallback")
+        await google_maps.get_drive_time("1 Main St", "SFO")
+        await google_maps.get_drive_time("1 Main St", "SFO")
+        assert google.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_callers_get_independent_copies(self, google):
+        first = await google_maps.get_drive_time("1 Main St", "SFO")
+        first["duration_minutes"] = 999
+        second = await google_maps.get_drive_time("1 Main St", "SFO")
+        assert second["duration_minutes"] == 30
@@ -0,0 +1,238 @@
+"""Learned drive-time profiles and their use for far-out departures."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import select
+
+from app.db.models import DriveTimeProfile
+from app.services import drive_time_profiles
+from app.services.drive_time_cache import origin_cell
+from app.services.drive_time_profiles import (
+    PROFILE_MAX_SAMPLES,
+    get_profile,
+    profile_key,
+    quantile,
+    record_drive_time,
+)
+from app.services.integrations import google_maps
+
+HOME = {"lat": 37.7749, "lng": -122.4194}
+CELL = origin_cell("1 Main St", HOME)
+SFO_TZ = ZoneInfo("America/Los_Angeles")
+
+
+def _weeks_before(when: datetime, weeks: int) -> datetime:
+    """Same SFO-local weekday and hour, ``weeks`` earlier (so the same profile)."""
+    return when.astimezone(SFO_TZ) - timedelta(weeks=weeks)
+
+
+class TestStore:
+    def test_quantile_interpolates(self):
+        assert quantile([10, 20, 30, 40, 50], 0.5) == 30
+        assert quantile([10, 20, 30, 40, 50], 0.9) == 46
+        assert quantile([10, 20, 30, 40, 50], 0.1) == 14
+        assert quantile([7], 0.9) == 7
+
+    def test_key_uses_airport_local_weekday_and_hour(self):
+        # 03:00Z Monday is 20:00 Sunday in San Francisco
+        when = datetime(2026, 6, 1, 3, 0, tzinfo=timezone.utc)
+        assert profile_key(CELL, "sfo", "driving", when) == f"{CELL}|SFO|driving|6|20"
+        assert profile_key(CELL, "XXX", "driving", when).endswith("|0|3")
+
+    @pytest.mark.asyncio
+    async def test_needs_min_samples_and_keeps_recent_window(self):
+        when = datetime(2026, 6, 1, 15, 0, tzinfo=timezone.utc)
+        for weeks in range(drive_time_profiles.PROFILE_MIN_SAMPLES - 1):
+            await record_drive_time(
+                CELL, "SFO", "driving", _weeks_before(when, weeks), 30 + weeks, "12 mi"
+            )
+        assert await get_profile(CELL, "SFO", "driving", when) is None
+
+        span = PROFILE_MAX_SAMPLES + 10
+        for weeks in range(span):
+            await record_drive_time(
+                CELL, "SFO", "driving", _weeks_before(when, span - 1 - weeks), 100 + weeks
+            )
+        profile = await get_profile(CELL, "SFO", "driving", when)
+        assert profile["samples"] == PROFILE_MAX_SAMPLES
+        assert profile["p10"] >= 110  # the oldest dates rolled off
+        assert profile["distance_text"] == "12 mi"
+
+    @pytest.mark.asyncio
+    async def test_recomputes_for_one_date_keep_one_sample(self):
+        when = datetime(2026, 6, 1, 15, 0, tzinfo=timezone.utc)
+        for minutes in (30, 32, 35, 40, 45, 50):
+            await record_drive_time(CELL, "SFO", "driving", when, minutes)
+        assert await get_profile(CELL, "SFO", "driving", when) is None
+
+        for weeks in range(1, drive_time_profiles.PROFILE_MIN_SAMPLES):
+            await record_drive_time(CELL, "SFO", "driving", _weeks_before(when, weeks), 50)
+        profile = await get_profile(CELL, "SFO", "driving", when)
+        # The latest answer for the repeated date replaced the earlier ones
+        assert profile["samples"] == drive_time_profiles.PROFILE_MIN_SAMPLES
+        assert profile["p10"] == 50
+
+    @pytest.mark.asyncio
+    async def test_each_bound_comes_from_its_own_series(self):
+        when = datetime(2026, 6, 1, 15, 0, tzinfo=timezone.utc)
+        for weeks in range(drive_time_profiles.PROFILE_MIN_SAMPLES):
+            await record_drive_time(
+                CELL, "SFO", "driving", _weeks_before(when, weeks), 30,
+                pessimistic=60 + weeks, optimistic=20 + weeks,
+            )
+        profile = await get_profile(CELL, "SFO", "driving", when)
+        assert profile["p50"] == 30
+        assert profile["p90"] >= 63
+        assert profile["p10"] <= 21
+
+    def test_memory_rereads_table_after_ttl(self, test_session):
+        factory, _ = test_session
+        when = datetime(2026, 6, 1, 15, 0, tzinfo=timezone.utc)
+        now = datetime(2026, 5, 1, tzinfo=timezone.utc)
+
+        async def _do():
+            for weeks in range(drive_time_profiles.PROFILE_MIN_SAMPLES - 1):
+                await record_drive_time(
+                    CELL, "SFO", "driving", _weeks_before(when, weeks), 30,
+                    now=now, session_factory=factory,
+                )
+            # Another worker records one more date straight to the table
+            async with factory() as session:
+                row = (await session.execute(select(DriveTimeProfile))).scalar_one()
+                row.samples = {**row.samples, "2026-01-01": [40, 50, 35]}
+                await session.commit()
+            fresh = await get_profile(
+                CELL, "SFO", "driving", when, now=now, session_factory=factory
+            )
+            reread = await get_profile(
+                CELL, "SFO", "driving", when,
+                now=now + timedelta(seconds=drive_time_profiles.MEMORY_TTL + 1),
+                session_factory=factory,
+            )
+            return fresh, reread
+
+        fresh, reread = asyncio.run(_do())
+        assert fresh is None
+        assert reread["samples"] == drive_time_profiles.PROFILE_MIN_SAMPLES
+
+    def test_db_layer_survives_memory_clear(self, test_session):
+        factory, _ = test_session
+        when = datetime(2026, 6, 1, 15, 0, tzinfo=timezone.utc)
+
+        async def _do():
+            for weeks, minutes in enumerate((30, 32, 35, 40, 45)):
+                await record_drive_time(
+                    CELL, "SFO", "driving", _weeks_before(when, weeks), minutes,
+                    session_factory=factory,
+                )
+            drive_time_profiles.clear_memory()  # simulate a restart / another worker
+            return await get_profile(CELL, "SFO", "driving", when, session_factory=factory)
+
+        profile = asyncio.run(_do())
+        assert profile["p50"] == 35 and profile["samples"] == 5
+
+
+class TestGetDriveTime:
+    @pytest.fixture
+    def google(self):
+        fetch = AsyncMock(return_value={
+            "duration_minutes": 33,
+            "duration_pessimistic": 40,
+            "duration_optimistic": 30,
+            "duration_text": "33 mins",
+            "distance_text": "12 mi",
+            "source": "google_maps",
+            "label": "Drive to SFO",
+        })
+        with patch.object(google_maps, "geocode_address", AsyncMock(return_value=HOME)), \
+             patch.object(google_maps, "_fetch_drive_time", fetch):
+            yield fetch
+
+    async def _seed(self, departure: datetime, samples=(30, 31, 35, 38, 50)):
+        # One sample per earlier week, as past trips at this weekday / hour
+        for weeks, minutes in enumerate(samples, start=1):
+            await record_drive_time(
+                CELL, "SFO", "driving", _weeks_before(departure, weeks), minutes, "12 mi"
+            )
+
+    @pytest.mark.asyncio
+    async def test_far_out_departure_is_answered_from_profile(self, google):
+        departure = datetime.now(tz=timezone.utc) + timedelta(days=2)
+        await self._seed(departure)
+
+        result = await google_maps.get_drive_time(
+            "1 Main St", "SFO", transport_mode="driving", departure_time=int(departure.timestamp())
+        )
+
+        assert google.await_count == 0
+        assert result["source"] == "profile"
+        assert result["duration_minutes"] == 35
+        assert result["duration_optimistic"] < 35 < result["duration_pessimistic"]
+        assert result["distance_text"] == "12 mi"
+        assert result["label"] == "Drive to SFO"
+
+    @pytest.mark.asyncio
+    async def test_profile_pessimistic_never_below_untimed_spread(self, google):
+        departure = datetime.now(tz=timezone.utc) + timedelta(days=2)
+        await self._seed(departure, samples=(40, 40, 40, 40, 40))
+
+        result = await google_maps.get_drive_time(
+            "1 Main St", "SFO", transport_mode="driving", departure_time=int(departure.timestamp())
+        )
+
+        assert result["source"] == "profile"
+        assert result["duration_pessimistic"] == 52  # ceil(40 * 1.3)
+
+    @pytest.mark.asyncio
+    async def test_google_answer_records_all_three_models(self, google):
+        departure = datetime.now(tz=timezone.utc) + timedelta(hours=3)
+        await google_maps.get_drive_time(
+            "1 Main St", "SFO", transport_mode="driving", departure_time=int(departure.timestamp())
+        )
+        (sample,) = drive_time_profiles._memory[
+            profile_key(CELL, "SFO", "driving", departure)
+        ][1].values()
+        assert sample == [33, 40, 30]
+
+    @pytest.mark.asyncio
+    async def test_final_hours_still_call_google_and_feed_profile(self, google):
+        departure = datetime.now(tz=timezone.utc) + timedelta(hours=3)
+        await self._seed(departure, samples=(30, 31, 35, 38))
+
+        result = await google_maps.get_drive_time(
+            "1 Main St", "SFO", transport_mode="driving", departure_time=int(departure.timestamp())
+        )
+
+        assert google.await_count == 1
+        assert result["source"] == "google_maps"
+        profile = await get_profile(CELL, "SFO", "driving", departure)
+        assert profile["samples"] == 5
+
+    @pytest.mark.asyncio
+    async def test_thin_profile_falls_through_to_google(self, google):
+        departure = datetime.now(tz=timezone.utc) + timedelta(days=2)
+        await self._seed(departure, samples=(30,))
+
+        await google_maps.get_drive_time(
+            "1 Main St", "SFO", transport_mode="driving", departure_time=int(departure.timestamp())
+        )
+        assert google.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_prefetch_skips_profiled_requests(self, google):
+        departure = datetime.now(tz=timezone.utc) + timedelta(days=2)
+        await self._seed(departure)
+        request = {
+            "origin_address": "1 Main St",
+            "airport_iata": "SFO",
+            "transport_mode": "driving",
+            "departure_time": int(departure.timestamp()),
+            "terminal": None,
+        }
+        with patch.object(google_maps, "get_client") as client:
+            assert await google_maps.prefetch_drive_times([request, dict(request)]) == 0
+        assert client.call_count == 0
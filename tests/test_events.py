@@ -1,5 +1,15 @@
+import asyncio
+import uuid
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 
+from app.api.middleware.auth import get_optional_user
+from app.db import get_db
+from app.db.models import Trip, User
+from app.main import app
+from tests.conftest import FakeUser
+
 
 def test_record_event_basic(client: TestClient) -> None:
     resp = client.post("/v1/events", json={"event_name": "flight_searched"})
@@ -29,3 +39,125 @@ def test_record_event_anonymous(client: TestClient) -> None:
 def test_record_event_missing_event_name(client: TestClient) -> None:
     resp = client.post("/v1/events", json={})
     assert resp.status_code == 422
+
+
+def _interaction_client(test_session, user_id, **user_fields):
+    factory, _ = test_session
+
+    async def _override_db():
+        async with factory() as session:
+            yield session
+
+    async def _override_user():
+        return FakeUser(id=user_id, **user_fields)
+
+    app.dependency_overrides[get_db] = _override_db
+    app.dependency_overrides[get_optional_user] = _override_user
+    return TestClient(app), factory
+
+
+def _seed_trips(factory, user_id, statuses):
+    trip_ids = [uuid.uuid4() for _ in statuses]
+
+    async def _do():
+        async with factory() as s:
+            s.add(User(id=user_id, trip_count=1))
+            for tid, status in zip(trip_ids, statuses):
+                s.add(Trip(
+                    id=tid,
+                    user_id=user_id,
+                    input_mode="flight_number",
+                    flight_number="UA100",
+                    departure_date="2099-01-01",
+                    home_address="1 Market St",
+                    status=status,
+                    trip_status=status,
+                ))
+            await s.commit()
+    asyncio.run(_do())
+    return trip_ids
+
+
+def _trip_state(factory, trip_id):
+    async def _do():
+        async with factory() as s:
+            trip = await s.get(Trip, trip_id)
+            return trip.trip_status, trip.actual_depart_at
+    return asyncio.run(_do())
+
+
+class TestInteractionTransitions:
+    def teardown_method(self):
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_optional_user, None)
+
+    def test_tap_moves_active_trip_to_en_route(self, test_session) -> None:
+        user_id = uuid.uuid4()
+        client, factory = _interaction_client(test_session, user_id)
+        active_id, at_airport_id = _seed_trips(factory, user_id, ["active", "at_airport"])
+
+        resp = client.post("/v1/events", json={"event_name": "timetogo_tap"})
+        assert resp.status_code == 200
+
+        status, departed_at = _trip_state(factory, active_id)
+        assert status == "en_route"
+        assert departed_at is not None
+        assert _trip_state(factory, at_airport_id)[0] == "at_airport"
+
+    def test_trip_id_metadata_narrows_transition(self, test_session) -> None:
+        user_id = uuid.uuid4()
+        client, factory = _interaction_client(test_session, user_id)
+        first, second = _seed_trips(factory, user_id, ["active", "active"])
+
+        resp = client.post(
+            "/v1/events",
+            json={"event_name": "nav_tap", "metadata": {"trip_id": str(second)}},
+        )
+        assert resp.status_code == 200
+        assert _trip_state(factory, first)[0] == "active"
+        assert _trip_state(factory, second)[0] == "en_route"
+
+    def test_invalid_trip_id_metadata_advances_nothing(self, test_session) -> None:
+        user_id = uuid.uuid4()
+        client, factory = _interaction_client(test_session, user_id)
+        first, second = _seed_trips(factory, user_id, ["active", "active"])
+
+        resp = client.post(
+            "/v1/events",
+            json={"event_name": "nav_tap", "metadata": {"trip_id": "not-a-uuid"}},
+        )
+        assert resp.status_code == 200
+        assert _trip_state(factory, first)[0] == "active"
+        assert _trip_state(factory, second)[0] == "active"
+
+    def test_non_interaction_event_leaves_trip_alone(self, test_session) -> None:
+        user_id = uuid.uuid4()
+        client, factory = _interaction_client(test_session, user_id)
+        (trip_id,) = _seed_trips(factory, user_id, ["active"])
+
+        client.post("/v1/events", json={"event_name": "trip_viewed"})
+        assert _trip_state(factory, trip_id)[0] == "active"
+
+    def test_non_pro_user_trip_is_not_advanced(self, test_session) -> None:
+        user_id = uuid.uuid4()
+        client, factory = _interaction_client(test_session, user_id, trip_count=10)
+        (trip_id,) = _seed_trips(factory, user_id, ["active"])
+
+        resp = client.post("/v1/events", json={"event_name": "timetogo_tap"})
+        assert resp.status_code == 200
+        assert _trip_state(factory, trip_id)[0] == "active"
+
+    def test_transition_failure_still_records_event(self, test_session) -> None:
+        user_id = uuid.uuid4()
+        client, factory = _interaction_client(test_session, user_id)
+        (trip_id,) = _seed_trips(factory, user_id, ["active"])
+
+        with patch(
+            "app.api.routes.events.apply_interaction_signal",
+            side_effect=RuntimeError("db hiccup"),
+        ):
+            resp = client.post("/v1/events", json={"event_name": "timetogo_tap"})
+
+        assert resp.status_code == 200
+        assert resp.json()["event_id"]
+        assert _trip_state(factory, trip_id)[0] == "active"
@@ -0,0 +1,201 @@
+"""Tiered-TTL flight cache: TTL tiers, memory layer, DB persistence, shared read-through."""
+
+import asyncio
+import dataclasses
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services import flight_cache
+from app.services.flight_cache import (
+    DEPARTED_TTL,
+    flight_cache_ttl,
+    get_cached_flights,
+    store_flights,
+)
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _flight(hours_out: float, **extra) -> dict:
+    dep = NOW + timedelta(hours=hours_out)
+    return {
+        "flight_number": "UA100",
+        "departure_time_utc": dep.strftime("%Y-%m-%d %H:%MZ"),
+        "gate": "A1",
+        **extra,
+    }
+
+
+class TestFlightCacheTtl:
+    def test_ttl_shrinks_toward_departure(self):
+        ttls = [flight_cache_ttl([_flight(h)], NOW) for h in (100, 48, 12, 4, 1)]
+        assert ttls == [6 * 3600, 2 * 3600, 1800, 600, 240]
+
+    def test_departed_flight_gets_shortest_ttl(self):
+        assert flight_cache_ttl([_flight(-1)], NOW) == DEPARTED_TTL
+
+    def test_revised_departure_wins(self):
+        revised = (NOW + timedelta(hours=1)).strftime("%Y-%m-%d %H:%MZ")
+        flights = [_flight(12, revised_departure_utc=revised)]
+        assert flight_cache_ttl(flights, NOW) == 240
+
+
+class TestMemoryLayer:
+    def test_hit_until_expiry(self):
+        async def _do():
+            await store_flights("UA100", "2026-06-01", [_flight(1)], now=NOW)
+            fresh = await get_cached_flights("ua100", "2026-06-01", now=NOW + timedelta(minutes=3))
+            stale = await get_cached_flights("UA100", "2026-06-01", now=NOW + timedelta(minutes=5))
+            return fresh, stale
+
+        fresh, stale = asyncio.run(_do())
+        assert fresh[0]["gate"] == "A1"
+        assert stale is None
+
+    def test_empty_results_are_not_cached(self):
+        async def _do():
+            await store_flights("UA100", "2026-06-01", [], now=NOW)
+            return await get_cached_flights("UA100", "2026-06-01", now=NOW)
+
+        assert asyncio.run(_do()) is None
+
+    def test_callers_share_immutable_records(self):
+        async def _do():
+            await store_flights("UA100", "2026-06-01", [_flight(1)], now=NOW)
+            first = await get_cached_flights("UA100", "2026-06-01", now=NOW)
+            second = await get_cached_flights("UA100", "2026-06-01", now=NOW)
+            return first, second
+
+        first, second = asyncio.run(_do())
+        assert first is second
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first[0].departure_gate = "Z9"
+        # Timestamps were parsed once, at store time
+        assert first[0].scheduled_departure == NOW + timedelta(hours=1)
+
+    def test_cached_status_is_dated_by_fetch_time(self):
+        from app.services.flight_snapshot_service import build_flight_info_and_status
+
+        async def _do():
+            await store_flights("UA100", "2026-06-01", [_flight(30)], now=NOW)
+            return await get_cached_flights("UA100", "2026-06-01", now=NOW + timedelta(hours=1))
+
+        flights = asyncio.run(_do())
+        assert flights[0].fetched_at == NOW.isoformat()
+        assert "fetched_at" not in flights[0].to_dict()
+        _, status = build_flight_info_and_status(flights[0])
+        assert status["last_updated_at"] == NOW.isoformat()
+        assert "stale" not in status
+
+
+class TestPersistentLayer:
+    def test_survives_memory_loss(self, test_session):
+        factory, _ = test_session
+
+        async def _do():
+            await store_flights(
+                "UA100", "2026-06-01", [_flight(30)], now=NOW, session_factory=factory
+            )
+            flight_cache.clear_memory()  # simulate a restart / another worker
+            return await get_cached_flights(
+                "UA100", "2026-06-01", now=NOW + timedelta(hours=1), session_factory=factory
+            )
+
+        flights = asyncio.run(_do())
+        assert flights is not None and flights[0]["gate"] == "A1"
+        assert flights[0].fetched_at == NOW.isoformat()
+
+    def test_expired_row_is_a_miss_and_is_overwritten(self, test_session):
+        factory, _ = test_session
+
+        async def _do():
+            await store_flights(
+                "UA100", "2026-06-01", [_flight(1)], now=NOW, session_factory=factory
+            )
+            flight_cache.clear_memory()
+            later = NOW + timedelta(minutes=10)
+            miss = await get_cached_flights(
+                "UA100", "2026-06-01", now=later, session_factory=factory
+            )
+            await store_flights(
+                "UA100", "2026-06-01", [_flight(1, gate="B2")], now=later,
+                session_factory=factory,
+            )
+            flight_cache.clear_memory()
+            hit = await get_cached_flights(
+                "UA100", "2026-06-01", now=later, session_factory=factory
+            )
+            return miss, hit
+
+        miss, hit = asyncio.run(_do())
+        assert miss is None
+        assert hit[0]["gate"] == "B2"
+
+
+class TestSharedAcrossCallers:
+    def test_polling_refresh_warms_track_lookup(self):
+        """A refresh_flight_status lookup is reused by get_selected_flight."""
+        from app.services import flight_snapshot_service, polling_agent
+
+        dep = datetime.now(tz=timezone.utc) + timedelta(hours=3)
+        flights = [{
+            "flight_number": "UA100",
+            "departure_time_utc": dep.strftime("%Y-%m-%d %H:%MZ"),
+            "status": "Scheduled",
+            "gate": "C3",
+        }]
+        trip = SimpleNamespace(
+            id=uuid.uuid4(),
+            flight_number="UA100",
+            departure_date=dep.date().isoformat(),
+            selected_departure_utc=None,
+            flight_status=None,
+            flight_info=None,
+        )
+
+        async def _do():
+            with patch.object(
+                flight_snapshot_service, "lookup_flights", new=AsyncMock(return_value=flights)
+            ) as lookup:
+                await polling_agent.refresh_flight_status(trip, session=None)
+                selected = await flight_snapshot_service.get_selected_flight(
+                    "UA100", trip.departure_date, None
+                )
+            return selected, lookup
+
+        selected, lookup = asyncio.run(_do())
+        assert selected["gate"] == "C3"
+        assert lookup.await_count == 1
+
+    def test_polling_skips_cached_data_older_than_trip(self):
+        from app.services import polling_agent
+
+        dep = datetime.now(tz=timezone.utc) + timedelta(hours=30)
+        fetched = datetime.now(tz=timezone.utc) - timedelta(hours=2)
+        trip = SimpleNamespace(
+            id=uuid.uuid4(),
+            flight_number="UA100",
+            departure_date=dep.date().isoformat(),
+            selected_departure_utc=None,
+            flight_info=None,
+            flight_status={
+                "gate": "D4",
+                "last_updated_at": (fetched + timedelta(hours=1)).isoformat(),
+            },
+        )
+        flight = {
+            "flight_number": "UA100",
+            "departure_time_utc": dep.strftime("%Y-%m-%d %H:%MZ"),
+            "gate": "C3",
+        }
+
+        async def _do():
+            await store_flights("UA100", trip.departure_date, [flight], now=fetched)
+            return await polling_agent.refresh_flight_status(trip, session=None)
+
+        assert asyncio.run(_do()) == (False, {})
+        assert trip.flight_status["gate"] == "D4"
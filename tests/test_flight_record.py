@@ -0,0 +1,84 @@
+"""FlightRecord / FlightIndex: lossless dict round-trip, parse-once timestamps, O(1) selection."""
+
+from datetime import datetime, timezone
+
+from app.services.flight_record import FlightIndex, FlightRecord
+from app.services.flight_snapshot_service import build_flight_info_and_status
+from app.services.integrations.aerodatabox import parse_flight
+
+RAW = {
+    "number": "UA 100",
+    "status": "Delayed",
+    "airline": {"name": "United Airlines"},
+    "departure": {
+        "airport": {"iata": "SFO", "name": "San Francisco"},
+        "scheduledTime": {"utc": "2026-06-01 17:00Z", "local": "2026-06-01 10:00-07:00"},
+        "revisedTime": {"utc": "2026-06-01 17:45Z", "local": "2026-06-01 10:45-07:00"},
+        "terminal": "3",
+        "gate": "F12",
+    },
+    "arrival": {
+        "airport": {"iata": "ORD", "name": "Chicago O'Hare"},
+        "scheduledTime": {"utc": "2026-06-01 21:30Z", "local": "2026-06-01 16:30-05:00"},
+    },
+    "aircraft": {"model": "Boeing 737"},
+}
+
+
+def _flight(dep_utc: str, gate: str) -> dict:
+    return {"flight_number": "UA100", "departure_time_utc": dep_utc, "departure_gate": gate}
+
+
+class TestFlightRecord:
+    def test_round_trips_parse_flight_dict(self):
+        flight = parse_flight(RAW)
+        assert FlightRecord.from_dict(flight).to_dict() == flight
+
+    def test_unknown_keys_survive_round_trip(self):
+        flight = {**_flight("2026-06-01 17:00Z", "A1"), "gate": "A1"}
+        record = FlightRecord.from_dict(flight)
+        assert record.get("gate") == "A1"
+        assert record.to_dict()["gate"] == "A1"
+
+    def test_timestamps_parsed_once(self):
+        record = FlightRecord.from_dict(parse_flight(RAW))
+        assert record.scheduled_departure == datetime(2026, 6, 1, 17, 0, tzinfo=timezone.utc)
+        assert record.delayed_departure == datetime(2026, 6, 1, 17, 45, tzinfo=timezone.utc)
+        assert record.scheduled_arrival.hour == 21
+
+    def test_info_and_status_match_dict_input(self):
+        flight = parse_flight(RAW)
+        from_dict = build_flight_info_and_status(flight)
+        from_record = build_flight_info_and_status(FlightRecord.from_dict(flight))
+        for built in (from_dict, from_record):
+            for part in built:
+                part.pop("snapshot_taken_at", None)
+                part.pop("last_updated_at", None)
+        assert from_dict == from_record
+        info, status = from_record
+        assert info["duration_minutes"] == 270
+        assert status["delay_minutes"] == 45
+
+    def test_stale_flag(self):
+        record = FlightRecord.from_dict(_flight("2026-06-01 17:00Z", "A1"))
+        stale = record.as_stale("2026-06-01T12:00:00+00:00")
+        assert "stale" not in record.to_dict()
+        assert stale.to_dict()["stale"] is True
+        assert stale.stale_as_of == "2026-06-01T12:00:00+00:00"
+
+
+class TestFlightIndex:
+    def test_select_by_departure_and_fallback(self):
+        flights = FlightIndex.from_dicts([
+            _flight("2026-06-01 09:00Z", "A1"),
+            _flight("2026-06-01 17:00Z", "B2"),
+        ])
+        assert flights.select(" 2026-06-01 17:00Z ").departure_gate == "B2"
+        assert flights.select("2026-06-01 23:00Z").departure_gate == "A1"
+        assert flights.select(None).departure_gate == "A1"
+        assert flights.find("2026-06-01 23:00Z") is None
+
+    def test_empty_index(self):
+        flights = FlightIndex.from_dicts([])
+        assert not flights
+        assert flights.select("2026-06-01 17:00Z") is None
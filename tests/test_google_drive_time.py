@@ -0,0 +1,120 @@
+"""Per-trip Google drive-time fetch: traffic models in parallel on the shared client."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.integrations import google_maps
+
+
+def _matrix_response(minutes_by_model: dict, model: str | None) -> dict:
+    minutes = minutes_by_model.get(model)
+    if minutes is None:
+        return {"rows": [{"elements": [{"status": "ZERO_RESULTS"}]}]}
+    return {
+        "rows": [{"elements": [{
+            "status": "OK",
+            "duration": {"value": minutes * 60, "text": f"{minutes} mins"},
+            "duration_in_traffic": {"value": minutes * 60, "text": f"{minutes} mins"},
+            "distance": {"text": "14 mi"},
+        }]}]
+    }
+
+
+DIRECTIONS = {
+    "routes": [{"legs": [{
+        "duration": {"value": 20 * 60, "text": "20 mins"},
+        "distance": {"text": "9 mi"},
+    }]}]
+}
+
+
+@pytest.fixture
+def google():
+    """Shared client fake: records URLs and tracks how many calls overlap."""
+    state = {"in_flight": 0, "peak": 0, "urls": []}
+    minutes_by_model = {"best_guess": 30, "pessimistic": 41, "optimistic": 24}
+
+    async def _get(url, params=None, **kwargs):
+        state["urls"].append(url)
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        resp = MagicMock()
+        resp.raise_for_status = MagicMock()
+        if url == google_maps.DIRECTIONS_URL:
+            resp.json.return_value = DIRECTIONS
+        else:
+            resp.json.return_value = _matrix_response(
+                minutes_by_model, params.get("traffic_model")
+            )
+        return resp
+
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=_get)
+    with patch.object(google_maps, "get_client", return_value=client):
+        yield state, minutes_by_model
+
+
+def _future() -> int:
+    return int(time.time()) + 6 * 3600
+
+
+@pytest.mark.asyncio
+async def test_traffic_models_run_concurrently_without_directions(google):
+    state, _ = google
+    result = await google_maps._fetch_drive_time(
+        "1 Main St", "SFO", None, "driving", _future(), None
+    )
+
+    assert state["urls"] == [google_maps.DISTANCE_MATRIX_URL] * 3
+    assert state["peak"] == 3
+    assert result == {
+        "duration_minutes": 30,
+        "duration_pessimistic": 41,
+        "duration_optimistic": 24,
+        "duration_text": "30 mins",
+        "distance_text": "14 mi",
+        "source": "google_maps",
+        "label": "Drive to SFO",
+    }
+
+
+@pytest.mark.asyncio
+async def test_missing_variant_is_estimated(google):
+    _, minutes_by_model = google
+    del minutes_by_model["pessimistic"]
+    result = await google_maps._fetch_drive_time(
+        "1 Main St", "SFO", None, "rideshare", _future(), None
+    )
+    assert result["duration_pessimistic"] == 39  # ceil(30 * 1.3)
+    assert result["label"] == "Ride to SFO"
+
+
+@pytest.mark.asyncio
+async def test_no_best_guess_falls_back_to_directions(google):
+    state, minutes_by_model = google
+    minutes_by_model.clear()
+    result = await google_maps._fetch_drive_time(
+        "1 Main St", "SFO", None, "driving", _future(), None
+    )
+    assert state["urls"][-1] == google_maps.DIRECTIONS_URL
+    assert result["duration_minutes"] == 20
+    assert result["duration_pessimistic"] == 26
+    assert result["source"] == "google_maps"
+
+
+@pytest.mark.asyncio
+async def test_transit_and_live_traffic_use_directions_only(google):
+    state, _ = google
+    transit = await google_maps._fetch_drive_time(
+        "1 Main St", "SFO", None, "train", _future(), None
+    )
+    live = await google_maps._fetch_drive_time("1 Main St", "SFO", None, "driving", None, None)
+
+    assert state["urls"] == [google_maps.DIRECTIONS_URL] * 2
+    assert (transit["duration_minutes"], transit["duration_pessimistic"]) == (20, 30)
+    assert live["duration_pessimistic"] == live["duration_optimistic"] == 20
@@ -0,0 +1,250 @@
+"""Incremental recompute: network-backed segment inputs are reused from the trip's segment_sources."""
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core import deadline
+from app.core.deadline import request_budget
+from app.schemas.flight_snapshot import FlightSnapshot
+from app.schemas.trips import TripContext, TripPreferences
+from app.services import recommendation_service
+from app.services.recommendation_service import (
+    SEGMENT_TTL_SECONDS,
+    _build_response,
+    build_latest_recommendation_jsonb,
+    segment_sources,
+)
+
+
+NOW = datetime(2099, 1, 1, 8, 0, tzinfo=timezone.utc)
+
+DRIVE = {
+    "duration_minutes": 30,
+    "duration_pessimistic": 40,
+    "duration_optimistic": 25,
+    "duration_text": "30 mins",
+    "distance_text": "15 mi",
+    "source": "google_maps",
+    "label": "Drive to SFO",
+}
+
+
+def _context() -> TripContext:
+    return TripContext(
+        trip_id="00000000-0000-0000-0000-000000000001",
+        input_mode="flight_number",
+        flight_number="UA100",
+        departure_date=date(2099, 1, 1),
+        home_address="1 Market St",
+        preferences=TripPreferences(),
+        created_at=NOW,
+    )
+
+
+def _snapshot(**overrides) -> FlightSnapshot:
+    fields = dict(
+        scheduled_departure=NOW + timedelta(hours=6),
+        departure_terminal="3",
+        departure_gate="B10",
+        origin_airport_code="SFO",
+        departure_local_hour=6,
+    )
+    fields.update(overrides)
+    return FlightSnapshot(**fields)
+
+
+class _Upstreams:
+    def __init__(self, drive=None):
+        self.drive = AsyncMock(return_value=dict(drive or DRIVE))
+        self.tsa = AsyncMock(return_value=None)
+        self.geocode = AsyncMock(return_value={"lat": 37.79, "lng": -122.39})
+        self.terminal = AsyncMock(return_value={"lat": 37.61, "lng": -122.38})
+
+    def __enter__(self):
+        self._patches = [
+            patch.object(recommendation_service, "get_drive_time", self.drive),
+            patch.object(recommendation_service, "fetch_live_tsa_wait", self.tsa),
+            patch.object(recommendation_service, "geocode_address", self.geocode),
+            patch.object(recommendation_service, "get_terminal_coordinates", self.terminal),
+        ]
+        for p in self._patches:
+            p.start()
+        return self
+
+    def __exit__(self, *exc):
+        for p in self._patches:
+            p.stop()
+
+    def total_calls(self) -> int:
+        return (
+            self.drive.await_count + self.tsa.await_count
+            + self.geocode.call_count + self.terminal.call_count
+        )
+
+
+async def _first_build(upstreams):
+    response = await _build_response("t1", _context(), _snapshot(), NOW)
+    return segment_sources(response)
+
+
+class TestIncrementalSegments:
+    @pytest.mark.asyncio
+    async def test_sources_are_persisted_outside_latest_recommendation(self):
+        with _Upstreams() as up:
+            response = await _build_response("t1", _context(), _snapshot(), NOW)
+        assert "segment_sources" not in build_latest_recommendation_jsonb(response)
+        sources = segment_sources(response)
+        assert set(sources) == {"transport", "tsa", "terminal_coordinates", "home_coordinates"}
+        assert sources["transport"]["data"]["duration_minutes"] == 30
+
+    @pytest.mark.asyncio
+    async def test_gate_change_costs_no_network_io(self):
+        with _Upstreams() as up:
+            stored = await _first_build(up)
+            calls_before = up.total_calls()
+
+            response = await _build_response(
+                "t1", _context(), _snapshot(departure_gate="C3"),
+                NOW + timedelta(minutes=5), previous_sources=stored,
+            )
+
+        assert up.total_calls() == calls_before
+        gate = next(s for s in response.segments if s.id == "walk_to_gate")
+        assert "C3" in gate.advice
+        transport = next(s for s in response.segments if s.id == "transport")
+        assert transport.duration_minutes == 30
+        assert response.home_coordinates == {"lat": 37.79, "lng": -122.39}
+
+    @pytest.mark.asyncio
+    async def test_expired_ttl_refetches_only_stale_inputs(self):
+        with _Upstreams() as up:
+            stored = await _first_build(up)
+            later = NOW + timedelta(seconds=SEGMENT_TTL_SECONDS["tsa"] + 60)
+            await _build_response("t1", _context(), _snapshot(), later, previous_sources=stored)
+
+        assert up.tsa.await_count == 2
+        assert up.drive.await_count == 1  # transport TTL not yet expired
+        assert up.geocode.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_terminal_change_refetches_drive_and_terminal(self):
+        with _Upstreams() as up:
+            stored = await _first_build(up)
+            await _build_response(
+                "t1", _context(), _snapshot(departure_terminal="1"), NOW, previous_sources=stored
+            )
+
+        assert up.drive.await_count == 2
+        assert up.terminal.call_count == 2
+        assert up.tsa.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_fallback_drive_estimate_is_not_reused(self):
+        with _Upstreams(drive=dict(DRIVE, source="fallback")) as up:
+            stored = await _first_build(up)
+            await _build_response("t1", _context(), _snapshot(), NOW, previous_sources=stored)
+
+        assert up.drive.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_recompute_threads_previous_sources(self):
+        from app.schemas.recommendations import RecommendationRecomputeRequest
+
+        with _Upstreams() as up:
+            stored = await _first_build(up)
+            with patch.object(
+                recommendation_service, "get_trip_context", AsyncMock(return_value=_context())
+            ):
+                await recommendation_service.recompute_recommendation(
+                    RecommendationRecomputeRequest(trip_id="00000000-0000-0000-0000-000000000001"),
+                    prefetched_snapshot=_snapshot(departure_gate="D1"),
+                    previous_segment_sources=stored,
+                )
+
+        assert up.drive.await_count == 1
+
+
+class TestConcurrentInputs:
+    @pytest.mark.asyncio
+    async def test_inputs_are_fetched_concurrently(self):
+        in_flight = 0
+        peak = 0
+
+        def _slow(result):
+            async def call(*args, **kwargs):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.05)
+                in_flight -= 1
+                return result
+            return call
+
+        with _Upstreams() as up:
+            up.drive.side_effect = _slow(dict(DRIVE))
+            up.tsa.side_effect = _slow(None)
+            up.geocode.side_effect = _slow({"lat": 37.79, "lng": -122.39})
+            up.terminal.side_effect = _slow({"lat": 37.61, "lng": -122.38})
+            response = await _build_response("t1", _context(), _snapshot(), NOW)
+
+        assert peak == 4
+        assert response.home_coordinates == {"lat": 37.79, "lng": -122.39}
+
+    @pytest.mark.asyncio
+    async def test_inputs_past_deadline_fall_back(self):
+        async def _hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        with _Upstreams() as up, request_budget(8), \
+                patch.object(recommendation_service, "SEGMENT_INPUTS_DEADLINE_SECONDS", 0.05):
+            up.drive.side_effect = _hang
+            up.geocode.side_effect = _hang
+            response = await _build_response("t1", _context(), _snapshot(), NOW)
+
+        transport = next(s for s in response.segments if s.id == "transport")
+        assert transport.duration_minutes == 45
+        assert response.home_coordinates is None
+        assert response.terminal_coordinates == {"lat": 37.61, "lng": -122.38}
+        sources = segment_sources(response)
+        assert set(sources) == {"tsa", "terminal_coordinates"}
+
+    @pytest.mark.asyncio
+    async def test_unbudgeted_build_waits_for_slow_inputs(self):
+        async def _slow_drive(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return dict(DRIVE)
+
+        with _Upstreams() as up, \
+                patch.object(recommendation_service, "SEGMENT_INPUTS_DEADLINE_SECONDS", 0.05):
+            up.drive.side_effect = _slow_drive
+            response = await _build_response("t1", _context(), _snapshot(), NOW)
+
+        # No request budget (the polling agent): no fallback drive time.
+        transport = next(s for s in response.segments if s.id == "transport")
+        assert transport.duration_minutes == DRIVE["duration_minutes"]
+        assert "transport" in segment_sources(response)
+
+
+class TestDegradedResponse:
+    @pytest.mark.asyncio
+    async def test_response_not_degraded_within_budget(self):
+        with _Upstreams(), request_budget(8):
+            response = await _build_response("t1", _context(), _snapshot(), NOW)
+        assert response.degraded is False
+
+    @pytest.mark.asyncio
+    async def test_spent_budget_degrades_response(self):
+        async def _skipped_tsa(*args, **kwargs):
+            deadline.mark_degraded("tsa")
+            return None
+
+        with _Upstreams() as up, request_budget(8):
+            up.tsa.side_effect = _skipped_tsa
+            response = await _build_response("t1", _context(), _snapshot(), NOW)
+
+        assert response.degraded is True
+        # The skipped live TSA read isn't stored for reuse.
+        assert "tsa" not in response._segment_sources
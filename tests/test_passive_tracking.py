@@ -7,16 +7,17 @@ import pytest
 
 from app.api.routes.trips import _build_projected_timeline
 from app.services.polling_agent import (
-    INTERACTION_SIGNALS,
     _advance_trip_state,
     _get_departure_utc,
     _get_timeline_dt,
     _handle_feedback_request,
 )
 from app.services.trip_state import (
+    INTERACTION_SIGNALS,
     MONITORABLE_STATUSES,
     STATUS_ORDER,
     advance_status,
+    apply_interaction_signal,
     get_trip_status,
 )
 
@@ -170,25 +171,17 @@ class TestStateAdvancement:
         assert trip.trip_status == "active"
 
     @pytest.mark.asyncio
-    async def test_active_to_en_route_via_interaction(self):
-        """Interaction signal advances active → en_route with actual_depart_at."""
+    async def test_agent_does_not_query_interaction_signals(self):
+        """Taps are applied by POST /v1/events; the agent no longer scans events."""
         timeline = _make_timeline(leave_home_offset_hours=-3)
         trip = _make_trip(trip_status="active", projected_timeline=timeline)
         leave_home = datetime.fromisoformat(timeline["leave_home_at"])
         now = leave_home - timedelta(minutes=5)  # Before leave_home_at
 
-        signal_time = now - timedelta(minutes=2)
-        mock_event = MagicMock()
-        mock_event.created_at = signal_time
-
         session = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_event
-        session.execute = AsyncMock(return_value=mock_result)
-
         await _advance_trip_state(trip, session, now)
-        assert trip.trip_status == "en_route"
-        assert trip.actual_depart_at == signal_time
+        assert trip.trip_status == "active"
+        session.execute.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_en_route_to_at_airport(self):
@@ -248,6 +241,19 @@ class TestInteractionSignals:
         assert "rideshare_tap" in INTERACTION_SIGNALS
         assert "nav_tap" in INTERACTION_SIGNALS
 
+    def test_signal_advances_active_trip(self):
+        trip = _make_trip(trip_status="active")
+        signal_time = datetime.now(tz=timezone.utc)
+        assert apply_interaction_signal(trip, signal_time) is True
+        assert trip.trip_status == "en_route"
+        assert trip.actual_depart_at == signal_time
+
+    def test_signal_ignored_past_active(self):
+        trip = _make_trip(trip_status="at_airport")
+        assert apply_interaction_signal(trip, datetime.now(tz=timezone.utc)) is False
+        assert trip.trip_status == "at_airport"
+        assert trip.actual_depart_at is None
+
 
 # ---------------------------------------------------------------------------
 # Feedback timing
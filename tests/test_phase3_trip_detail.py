@@ -36,8 +36,8 @@ MOCK_FLIGHTS = [
 
 
 def _clear_caches():
-    from app.services import flight_snapshot_service as fss
-    fss._flight_cache.clear()
+    from app.services import flight_cache
+    flight_cache.clear_memory()
 
 
 class TestTrackPopulatesLatestRecommendation:
@@ -176,15 +176,11 @@ class TestPollingLatestRecommendationWrites:
 
         patches = [
             patch(
-                "app.services.polling_agent.lookup_flights",
+                "app.services.flight_snapshot_service.lookup_flights",
                 return_value=[
                     dict(MOCK_FLIGHTS[0], origin_iata="SFO", destination_iata="ORD"),
                 ],
             ),
-            patch(
-                "app.services.polling_agent._check_interaction_signals",
-                new=AsyncMock(return_value=None),
-            ),
             patch(
                 "app.services.polling_agent.recompute_recommendation",
                 new=AsyncMock(return_value=fake_response),
@@ -222,15 +218,11 @@ class TestPollingLatestRecommendationWrites:
 
         patches = [
             patch(
-                "app.services.polling_agent.lookup_flights",
+                "app.services.flight_snapshot_service.lookup_flights",
                 return_value=[
                     dict(MOCK_FLIGHTS[0], origin_iata="SFO", destination_iata="ORD"),
                 ],
             ),
-            patch(
-                "app.services.polling_agent._check_interaction_signals",
-                new=AsyncMock(return_value=None),
-            ),
             patch(
                 "app.services.polling_agent.recompute_recommendation",
                 new=AsyncMock(return_value=MagicMock()),
@@ -295,6 +287,13 @@ class TestGetTripDetail:
                         "terminal_coordinates": {"lat": 40.6, "lng": -73.7},
                         "computed_at": "2026-04-21T14:00:00+00:00",
                     },
+                    segment_sources={
+                        "transport": {
+                            "key": "abc123",
+                            "computed_at": "2026-04-21T14:00:00+00:00",
+                            "data": {"duration_minutes": 30, "source": "google_maps"},
+                        },
+                    },
                     preferences_json='{"transport_mode":"driving"}',
                 ))
                 await s.commit()
@@ -328,6 +327,17 @@ class TestGetTripDetail:
         assert body["latest_recommendation"]["home_coordinates"] == {"lat": 40.7, "lng": -74.0}
         assert body["projected_timeline"]["leave_home_at"] == "2026-04-10T10:00:00+00:00"
 
+    def test_get_trip_detail_hides_segment_sources(self, authed_db_client):
+        """Recompute reuse state stays internal to the trip row."""
+        client, factory, user = authed_db_client
+        trip_id = uuid.uuid4()
+        self._seed_tracked(factory, user.id, trip_id)
+
+        resp = client.get(f"/v1/trips/{trip_id}")
+        assert resp.status_code == 200
+        assert "segment_sources" not in resp.text
+        assert "abc123" not in resp.text
+
     def test_get_trip_detail_404_for_unknown_id(self, authed_db_client):
         client, _, _ = authed_db_client
         resp = client.get(f"/v1/trips/{uuid.uuid4()}")
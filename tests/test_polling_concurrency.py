@@ -0,0 +1,230 @@
+"""Polling agent worker pool: bounded concurrency, per-trip sessions, upstream caps."""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import Base
+from app.db.models import Trip, User
+from app.schemas.flight_snapshot import FlightSnapshot
+from app.schemas.trips import TripContext
+from app.services import flight_snapshot_service, polling_agent, recommendation_service
+from app.services.polling_agent import GOOGLE_UPSTREAM, TripScheduler, _run_due_trips
+
+
+def _run_with_db(tmp_path, count: int, scenario):
+    """Run ``scenario(factory, trip_ids)`` against a fresh file-backed SQLite DB.
+
+    The shared in-memory test engine funnels every session through a single
+    StaticPool connection, which can't serve concurrent sessions; the worker
+    pool needs a real pool. Engine setup, the scenario and teardown all run
+    inside one event loop so pooled connections never cross loops.
+    """
+    async def _do():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'polling.db'}")
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            factory = async_sessionmaker(engine, expire_on_commit=False)
+
+            user_id = uuid.uuid4()
+            trip_ids = [uuid.uuid4() for _ in range(count)]
+            async with factory() as s:
+                s.add(User(id=user_id, trip_count=1, subscription_status="active"))
+                dep = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+                for tid in trip_ids:
+                    s.add(Trip(
+                        id=tid,
+                        user_id=user_id,
+                        input_mode="flight_number",
+                        flight_number="UA100",
+                        departure_date=dep.date().isoformat(),
+                        home_address="1 Market St",
+                        selected_departure_utc=dep.isoformat(),
+                        status="active",
+                        trip_status="active",
+                    ))
+                await s.commit()
+            return await scenario(factory, trip_ids)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_do())
+
+
+def _overdue_scheduler(trip_ids) -> TripScheduler:
+    scheduler = TripScheduler()
+    for tid in trip_ids:
+        scheduler.schedule(tid, 0.0)
+    return scheduler
+
+
+class TestWorkerPool:
+    def test_tick_takes_max_latency_not_sum(self, tmp_path):
+        async def _slow_process(trip, session, **_):
+            await asyncio.sleep(0.2)
+
+        async def _scenario(factory, trip_ids):
+            with patch.object(polling_agent, "_process_trip", side_effect=_slow_process), \
+                    patch.object(polling_agent.settings, "polling_concurrency", 5), \
+                    patch.object(polling_agent.settings, "db_pool_size", 10):
+                started = time.monotonic()
+                await _run_due_trips(factory, _overdue_scheduler(trip_ids))
+                return time.monotonic() - started
+
+        elapsed = _run_with_db(tmp_path, 5, _scenario)
+        assert elapsed < 0.2 * 5 * 0.6
+
+    def test_concurrency_limit_is_respected(self, tmp_path):
+        in_flight = 0
+        peak = 0
+
+        async def _tracking_process(trip, session, **_):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+
+        async def _scenario(factory, trip_ids):
+            with patch.object(polling_agent, "_process_trip", side_effect=_tracking_process), \
+                    patch.object(polling_agent.settings, "polling_concurrency", 2):
+                await _run_due_trips(factory, _overdue_scheduler(trip_ids))
+
+        _run_with_db(tmp_path, 6, _scenario)
+        assert peak == 2
+
+    def test_workers_are_capped_by_db_pool(self, tmp_path):
+        in_flight = 0
+        peak = 0
+
+        async def _tracking_process(trip, session, **_):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+
+        async def _scenario(factory, trip_ids):
+            with patch.object(polling_agent, "_process_trip", side_effect=_tracking_process), \
+                    patch.object(polling_agent.settings, "polling_concurrency", 8), \
+                    patch.object(polling_agent.settings, "db_pool_size", 5):
+                await _run_due_trips(factory, _overdue_scheduler(trip_ids))
+
+        _run_with_db(tmp_path, 6, _scenario)
+        # Two connections per trip: 5 pooled connections serve two workers.
+        assert peak == 2
+
+    def test_failing_trip_is_isolated_and_rescheduled(self, tmp_path):
+        processed = []
+
+        async def _scenario(factory, trip_ids):
+            bad_id, good_id = trip_ids
+
+            async def _process(trip, session, **_):
+                if trip.id == bad_id:
+                    raise RuntimeError("boom")
+                processed.append(trip.id)
+
+            scheduler = _overdue_scheduler(trip_ids)
+            with patch.object(polling_agent, "_process_trip", side_effect=_process):
+                await _run_due_trips(factory, scheduler)
+            return scheduler, good_id, bad_id
+
+        scheduler, good_id, bad_id = _run_with_db(tmp_path, 2, _scenario)
+        assert processed == [good_id]
+        assert bad_id in scheduler and good_id in scheduler
+
+    def test_each_trip_gets_its_own_session(self, tmp_path):
+        sessions = set()
+
+        async def _process(trip, session, **_):
+            sessions.add(id(session))
+            await asyncio.sleep(0.01)
+
+        async def _scenario(factory, trip_ids):
+            with patch.object(polling_agent, "_process_trip", side_effect=_process):
+                await _run_due_trips(factory, _overdue_scheduler(trip_ids))
+
+        _run_with_db(tmp_path, 3, _scenario)
+        assert len(sessions) == 3
+
+
+class TestUpstreamLimits:
+    def test_adb_semaphore_caps_parallel_lookups(self):
+        in_flight = 0
+        peak = 0
+
+        def _lookup(flight_number, date_str):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            time.sleep(0.05)
+            in_flight -= 1
+            return []
+
+        def _trip():
+            trip = type("T", (), {})()
+            trip.id = uuid.uuid4()
+            trip.flight_number = "UA100"
+            trip.departure_date = "2099-01-01"
+            return trip
+
+        async def _do():
+            with patch.object(polling_agent.settings, "polling_adb_concurrency", 1):
+                polling_agent._init_upstream_limits()
+            try:
+                with patch.object(flight_snapshot_service, "lookup_flights", side_effect=_lookup):
+                    await asyncio.gather(*(
+                        polling_agent.refresh_flight_status(_trip(), None) for _ in range(3)
+                    ))
+            finally:
+                polling_agent._upstream_limits.clear()
+
+        asyncio.run(_do())
+        assert peak == 1
+
+    def test_google_slot_held_only_around_maps_calls(self):
+        held_during = {}
+
+        async def _maps_call(*_args, **_kwargs):
+            held_during["maps"] = polling_agent._upstream_limits[GOOGLE_UPSTREAM].locked()
+            return None
+
+        async def _tsa(_iata):
+            held_during["tsa"] = polling_agent._upstream_limits[GOOGLE_UPSTREAM].locked()
+            return None
+
+        context = TripContext(
+            trip_id=uuid.uuid4(), input_mode="flight_number", flight_number="UA100",
+            departure_date="2099-01-01", home_address="1 Market St",
+            created_at=datetime.now(tz=timezone.utc),
+        )
+        snapshot = FlightSnapshot(
+            origin_airport_code="SFO",
+            scheduled_departure=datetime(2099, 1, 1, 12, tzinfo=timezone.utc),
+        )
+
+        async def _do():
+            with patch.object(polling_agent.settings, "polling_google_concurrency", 1):
+                polling_agent._init_upstream_limits()
+            try:
+                with patch.object(recommendation_service, "get_drive_time", side_effect=_maps_call), \
+                        patch.object(recommendation_service, "geocode_address", side_effect=_maps_call), \
+                        patch.object(recommendation_service, "fetch_live_tsa_wait", side_effect=_tsa):
+                    await recommendation_service._fetch_segment_inputs(
+                        context, snapshot, None, {}, datetime.now(tz=timezone.utc),
+                        maps_slot=polling_agent._upstream_slot(GOOGLE_UPSTREAM),
+                    )
+            finally:
+                polling_agent._upstream_limits.clear()
+
+        asyncio.run(_do())
+        assert held_during == {"maps": True, "tsa": False}
+
+    def test_no_limits_outside_the_loop(self):
+        assert polling_agent._upstream_limits == {}
@@ -0,0 +1,139 @@
+"""Polling agent SMS-escalation taps: one batched Event query per tick."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.db.models import Event, Trip, User
+from app.services import polling_agent
+from app.services.polling_agent import (
+    TripScheduler,
+    _find_interaction,
+    _load_interaction_index,
+    _run_due_trips,
+)
+
+
+def _seed_events(factory, user_ids, events):
+    """``events`` is a list of (user_index, event_name, minutes_ago)."""
+    now = datetime.now(tz=timezone.utc)
+
+    async def _do():
+        async with factory() as s:
+            for uid in user_ids:
+                s.add(User(id=uid, trip_count=1, subscription_status="active"))
+            await s.flush()
+            for idx, name, minutes_ago in events:
+                s.add(Event(
+                    user_id=user_ids[idx],
+                    event_name=name,
+                    created_at=now - timedelta(minutes=minutes_ago),
+                ))
+            await s.commit()
+    asyncio.run(_do())
+
+
+def _row(user_id, time_to_go_push_sent_at=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(), user_id=user_id, time_to_go_push_sent_at=time_to_go_push_sent_at
+    )
+
+
+class TestInteractionIndex:
+    def test_loads_taps_since_oldest_pending_push(self, test_session):
+        factory, _ = test_session
+        users = [uuid.uuid4(), uuid.uuid4(), uuid.uuid4()]
+        _seed_events(factory, users, [
+            (0, "timetogo_tap", 2),
+            (0, "nav_tap", 5),          # not an SMS-blocking tap
+            (1, "timetogo_tap", 30),
+            (2, "timetogo_tap", 60),    # before any pending push
+        ])
+        now = datetime.now(tz=timezone.utc)
+        rows = [
+            _row(users[0], time_to_go_push_sent_at=now - timedelta(minutes=10)),
+            _row(users[1], time_to_go_push_sent_at=now - timedelta(minutes=45)),
+            _row(users[2]),
+        ]
+
+        async def _do():
+            async with factory() as s:
+                return await _load_interaction_index(s, rows, now)
+
+        index = asyncio.run(_do())
+        assert [name for name, _ in index[users[0]]] == ["timetogo_tap"]
+        assert _find_interaction(
+            index, users[1], now - timedelta(minutes=45), names={"timetogo_tap"}
+        ) is not None
+        assert users[2] not in index
+
+    def test_find_respects_since(self):
+        user_id = uuid.uuid4()
+        now = datetime.now(tz=timezone.utc)
+        index = {user_id: [("timetogo_tap", now - timedelta(minutes=30))]}
+        taps = {"timetogo_tap"}
+        assert _find_interaction(index, user_id, now - timedelta(minutes=10), taps) is None
+        assert _find_interaction(index, user_id, now - timedelta(hours=1), taps) is not None
+        assert _find_interaction({}, user_id, now - timedelta(hours=1), taps) is None
+
+    def test_no_pending_push_skips_query(self):
+        session = AsyncMock()
+        index = asyncio.run(_load_interaction_index(
+            session, [_row(uuid.uuid4()), _row(None)], datetime.now(tz=timezone.utc)
+        ))
+        assert index == {}
+        session.execute.assert_not_awaited()
+
+
+class TestTickSharesIndex:
+    def test_one_index_load_for_all_due_trips(self, test_session):
+        factory, _ = test_session
+        user_id = uuid.uuid4()
+        trip_ids = [uuid.uuid4() for _ in range(3)]
+        dep = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+
+        async def _seed():
+            async with factory() as s:
+                s.add(User(id=user_id, trip_count=1, subscription_status="active"))
+                for i, tid in enumerate(trip_ids):
+                    s.add(Trip(
+                        id=tid,
+                        user_id=user_id,
+                        input_mode="flight_number",
+                        flight_number=f"UA{100 + i}",
+                        departure_date=dep.date().isoformat(),
+                        home_address="1 Market St",
+                        selected_departure_utc=dep.isoformat(),
+                        status="active",
+                        trip_status="active",
+                    ))
+                await s.commit()
+        asyncio.run(_seed())
+
+        scheduler = TripScheduler()
+        for tid in trip_ids:
+            scheduler.schedule(tid, 0.0)
+        seen = []
+
+        async def _fake_process(trip, session, interactions=None, **_):
+            seen.append(interactions)
+
+        real_load = polling_agent._load_interaction_index
+
+        async def _do():
+            # Serialize workers: the shared in-memory engine has a single connection
+            with patch.object(polling_agent.settings, "polling_concurrency", 1), \
+                    patch.object(polling_agent, "_process_trip", side_effect=_fake_process), \
+                    patch.object(
+                        polling_agent, "_load_interaction_index", side_effect=real_load
+                    ) as mock_load:
+                await _run_due_trips(factory, scheduler)
+            return mock_load
+
+        mock_load = asyncio.run(_do())
+        assert mock_load.await_count == 1
+        assert len(mock_load.await_args.args[1]) == 3
+        assert len(seen) == 3
+        assert all(idx is seen[0] for idx in seen)
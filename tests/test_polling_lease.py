@@ -0,0 +1,199 @@
+"""Polling agent trip leases: one replica per trip slot, expiry takeover, release."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import select
+
+from app.db.models import Trip, User
+from app.services import polling_agent
+from app.services.polling_agent import (
+    LEASE_SECONDS,
+    TripScheduler,
+    _claim_due_trips,
+    _process_due_trip,
+    _release_leases,
+    _run_due_trips,
+)
+
+
+def _seed(factory, *, owner=None, expires_at=None):
+    user_id = uuid.uuid4()
+    trip_id = uuid.uuid4()
+    dep = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+
+    async def _do():
+        async with factory() as s:
+            s.add(User(id=user_id, trip_count=1, subscription_status="active"))
+            s.add(Trip(
+                id=trip_id,
+                user_id=user_id,
+                input_mode="flight_number",
+                flight_number="UA100",
+                departure_date=dep.date().isoformat(),
+                home_address="1 Market St",
+                selected_departure_utc=dep.isoformat(),
+                status="active",
+                trip_status="active",
+                poll_lease_owner=owner,
+                poll_lease_expires_at=expires_at,
+            ))
+            await s.commit()
+    asyncio.run(_do())
+    return trip_id
+
+
+def _lease(factory, trip_id):
+    async def _do():
+        async with factory() as s:
+            row = (await s.execute(
+                select(Trip.poll_lease_owner, Trip.poll_lease_expires_at).where(Trip.id == trip_id)
+            )).one()
+            return row.poll_lease_owner, row.poll_lease_expires_at
+    return asyncio.run(_do())
+
+
+def _tick(factory, scheduler, replica_id):
+    processed = []
+
+    async def _fake_process(trip, session, **_):
+        processed.append(trip.id)
+
+    async def _do():
+        with patch.object(polling_agent, "REPLICA_ID", replica_id), \
+                patch.object(polling_agent, "_process_trip", new=AsyncMock(side_effect=_fake_process)):
+            await _run_due_trips(factory, scheduler)
+
+    asyncio.run(_do())
+    return processed
+
+
+class TestClaimDueTrips:
+    def test_claims_unowned_trip(self, test_session):
+        factory, _ = test_session
+        trip_id = _seed(factory)
+        now = datetime.now(tz=timezone.utc)
+
+        async def _do():
+            async with factory() as s:
+                return await _claim_due_trips(s, [trip_id], now)
+
+        claimed, lost = asyncio.run(_do())
+        assert claimed == [trip_id]
+        assert lost == {}
+        owner, expires = _lease(factory, trip_id)
+        assert owner == polling_agent.REPLICA_ID
+        assert expires is not None
+
+    def test_live_lease_of_other_replica_is_not_claimed(self, test_session):
+        factory, _ = test_session
+        expires = datetime.now(tz=timezone.utc) + timedelta(minutes=5)
+        trip_id = _seed(factory, owner="other-replica", expires_at=expires)
+
+        async def _do():
+            async with factory() as s:
+                return await _claim_due_trips(s, [trip_id], datetime.now(tz=timezone.utc))
+
+        claimed, lost = asyncio.run(_do())
+        assert claimed == []
+        assert abs(lost[trip_id] - expires.timestamp()) < 1
+        assert _lease(factory, trip_id)[0] == "other-replica"
+
+    def test_expired_lease_is_taken_over(self, test_session):
+        factory, _ = test_session
+        trip_id = _seed(
+            factory,
+            owner="dead-replica",
+            expires_at=datetime.now(tz=timezone.utc) - timedelta(seconds=1),
+        )
+
+        async def _do():
+            async with factory() as s:
+                return await _claim_due_trips(s, [trip_id], datetime.now(tz=timezone.utc))
+
+        claimed, _ = asyncio.run(_do())
+        assert claimed == [trip_id]
+        assert _lease(factory, trip_id)[0] == polling_agent.REPLICA_ID
+
+
+class TestReplicaContention:
+    def test_only_one_replica_processes_a_due_trip(self, test_session):
+        factory, _ = test_session
+        trip_id = _seed(factory)
+
+        sched_a, sched_b = TripScheduler(), TripScheduler()
+        sched_a.schedule(trip_id, 0.0)
+        sched_b.schedule(trip_id, 0.0)
+
+        assert _tick(factory, sched_a, "replica-a") == [trip_id]
+        assert _tick(factory, sched_b, "replica-b") == []
+
+        # The loser backs off until the winner's lease lapses
+        owner, expires = _lease(factory, trip_id)
+        assert owner == "replica-a"
+        assert sched_b.next_due_at() >= datetime.now(tz=timezone.utc).timestamp() + LEASE_SECONDS - 5
+
+    def test_owner_keeps_lease_past_next_due_time(self, test_session):
+        factory, _ = test_session
+        trip_id = _seed(factory)
+        scheduler = TripScheduler()
+        scheduler.schedule(trip_id, 0.0)
+
+        _tick(factory, scheduler, "replica-a")
+
+        _, expires = _lease(factory, trip_id)
+        expires = expires if expires.tzinfo else expires.replace(tzinfo=timezone.utc)
+        assert expires.timestamp() >= scheduler.next_due_at() + LEASE_SECONDS - 1
+
+    def test_release_frees_trips_for_peers(self, test_session):
+        factory, _ = test_session
+        trip_id = _seed(
+            factory,
+            owner=polling_agent.REPLICA_ID,
+            expires_at=datetime.now(tz=timezone.utc) + timedelta(hours=1),
+        )
+
+        asyncio.run(_release_leases(factory))
+
+        assert _lease(factory, trip_id) == (None, None)
+
+
+class TestLeaseRenewal:
+    def test_worker_renews_lease_before_processing(self, test_session):
+        factory, _ = test_session
+        stale = datetime.now(tz=timezone.utc) - timedelta(seconds=5)
+        trip_id = _seed(factory, owner="me", expires_at=stale)
+        seen_expiry = []
+
+        async def _fake_process(trip, session, **_):
+            seen_expiry.append(trip.poll_lease_expires_at)
+
+        async def _do():
+            with patch.object(polling_agent, "REPLICA_ID", "me"), \
+                    patch.object(polling_agent, "_process_trip", new=AsyncMock(side_effect=_fake_process)):
+                await _process_due_trip(factory, trip_id, TripScheduler())
+
+        asyncio.run(_do())
+        (renewed,) = seen_expiry
+        if renewed.tzinfo is None:
+            renewed = renewed.replace(tzinfo=timezone.utc)
+        assert renewed > datetime.now(tz=timezone.utc)
+
+    def test_worker_skips_trip_taken_over_while_queued(self, test_session):
+        factory, _ = test_session
+        future = datetime.now(tz=timezone.utc) + timedelta(seconds=LEASE_SECONDS)
+        trip_id = _seed(factory, owner="peer", expires_at=future)
+        scheduler = TripScheduler()
+        process = AsyncMock()
+
+        async def _do():
+            with patch.object(polling_agent, "REPLICA_ID", "me"), \
+                    patch.object(polling_agent, "_process_trip", new=process):
+                await _process_due_trip(factory, trip_id, scheduler)
+
+        asyncio.run(_do())
+        process.assert_not_awaited()
+        assert _lease(factory, trip_id)[0] == "peer"
+        assert trip_id in scheduler
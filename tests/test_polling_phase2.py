@@ -5,6 +5,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.services.integrations.aerodatabox import AeroDataBoxTimeout
+
 
 def _future_dep(hours: float) -> datetime:
     return datetime.now(tz=timezone.utc) + timedelta(hours=hours)
@@ -199,7 +201,7 @@ class TestRefreshFlightStatus:
         session = AsyncMock()
 
         with patch(
-            "app.services.polling_agent.lookup_flights",
+            "app.services.flight_snapshot_service.lookup_flights",
             return_value=[_fresh_flight(gate="B14", status="Scheduled", terminal="8")],
         ):
             was_called, changes = await refresh_flight_status(trip, session)
@@ -223,7 +225,7 @@ class TestRefreshFlightStatus:
         session = AsyncMock()
 
         with patch(
-            "app.services.polling_agent.lookup_flights",
+            "app.services.flight_snapshot_service.lookup_flights",
             return_value=[_fresh_flight(terminal="3")],
         ), caplog.at_level(logging.INFO, logger="app.services.polling_agent"):
             was_called, changes = await refresh_flight_status(trip, session)
@@ -246,7 +248,7 @@ class TestRefreshFlightStatus:
             flight_info=_stored_flight_info(),
             flight_status=_stored_flight_status(),
         )
-        with patch("app.services.polling_agent.lookup_flights", return_value=[]):
+        with patch("app.services.flight_snapshot_service.lookup_flights", return_value=[]):
             was_called, changes = await refresh_flight_status(trip, AsyncMock())
         assert was_called is False
         assert changes == {}
@@ -257,7 +259,7 @@ class TestRefreshFlightStatus:
 
         trip = _make_trip()
         with patch(
-            "app.services.polling_agent.lookup_flights",
+            "app.services.flight_snapshot_service.lookup_flights",
             side_effect=Exception("network"),
         ):
             was_called, changes = await refresh_flight_status(trip, AsyncMock())
@@ -265,6 +267,219 @@ class TestRefreshFlightStatus:
         assert changes == {}
 
 
+# ---------------------------------------------------------------------------
+# Per-flight fan-in (FlightLookupBatch)
+# ---------------------------------------------------------------------------
+
+class TestFlightLookupFanIn:
+    @pytest.mark.asyncio
+    async def test_trips_on_same_flight_share_one_lookup(self):
+        import asyncio
+        from app.services.polling_agent import FlightLookupBatch, refresh_flight_status
+
+        trips = [
+            _make_trip(flight_info=_stored_flight_info(), flight_status=_stored_flight_status(gate="B10")),
+            _make_trip(flight_info=_stored_flight_info(), flight_status=_stored_flight_status(gate="B12")),
+            _make_trip(flight_info=_stored_flight_info(), flight_status=None),
+        ]
+        trips[2].flight_number = "ua 100"  # same flight, different spelling
+        batch = FlightLookupBatch()
+
+        with patch(
+            "app.services.flight_snapshot_service.lookup_flights",
+            return_value=[_fresh_flight(gate="B14")],
+        ) as mock_lookup:
+            results = await asyncio.gather(*(
+                refresh_flight_status(t, AsyncMock(), flight_lookups=batch) for t in trips
+            ))
+
+        assert mock_lookup.call_count == 1
+        assert batch.calls == 1
+        # Every trip in the group gets the new status and its own change set
+        assert all(t.flight_status["gate"] == "B14" for t in trips)
+        assert results[0] == (True, {"gate": ("B10", "B14")})
+        assert results[1] == (True, {"gate": ("B12", "B14")})
+        assert results[2][0] is True
+
+    @pytest.mark.asyncio
+    async def test_distinct_flights_get_separate_lookups(self):
+        from app.services.polling_agent import FlightLookupBatch
+
+        batch = FlightLookupBatch()
+        with patch("app.services.flight_snapshot_service.lookup_flights", return_value=[]) as mock_lookup:
+            await batch.lookup("UA100", "2099-01-01")
+            await batch.lookup("UA100", "2099-01-02")
+            await batch.lookup("DL5", "2099-01-01")
+            await batch.lookup("UA100", "2099-01-01")
+        assert mock_lookup.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_failure_is_shared_across_the_group(self):
+        from app.services.integrations.aerodatabox import AeroDataBoxRateLimited
+        from app.services.polling_agent import FlightLookupBatch, refresh_flight_status
+
+        batch = FlightLookupBatch()
+        with patch(
+            "app.services.flight_snapshot_service.lookup_flights",
+            side_effect=AeroDataBoxRateLimited("429"),
+        ) as mock_lookup:
+            for _ in range(3):
+                was_called, changes = await refresh_flight_status(
+                    _make_trip(), AsyncMock(), flight_lookups=batch
+                )
+                assert (was_called, changes) == (False, {})
+        assert mock_lookup.call_count == 1
+
+    def test_same_flight_trips_share_a_poll_slot(self):
+        import uuid
+        from types import SimpleNamespace
+        from app.services.polling_agent import _next_due_at
+
+        now = datetime.now(tz=timezone.utc)
+        dep = _future_dep(24)
+        rows = [
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                flight_number=fn,
+                selected_departure_utc=dep.isoformat(),
+                departure_date=dep.date().isoformat(),
+                projected_timeline=None,
+            )
+            for fn in ("UA100", "UA100", "ua 100")
+        ]
+        assert len({_next_due_at(r, now) for r in rows}) == 1
+
+
+# ---------------------------------------------------------------------------
+# Airport-wide FIDS refresh (FlightLookupBatch.prefetch_airports)
+# ---------------------------------------------------------------------------
+
+def _adb_utc(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%d %H:%MZ")
+
+
+def _schedule_row(flight_number: str, dep: datetime, origin: str | None = "SFO"):
+    import uuid
+    from types import SimpleNamespace
+
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        flight_number=flight_number,
+        origin_iata=origin,
+        selected_departure_utc=_adb_utc(dep),
+        departure_date=dep.date().isoformat(),
+        projected_timeline=None,
+    )
+
+
+def _fids_row(flight_number: str, dep: datetime, gate: str) -> dict:
+    return {
+        **_fresh_flight(gate=gate),
+        "flight_number": flight_number,
+        "departure_time_utc": _adb_utc(dep),
+        "arrival_time_utc": None,
+    }
+
+
+class TestAirportFidsRefresh:
+    @pytest.mark.asyncio
+    async def test_busy_airport_uses_one_fids_pull(self):
+        from app.services.polling_agent import FlightLookupBatch
+
+        dep = _future_dep(2)
+        rows = [_schedule_row(fn, dep) for fn in ("UA100", "DL5", "AA20")]
+        fids = [
+            _fids_row("UA 100", dep, "B1"),
+            _fids_row("DL 5", dep, "B2"),
+            _fids_row("AA 20", dep, "B3"),
+            _fids_row("UA 100", dep + timedelta(days=1), "X9"),
+        ]
+        batch = FlightLookupBatch()
+        with patch(
+            "app.services.polling_agent.lookup_airport_departures",
+            new=AsyncMock(return_value=fids),
+        ) as mock_fids, patch("app.services.flight_snapshot_service.lookup_flights") as mock_lookup:
+            await batch.prefetch_airports(rows)
+            flights = await batch.lookup("UA100", rows[0].departure_date, _adb_utc(dep))
+            dl = await batch.lookup("dl 5", rows[1].departure_date, _adb_utc(dep))
+
+        assert mock_fids.await_count == 1
+        assert mock_fids.await_args.args == ("SFO", rows[0].departure_date)
+        assert mock_lookup.call_count == 0
+        # Matched on flight number and departure_time_utc
+        assert [f["departure_gate"] for f in flights] == ["B1"]
+        assert dl[0]["departure_gate"] == "B2"
+
+    @pytest.mark.asyncio
+    async def test_single_flight_keeps_per_flight_lookup(self):
+        from app.services.polling_agent import FlightLookupBatch
+
+        dep = _future_dep(2)
+        batch = FlightLookupBatch()
+        with patch(
+            "app.services.polling_agent.lookup_airport_departures", new=AsyncMock()
+        ) as mock_fids:
+            await batch.prefetch_airports([_schedule_row("UA100", dep)] * 2)
+        assert mock_fids.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_cached_flights_are_not_counted(self):
+        from app.services import flight_cache
+        from app.services.polling_agent import FlightLookupBatch
+
+        dep = _future_dep(2)
+        rows = [_schedule_row(fn, dep) for fn in ("UA100", "DL5", "AA20")]
+        for row in rows[:2]:
+            await flight_cache.store_flights(
+                row.flight_number, row.departure_date, [_fresh_flight()]
+            )
+        batch = FlightLookupBatch()
+        with patch(
+            "app.services.polling_agent.lookup_airport_departures", new=AsyncMock()
+        ) as mock_fids:
+            await batch.prefetch_airports(rows)
+        # One uncached flight: a FIDS window costs the same, so it isn't used
+        assert mock_fids.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_far_out_trips_do_not_trigger_fids(self):
+        from app.services.polling_agent import FlightLookupBatch
+
+        dep = _future_dep(24)
+        rows = [_schedule_row(fn, dep) for fn in ("UA100", "DL5", "AA20")]
+        batch = FlightLookupBatch()
+        with patch(
+            "app.services.polling_agent.lookup_airport_departures", new=AsyncMock()
+        ) as mock_fids:
+            await batch.prefetch_airports(rows)
+        assert mock_fids.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_unmatched_or_failed_fids_falls_back_to_lookup_flights(self):
+        from app.services import flight_cache
+        from app.services.integrations.aerodatabox import AeroDataBoxUnavailable
+        from app.services.polling_agent import FlightLookupBatch
+
+        dep = _future_dep(2)
+        rows = [_schedule_row(fn, dep) for fn in ("UA100", "DL5", "AA20")]
+        for fids_mock in (
+            AsyncMock(return_value=[_fids_row("DL 5", dep, "B2")]),
+            AsyncMock(side_effect=AeroDataBoxUnavailable("down")),
+        ):
+            flight_cache.clear_memory()
+            batch = FlightLookupBatch()
+            with patch(
+                "app.services.polling_agent.lookup_airport_departures", new=fids_mock
+            ), patch(
+                "app.services.flight_snapshot_service.lookup_flights",
+                return_value=[_fresh_flight(gate="C7")],
+            ) as mock_lookup:
+                await batch.prefetch_airports(rows)
+                flights = await batch.lookup("UA100", rows[0].departure_date, _adb_utc(dep))
+            assert mock_lookup.call_count == 1
+            assert flights[0]["departure_gate"] == "C7"
+
+
 # ---------------------------------------------------------------------------
 # _process_trip — end-to-end Path A/B behavior
 # ---------------------------------------------------------------------------
@@ -277,14 +492,10 @@ def _patch_process_trip_dependencies(
     """Produce a patcher stack that isolates _process_trip from DB / events / recompute."""
     patches = [
         patch(
-            "app.services.polling_agent.lookup_flights",
+            "app.services.flight_snapshot_service.lookup_flights",
             return_value=lookup_flights_return or [],
             side_effect=lookup_flights_side_effect,
         ),
-        patch(
-            "app.services.polling_agent._check_interaction_signals",
-            new=AsyncMock(return_value=None),
-        ),
         patch(
             "app.services.polling_agent.recompute_recommendation",
             new=AsyncMock(return_value=recompute_return),
@@ -378,7 +589,7 @@ class TestProcessTripPathAB:
         )
         started, _ = _apply_patches(patches)
         mock_lookup = started[0]
-        mock_recompute = started[2]
+        mock_recompute = started[1]
         try:
             await _process_trip(trip, session)
         finally:
@@ -431,12 +642,8 @@ class TestProcessTripPathAB:
         recompute_mock = AsyncMock(return_value=None)
         patches = [
             patch(
-                "app.services.polling_agent.lookup_flights",
-                return_value=[_fresh_flight()],
-            ),
-            patch(
-                "app.services.polling_agent._check_interaction_signals",
-                new=AsyncMock(return_value=None),
+                "app.services.flight_snapshot_service.lookup_flights",
+                side_effect=AeroDataBoxTimeout("slow"),
             ),
             patch(
                 "app.services.polling_agent.recompute_recommendation",
@@ -461,6 +668,29 @@ class TestProcessTripPathAB:
         call_kwargs = recompute_mock.await_args.kwargs
         assert call_kwargs.get("prefetched_snapshot") is None
 
+    @pytest.mark.asyncio
+    async def test_freezes_missing_flight_info_from_live_response(self):
+        """A trip tracked during an ADB outage gets flight_info from the first live lookup."""
+        from app.services.polling_agent import _process_trip
+
+        trip = _make_trip(flight_info=None, flight_status=None, dep_hours_out=5)
+        recompute_mock = AsyncMock(return_value=None)
+        with patch(
+            "app.services.flight_snapshot_service.lookup_flights",
+            return_value=[_fresh_flight()],
+        ), patch(
+            "app.services.polling_agent.recompute_recommendation", new=recompute_mock,
+        ), patch(
+            "app.services.polling_agent.send_trip_notification",
+            new=AsyncMock(return_value=True),
+        ):
+            await _process_trip(trip, AsyncMock())
+
+        assert trip.flight_info["origin_iata"] == "SFO"
+        assert trip.origin_iata == "SFO"
+        assert "stale" not in trip.flight_status
+        assert recompute_mock.await_args.kwargs["prefetched_snapshot"] is not None
+
 
 class TestProcessTripNotifications:
     @pytest.mark.asyncio
@@ -481,7 +711,7 @@ class TestProcessTripNotifications:
             lookup_flights_return=[_fresh_flight(gate="B14")],
         )
         started, _ = _apply_patches(patches)
-        mock_notify = started[3]
+        mock_notify = started[2]
         try:
             await _process_trip(trip, session)
         finally:
@@ -508,7 +738,7 @@ class TestProcessTripNotifications:
             lookup_flights_return=[_fresh_flight(status="Cancelled")],
         )
         started, _ = _apply_patches(patches)
-        mock_notify = started[3]
+        mock_notify = started[2]
         try:
             await _process_trip(trip, session)
         finally:
@@ -0,0 +1,229 @@
+"""Polling agent due-time scheduler: heap ordering, jitter, milestones, due-only processing."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.db.models import Trip, User
+from app.services.polling_agent import (
+    DEFAULT_SLEEP,
+    DISCOVERY_INTERVAL,
+    MIN_SLEEP,
+    TripScheduler,
+    _jitter_offset,
+    _next_due_at,
+    _run_due_trips,
+)
+
+
+def _row(hours_out: float, *, trip_id=None, timeline: dict | None = None):
+    dep = datetime.now(tz=timezone.utc) + timedelta(hours=hours_out)
+    return SimpleNamespace(
+        id=trip_id or uuid.uuid4(),
+        selected_departure_utc=dep.isoformat(),
+        departure_date=dep.date().isoformat(),
+        projected_timeline=timeline,
+    )
+
+
+class TestTripScheduler:
+    def test_pop_due_returns_only_due_trips_in_order(self):
+        s = TripScheduler()
+        s.schedule("b", 200.0)
+        s.schedule("a", 100.0)
+        s.schedule("c", 300.0)
+        assert s.pop_due(250.0) == ["a", "b"]
+        assert len(s) == 1
+        assert s.next_due_at() == 300.0
+
+    def test_reschedule_supersedes_older_entry(self):
+        s = TripScheduler()
+        s.schedule("a", 100.0)
+        s.schedule("a", 500.0)
+        assert s.pop_due(200.0) == []
+        assert s.pop_due(500.0) == ["a"]
+
+    def test_sync_adds_new_and_forgets_departed_trips(self):
+        now = datetime.now(tz=timezone.utc)
+        keep, drop = _row(24), _row(24)
+        s = TripScheduler()
+        s.sync([keep, drop], now)
+        assert drop.id in s and keep.id in s
+
+        s.sync([keep], now)
+        assert drop.id not in s
+        assert keep.id in s
+        # The forgotten trip's heap entry is skipped lazily
+        assert s.pop_due(now.timestamp() + 10 * 3600) == [keep.id]
+
+    def test_sync_keeps_existing_due_time(self):
+        now = datetime.now(tz=timezone.utc)
+        row = _row(24)
+        s = TripScheduler()
+        s.schedule(row.id, 42.0)
+        s.sync([row], now)
+        assert s.next_due_at() == 42.0
+
+    def test_later_syncs_make_new_and_edited_trips_due_now(self):
+        now = datetime.now(tz=timezone.utc)
+        known, edited, new = _row(24), _row(30), _row(30)
+        s = TripScheduler()
+        s.sync([known, edited], now)
+        known_due = s._due[known.id]
+
+        edited.selected_departure_utc = (now + timedelta(hours=10)).isoformat()
+        s.sync([known, edited, new], now)
+        assert s._due[new.id] == now.timestamp()
+        assert s._due[edited.id] == now.timestamp()
+        assert s._due[known.id] == known_due
+
+    def test_needs_sync_on_discovery_cadence(self):
+        now = datetime.now(tz=timezone.utc)
+        s = TripScheduler()
+        assert s.needs_sync(now.timestamp())
+        s.sync([], now)
+        assert not s.needs_sync(now.timestamp() + DISCOVERY_INTERVAL - 1)
+        assert s.needs_sync(now.timestamp() + DISCOVERY_INTERVAL)
+
+    def test_seconds_until_next_is_capped_and_floored(self):
+        s = TripScheduler()
+        assert s.seconds_until_next(0.0) == DEFAULT_SLEEP
+        s.schedule("a", 5000.0)
+        assert s.seconds_until_next(0.0) == DEFAULT_SLEEP
+        s.schedule("b", 30.0)
+        assert s.seconds_until_next(0.0) == 30.0
+        assert s.seconds_until_next(100.0) == MIN_SLEEP
+
+
+class TestNextDueAt:
+    def test_due_within_one_interval(self):
+        now = datetime.now(tz=timezone.utc)
+        due = _next_due_at(_row(24), now)
+        assert now.timestamp() < due <= now.timestamp() + 1800
+
+    def test_close_trip_uses_short_interval(self):
+        now = datetime.now(tz=timezone.utc)
+        due = _next_due_at(_row(1), now)
+        assert due <= now.timestamp() + 300
+
+    def test_jitter_is_stable_and_spreads_trips(self):
+        ids = [uuid.uuid4() for _ in range(50)]
+        offsets = {_jitter_offset(i, 1800) for i in ids}
+        assert len(offsets) > 40
+        assert all(_jitter_offset(i, 1800) == _jitter_offset(i, 1800) for i in ids)
+
+    def test_milestone_pulls_due_time_forward(self):
+        now = datetime.now(tz=timezone.utc)
+        leave = now + timedelta(minutes=2)
+        row = _row(30, timeline={"leave_home_at": leave.isoformat()})
+        # Pin the phase so the grid slot lands a full interval out
+        with patch(
+            "app.services.polling_agent._jitter_offset",
+            return_value=now.timestamp() % 1800,
+        ):
+            assert _next_due_at(row, now) == leave.timestamp()
+
+    def test_activation_milestone_24h_before_departure(self):
+        now = datetime.now(tz=timezone.utc)
+        row = _row(24 + 5 / 60)
+        due = _next_due_at(row, now)
+        assert due <= now.timestamp() + 5 * 60 + 1
+
+    def test_band_edge_pulls_due_time_forward(self):
+        """A trip 6h05m out is woken when it crosses into the 10-min band."""
+        now = datetime.now(tz=timezone.utc)
+        row = _row(6 + 5 / 60)
+        due = _next_due_at(row, now)
+        assert due <= now.timestamp() + 5 * 60 + 1
+
+
+class TestRunDueTrips:
+    def _seed(self, factory, *hours_out):
+        user_id = uuid.uuid4()
+        trip_ids = [uuid.uuid4() for _ in hours_out]
+
+        async def _do():
+            async with factory() as s:
+                s.add(User(id=user_id, trip_count=1, subscription_status="active"))
+                for tid, h in zip(trip_ids, hours_out):
+                    dep = datetime.now(tz=timezone.utc) + timedelta(hours=h)
+                    s.add(Trip(
+                        id=tid,
+                        user_id=user_id,
+                        input_mode="flight_number",
+                        flight_number="UA100",
+                        departure_date=dep.date().isoformat(),
+                        home_address="1 Market St",
+                        selected_departure_utc=dep.isoformat(),
+                        status="active",
+                        trip_status="active",
+                    ))
+                await s.commit()
+        asyncio.run(_do())
+        return trip_ids
+
+    def test_processes_only_due_trips_and_reschedules(self, test_session):
+        factory, _ = test_session
+        due_id, later_id = self._seed(factory, 1, 24)
+
+        scheduler = TripScheduler()
+        scheduler.schedule(due_id, 0.0)  # overdue
+        scheduler.schedule(later_id, datetime.now(tz=timezone.utc).timestamp() + 3600)
+
+        processed = []
+
+        async def _fake_process(trip, session, **_):
+            processed.append(trip.id)
+
+        async def _do():
+            with patch(
+                "app.services.polling_agent._process_trip",
+                new=AsyncMock(side_effect=_fake_process),
+            ):
+                await _run_due_trips(factory, scheduler)
+
+        asyncio.run(_do())
+
+        assert processed == [due_id]
+        # Both trips remain scheduled; the processed one moved into the future
+        assert len(scheduler) == 2
+        assert scheduler.next_due_at() > datetime.now(tz=timezone.utc).timestamp()
+
+    def test_no_due_trips_skips_full_load(self, test_session):
+        factory, _ = test_session
+        (trip_id,) = self._seed(factory, 24)
+
+        scheduler = TripScheduler()
+        scheduler.schedule(trip_id, datetime.now(tz=timezone.utc).timestamp() + 3600)
+
+        async def _do():
+            with patch(
+                "app.services.polling_agent._get_active_trips",
+                new=AsyncMock(return_value=[]),
+            ) as mock_load:
+                await _run_due_trips(factory, scheduler)
+            return mock_load
+
+        mock_load = asyncio.run(_do())
+        assert mock_load.await_count == 0
+
+    def test_discovery_scan_skipped_between_syncs(self, test_session):
+        factory, _ = test_session
+        (trip_id,) = self._seed(factory, 24)
+
+        scheduler = TripScheduler()
+        scheduler.schedule(trip_id, datetime.now(tz=timezone.utc).timestamp() + 3600)
+
+        async def _do():
+            with patch(
+                "app.services.polling_agent._get_schedule_rows",
+                new=AsyncMock(return_value=[]),
+            ) as mock_scan:
+                await _run_due_trips(factory, scheduler)
+                await _run_due_trips(factory, scheduler)
+            return mock_scan
+
+        mock_scan = asyncio.run(_do())
+        assert mock_scan.await_count == 1
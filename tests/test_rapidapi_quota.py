@@ -0,0 +1,159 @@
+"""RapidAPI quota manager: priority reserves, daily budget, deferral counts."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.integrations import aerodatabox
+from app.services.integrations.rapidapi_quota import (
+    Priority,
+    QuotaManager,
+    current_priority,
+    quota,
+    use_priority,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _acquire(manager, priority):
+    return asyncio.run(manager.acquire(priority))
+
+
+class TestTokenBucket:
+    def test_polling_leaves_reserve_for_interactive(self):
+        m = QuotaManager(rate_per_second=1, burst=10, daily_budget=0, clock=_Clock())
+        # No time passes, so polling can't wait for the reserve to refill
+        with patch("app.services.integrations.rapidapi_quota.MAX_WAIT", {p: 0.0 for p in Priority}):
+            granted = sum(_acquire(m, Priority.POLLING) for _ in range(10))
+        # Polling must leave half the burst untouched
+        assert granted == 5
+        assert m.deferred[Priority.POLLING] == 5
+        # Interactive can still spend the reserve
+        assert all(_acquire(m, Priority.INTERACTIVE) for _ in range(5))
+
+    def test_backfill_has_deepest_reserve(self):
+        m = QuotaManager(rate_per_second=1, burst=8, daily_budget=0, clock=_Clock())
+        # Backfill waits rather than deferring; give it no time to refill
+        with patch("app.services.integrations.rapidapi_quota.MAX_WAIT", {p: 0.0 for p in Priority}):
+            granted = sum(_acquire(m, Priority.BACKFILL) for _ in range(8))
+        assert granted == 2
+
+    def test_interactive_waits_for_refill(self):
+        clock = _Clock()
+        m = QuotaManager(rate_per_second=2, burst=1, daily_budget=0, clock=clock)
+        assert _acquire(m, Priority.INTERACTIVE)
+
+        async def _sleep(seconds):
+            clock.now += seconds
+
+        with patch("app.services.integrations.rapidapi_quota.asyncio.sleep", new=_sleep):
+            assert _acquire(m, Priority.INTERACTIVE)
+        assert clock.now == pytest.approx(0.5)
+
+    def test_polling_fan_out_waits_briefly_instead_of_deferring(self):
+        clock = _Clock()
+        m = QuotaManager(rate_per_second=5, burst=10, daily_budget=0, clock=clock)
+
+        async def _sleep(seconds):
+            clock.now += seconds
+
+        with patch("app.services.integrations.rapidapi_quota.asyncio.sleep", new=_sleep):
+            granted = [_acquire(m, Priority.POLLING) for _ in range(10)]
+        assert all(granted)
+        assert m.deferred[Priority.POLLING] == 0
+        assert clock.now == pytest.approx(1.0)  # the reserve refilled at 5/s
+
+    def test_disabled_bucket_never_defers(self):
+        m = QuotaManager(rate_per_second=0, burst=1, daily_budget=0, clock=_Clock())
+        assert all(_acquire(m, Priority.POLLING) for _ in range(100))
+
+
+class TestDailyBudget:
+    def test_lower_classes_stop_before_budget_runs_out(self):
+        m = QuotaManager(rate_per_second=0, burst=1, daily_budget=100, clock=_Clock())
+        polled = sum(_acquire(m, Priority.POLLING) for _ in range(100))
+        assert polled == 80  # 20% held back for interactive + track
+        assert not _acquire(m, Priority.BACKFILL)
+        track = sum(_acquire(m, Priority.TRACK) for _ in range(100))
+        assert track == 15
+        interactive = sum(_acquire(m, Priority.INTERACTIVE) for _ in range(100))
+        assert interactive == 5
+        status = m.status()
+        assert status["remaining_today"] == 0
+        assert status["granted"] == {"interactive": 5, "track": 15, "polling": 80, "backfill": 0}
+        assert status["deferred"]["backfill"] == 1
+        assert status["deferred"]["interactive"] == 95
+
+
+class TestPriorityContext:
+    def test_use_priority_scopes_and_resets(self):
+        assert current_priority() is Priority.INTERACTIVE
+        with use_priority(Priority.POLLING):
+            assert current_priority() is Priority.POLLING
+        assert current_priority() is Priority.INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_deferred_lookup_raises_typed_error_without_calling_upstream(self):
+        client = MagicMock()
+        client.get = AsyncMock()
+        with patch.object(aerodatabox, "get_client", return_value=client), \
+                patch.object(quota, "acquire", new=AsyncMock(return_value=False)), \
+                use_priority(Priority.POLLING):
+            with pytest.raises(aerodatabox.AeroDataBoxQuotaDeferred) as exc:
+                await aerodatabox.lookup_flights("UA100", "2026-06-01")
+
+        # Subclass of RateLimited → routes map it to 503 + Retry-After
+        assert isinstance(exc.value, aerodatabox.AeroDataBoxRateLimited)
+        assert "polling" in str(exc.value)
+        client.get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_interactive_lookup_does_not_join_deferred_polling_call(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = []
+        client = MagicMock()
+        client.get = AsyncMock(return_value=response)
+
+        async def _acquire(priority=None):
+            await asyncio.sleep(0.01)
+            return current_priority() is Priority.INTERACTIVE
+
+        async def _polling():
+            with use_priority(Priority.POLLING):
+                return await aerodatabox.lookup_flights("UA100", "2026-06-01")
+
+        with patch.object(aerodatabox, "get_client", return_value=client), \
+                patch.object(quota, "acquire", new=_acquire):
+            polled, interactive = await asyncio.gather(
+                _polling(),
+                aerodatabox.lookup_flights("UA100", "2026-06-01"),
+                return_exceptions=True,
+            )
+
+        assert isinstance(polled, aerodatabox.AeroDataBoxQuotaDeferred)
+        assert interactive == []
+
+
+def test_process_quota_uses_configured_limits():
+    from app.core.config import settings
+
+    assert quota.rate == settings.adb_rate_per_second
+    assert quota.burst == settings.adb_burst
+    assert quota.daily_budget == settings.adb_daily_budget
+
+
+def test_quota_status_endpoint(client: TestClient):
+    resp = client.get("/health/adb-quota")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body["deferred"]) == {"interactive", "track", "polling", "backfill"}
+    assert "remaining_today" in body
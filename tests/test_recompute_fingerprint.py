@@ -0,0 +1,148 @@
+"""Recompute input fingerprint: the polling agent skips recomputes whose inputs are unchanged."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.schemas.flight_snapshot import FlightSnapshot
+from app.services.recommendation_service import recommendation_input_fingerprint
+
+
+NOW = datetime(2099, 1, 1, 9, 5, tzinfo=timezone.utc)
+
+
+def _snapshot(**overrides) -> FlightSnapshot:
+    fields = dict(
+        scheduled_departure=NOW + timedelta(hours=8),
+        departure_terminal="3",
+        departure_gate="B10",
+        origin_airport_code="SFO",
+        departure_local_hour=9,
+    )
+    fields.update(overrides)
+    return FlightSnapshot(**fields)
+
+
+def _fp(snapshot=None, prefs='{"transport_mode": "driving"}', home="1 Market St", now=NOW):
+    return recommendation_input_fingerprint(snapshot or _snapshot(), prefs, home, now)
+
+
+class TestFingerprint:
+    def test_stable_for_identical_inputs(self):
+        assert _fp() == _fp()
+        assert _fp() == _fp(now=NOW + timedelta(minutes=20))
+
+    def test_changes_with_flight_fields(self):
+        assert _fp(_snapshot(departure_gate="B12")) != _fp()
+        assert _fp(_snapshot(departure_terminal="2")) != _fp()
+        assert _fp(_snapshot(scheduled_departure=NOW + timedelta(hours=9))) != _fp()
+
+    def test_changes_with_preferences_and_address(self):
+        assert _fp(prefs='{"transport_mode": "rideshare"}') != _fp()
+        assert _fp(home="2 Market St") != _fp()
+
+    def test_rolls_over_with_hourly_bucket(self):
+        assert _fp(now=NOW + timedelta(hours=1)) != _fp()
+
+    def test_drive_bucket_narrows_near_departure(self):
+        snap = _snapshot(scheduled_departure=NOW + timedelta(hours=1))
+        base = recommendation_input_fingerprint(snap, None, "x", NOW)
+        later = recommendation_input_fingerprint(snap, None, "x", NOW + timedelta(minutes=20))
+        assert base != later
+
+
+def _make_trip(fingerprint=None):
+    dep = datetime.now(tz=timezone.utc) + timedelta(hours=8)
+    trip = MagicMock()
+    trip.id = "trip-fp"
+    trip.user_id = "user-fp"
+    trip.input_mode = "flight_number"
+    trip.flight_number = "UA100"
+    trip.departure_date = dep.date().isoformat()
+    trip.selected_departure_utc = dep.isoformat()
+    trip.status = "active"
+    trip.trip_status = "active"
+    trip.home_address = "1 Market St"
+    trip.preferences_json = None
+    trip.flight_info = {
+        "origin_iata": "SFO",
+        "scheduled_departure_at": dep.isoformat(),
+        "terminal": "3",
+        "departure_local_hour": 9,
+    }
+    trip.flight_status = {
+        "gate": "B10",
+        "status": "Scheduled",
+        "last_updated": datetime.now(tz=timezone.utc).isoformat(),
+    }
+    trip.latest_recommendation = {"segments": [{"id": "transport"}]}
+    trip.recommendation_fingerprint = fingerprint
+    leave = dep - timedelta(hours=3)
+    trip.projected_timeline = {"leave_home_at": leave.isoformat()}
+    trip.last_pushed_leave_home_at = leave
+    trip.push_count = 0
+    trip.time_to_go_push_sent_at = None
+    trip.sms_count = 0
+    trip.auto_completed = False
+    trip.feedback_requested_at = None
+
+    user = MagicMock()
+    user.trip_count = 1
+    user.subscription_status = "active"
+    trip.user = user
+    return trip, leave
+
+
+def _fake_response(leave):
+    response = MagicMock()
+    response.leave_home_at = leave
+    response.segments = []
+    response.home_coordinates = None
+    response.terminal_coordinates = None
+    response.origin_airport_code = "SFO"
+    return response
+
+
+async def _tick(trip, recompute):
+    from app.services.polling_agent import _process_trip
+
+    with patch("app.services.flight_snapshot_service.lookup_flights", return_value=[]), \
+            patch("app.services.polling_agent.recompute_recommendation", new=recompute), \
+            patch("app.services.polling_agent.send_trip_notification", new=AsyncMock(return_value=True)):
+        await _process_trip(trip, AsyncMock())
+
+
+class TestAgentSkipsUnchangedRecompute:
+    @pytest.mark.asyncio
+    async def test_first_tick_recomputes_and_stores_fingerprint(self):
+        trip, leave = _make_trip()
+        recompute = AsyncMock(return_value=_fake_response(leave))
+
+        await _tick(trip, recompute)
+
+        assert recompute.await_count == 1
+        assert isinstance(trip.recommendation_fingerprint, str)
+
+    @pytest.mark.asyncio
+    async def test_matching_fingerprint_reuses_stored_result(self):
+        trip, leave = _make_trip()
+        recompute = AsyncMock(return_value=_fake_response(leave))
+        await _tick(trip, recompute)
+        stored = trip.latest_recommendation
+
+        await _tick(trip, recompute)
+
+        assert recompute.await_count == 1
+        assert trip.latest_recommendation is stored
+
+    @pytest.mark.asyncio
+    async def test_gate_change_forces_recompute(self):
+        trip, leave = _make_trip()
+        recompute = AsyncMock(return_value=_fake_response(leave))
+        await _tick(trip, recompute)
+
+        trip.flight_status = dict(trip.flight_status, gate="C3")
+        await _tick(trip, recompute)
+
+        assert recompute.await_count == 2
@@ -41,7 +41,7 @@ class TestPrefetchedSnapshot:
         ctx = _context()
         snap = _snapshot()
 
-        async def _fake_build_response(trip_id, context, snapshot, now, user=None):
+        async def _fake_build_response(trip_id, context, snapshot, now, user=None, **_):
             # Prove the snapshot we provided is the one used downstream.
             from app.schemas.recommendations import RecommendationResponse, ConfidenceLevel
             return RecommendationResponse(
@@ -55,7 +55,7 @@ class TestPrefetchedSnapshot:
                 origin_airport_code=snapshot.origin_airport_code,
             )
 
-        build_mock = MagicMock(return_value=snap)
+        build_mock = AsyncMock(return_value=snap)
         with patch.object(recommendation_service, "get_trip_context", AsyncMock(return_value=ctx)), \
                 patch.object(recommendation_service, "build_flight_snapshot", build_mock), \
                 patch.object(recommendation_service, "_build_response", _fake_build_response):
@@ -74,7 +74,7 @@ class TestPrefetchedSnapshot:
 
         ctx = _context()
 
-        async def _fake_build_response(trip_id, context, snapshot, now, user=None):
+        async def _fake_build_response(trip_id, context, snapshot, now, user=None, **_):
             from app.schemas.recommendations import RecommendationResponse, ConfidenceLevel
             return RecommendationResponse(
                 trip_id=trip_id,
@@ -87,7 +87,7 @@ class TestPrefetchedSnapshot:
                 origin_airport_code="SFO",
             )
 
-        build_mock = MagicMock(return_value=_snapshot())
+        build_mock = AsyncMock(return_value=_snapshot())
         with patch.object(recommendation_service, "get_trip_context", AsyncMock(return_value=ctx)), \
                 patch.object(recommendation_service, "build_flight_snapshot", build_mock), \
                 patch.object(recommendation_service, "_build_response", _fake_build_response):
@@ -107,7 +107,7 @@ class TestPrefetchedSnapshot:
         ctx = _context()
         snap = _snapshot()
 
-        async def _fake_build_response(trip_id, context, snapshot, now, user=None):
+        async def _fake_build_response(trip_id, context, snapshot, now, user=None, **_):
             from app.schemas.recommendations import RecommendationResponse, ConfidenceLevel
             return RecommendationResponse(
                 trip_id=trip_id,
@@ -120,7 +120,7 @@ class TestPrefetchedSnapshot:
                 origin_airport_code="SFO",
             )
 
-        build_mock = MagicMock(return_value=snap)
+        build_mock = AsyncMock(return_value=snap)
         with patch.object(recommendation_service, "get_trip_context", AsyncMock(return_value=ctx)), \
                 patch.object(recommendation_service, "build_flight_snapshot", build_mock), \
                 patch.object(recommendation_service, "_build_response", _fake_build_response):
@@ -0,0 +1,255 @@
+"""Request-scoped latency budget: integrations fall back and mark the response degraded."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+import app.db as _db
+from app.core import deadline
+from app.core.deadline import call_timeout, current_budget, request_budget, within_budget
+from app.db.models import Trip, User
+from app.schemas.trips import TripContext
+from app.services import flight_snapshot_service
+from app.services.flight_snapshot_service import build_flight_snapshot
+from app.services.integrations import aerodatabox, google_maps, tsa_api
+from app.services.integrations.aerodatabox import AeroDataBoxTimeout
+from app.services.integrations.rapidapi_quota import quota
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBudget:
+    def test_no_budget_keeps_default_timeout(self):
+        assert current_budget() is None
+        assert call_timeout(10) == 10
+        deadline.mark_degraded("tsa")  # no-op outside a budget
+
+    def test_timeout_capped_at_share_of_remaining(self):
+        clock = _Clock()
+        with request_budget(8, clock=clock):
+            assert call_timeout(10) == 8
+            assert call_timeout(10, share=0.5) == 4
+            assert call_timeout(2) == 2
+            clock.now = 7
+            assert call_timeout(10) == 1
+
+    def test_spent_budget_returns_none(self):
+        clock = _Clock()
+        with request_budget(1, clock=clock) as budget:
+            clock.now = 1 - deadline.MIN_CALL_SECONDS / 2
+            assert call_timeout(10) is None
+            deadline.mark_degraded("geocode")
+        assert budget.degraded == {"geocode"}
+        assert current_budget() is None
+
+    @pytest.mark.asyncio
+    async def test_within_budget_stops_overrunning_work(self):
+        with patch.object(deadline, "HARD_STOP_GRACE_SECONDS", 0):
+            with pytest.raises(TimeoutError):
+                await within_budget(0.01, asyncio.sleep(5))
+            assert await within_budget(1, asyncio.sleep(0, result="done")) == "done"
+
+    @pytest.mark.asyncio
+    async def test_within_budget_is_visible_to_the_work(self):
+        async def _work():
+            return current_budget()
+
+        assert await within_budget(5, _work()) is not None
+
+
+class TestIntegrationsUnderBudget:
+    @pytest.mark.asyncio
+    async def test_spent_budget_skips_adb_without_tripping_breaker(self):
+        get = AsyncMock()
+        with patch.object(aerodatabox, "get_client", return_value=MagicMock(get=get)), \
+                request_budget(0) as budget:
+            with pytest.raises(AeroDataBoxTimeout):
+                await aerodatabox.lookup_flights("UA100", "2026-06-01")
+        get.assert_not_awaited()
+        assert budget.degraded == {"flight"}
+        assert aerodatabox.breaker.failures == 0
+
+    @pytest.mark.asyncio
+    async def test_budget_capped_adb_timeout_is_not_a_breaker_failure(self):
+        get = AsyncMock(side_effect=httpx.ReadTimeout("slow"))
+        with patch.object(aerodatabox, "get_client", return_value=MagicMock(get=get)), \
+                request_budget(4) as budget:
+            with pytest.raises(AeroDataBoxTimeout):
+                await aerodatabox.lookup_flights("UA100", "2026-06-01")
+        assert get.await_args.kwargs["timeout"] <= 4 * aerodatabox.BUDGET_SHARE
+        assert budget.degraded == {"flight"}
+        assert aerodatabox.breaker.failures == 0
+
+    @pytest.mark.asyncio
+    async def test_adb_timeout_accounts_for_quota_wait(self):
+        clock = _Clock()
+        response = MagicMock(status_code=200)
+        response.json.return_value = []
+        get = AsyncMock(return_value=response)
+
+        async def _slow_acquire(priority=None):
+            clock.now += 3
+            return True
+
+        with patch.object(aerodatabox, "get_client", return_value=MagicMock(get=get)), \
+                patch.object(quota, "acquire", new=_slow_acquire), \
+                request_budget(4, clock=clock):
+            await aerodatabox.lookup_flights("UA100", "2026-06-01")
+        assert get.await_args.kwargs["timeout"] == pytest.approx(1 * aerodatabox.BUDGET_SHARE)
+
+    @pytest.mark.asyncio
+    async def test_quota_wait_spending_the_budget_skips_adb(self):
+        clock = _Clock()
+        get = AsyncMock()
+
+        async def _slow_acquire(priority=None):
+            clock.now += 4
+            return True
+
+        with patch.object(aerodatabox, "get_client", return_value=MagicMock(get=get)), \
+                patch.object(quota, "acquire", new=_slow_acquire), \
+                request_budget(4, clock=clock) as budget:
+            with pytest.raises(AeroDataBoxTimeout):
+                await aerodatabox.lookup_flights("UA100", "2026-06-01")
+        get.assert_not_awaited()
+        assert budget.degraded == {"flight"}
+
+    @pytest.mark.asyncio
+    async def test_caller_joining_a_cut_short_call_is_marked_degraded(self):
+        clock = _Clock()
+
+        async def _slow_get(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            raise httpx.ReadTimeout("slow")
+
+        async def _lookup():
+            with request_budget(4, clock=clock) as budget:
+                with pytest.raises(AeroDataBoxTimeout):
+                    await aerodatabox.lookup_flights("UA100", "2026-06-01")
+            return budget
+
+        get = AsyncMock(side_effect=_slow_get)
+        with patch.object(aerodatabox, "get_client", return_value=MagicMock(get=get)):
+            leader, follower = await asyncio.gather(_lookup(), _lookup())
+        assert get.await_count == 1
+        assert leader.degraded == follower.degraded == {"flight"}
+
+    @pytest.mark.asyncio
+    async def test_spent_budget_skips_geocode_and_drive_time(self):
+        get = AsyncMock()
+        with patch.object(google_maps, "get_client", return_value=MagicMock(get=get)), \
+                request_budget(0) as budget:
+            assert await google_maps.geocode_address("1 Market St") is None
+            drive = await google_maps.get_drive_time(
+                "1 Market St", "SFO", transport_mode="driving", departure_time=4102444800
+            )
+        get.assert_not_awaited()
+        assert drive["source"] == "fallback"
+        assert drive["duration_minutes"] == 45
+        assert budget.degraded == {"geocode", "drive_time"}
+
+    @pytest.mark.asyncio
+    @patch("app.services.integrations.tsa_api.settings")
+    async def test_spent_budget_skips_live_tsa(self, mock_settings):
+        mock_settings.tsa_wait_times_api_key = "test-key"
+        tsa_api.clear_cache()
+        with request_budget(0) as budget:
+            assert await tsa_api.fetch_live_tsa_wait("LAX") is None
+        assert budget.degraded == {"tsa"}
+
+
+
+class TestSlowFlightLookup:
+    """A strict snapshot cut short by the budget serves the trip's stored flight data."""
+
+    DEP = datetime(2026, 6, 1, 17, 30, tzinfo=timezone.utc)
+
+    def _seed(self, factory, trip_id, **overrides):
+        async def _do():
+            user_id = uuid.uuid4()
+            async with factory() as s:
+                s.add(User(id=user_id, trip_count=1))
+                s.add(Trip(
+                    id=trip_id,
+                    user_id=user_id,
+                    input_mode="flight_number",
+                    flight_number="UA100",
+                    departure_date="2026-06-01",
+                    home_address="1 Market St",
+                    selected_departure_utc=self.DEP.isoformat(),
+                    flight_info={
+                        "scheduled_departure_at": self.DEP.isoformat(),
+                        "origin_iata": "SFO",
+                        "terminal": "3",
+                        "departure_local_hour": 10,
+                    },
+                    flight_status={"gate": "F12"},
+                    status="active",
+                    **overrides,
+                ))
+                await s.commit()
+        asyncio.run(_do())
+
+    def _context(self, trip_id, flight_number="UA100"):
+        return TripContext(
+            trip_id=trip_id,
+            input_mode="flight_number",
+            flight_number=flight_number,
+            departure_date=self.DEP.date(),
+            home_address="1 Market St",
+            selected_departure_utc=self.DEP.isoformat(),
+            created_at=self.DEP - timedelta(days=7),
+        )
+
+    def _build(self, factory, context):
+        async def _do():
+            # The real lookup, so the spent budget is what stops it
+            with patch.object(_db, "async_session_factory", factory), \
+                    patch.object(
+                        flight_snapshot_service, "lookup_flights", new=aerodatabox.lookup_flights
+                    ), \
+                    request_budget(0) as budget:
+                return await build_flight_snapshot(context, strict=True), budget
+        return asyncio.run(_do())
+
+    def test_serves_stored_flight_as_stale(self, test_session):
+        factory, _ = test_session
+        trip_id = uuid.uuid4()
+        self._seed(factory, trip_id)
+
+        snapshot, budget = self._build(factory, self._context(trip_id))
+        assert snapshot.scheduled_departure == self.DEP
+        assert snapshot.origin_airport_code == "SFO"
+        assert snapshot.departure_gate == "F12"
+        assert snapshot.is_stale is True
+        assert budget.degraded == {"flight"}
+
+    def test_other_flight_still_raises(self, test_session):
+        factory, _ = test_session
+        trip_id = uuid.uuid4()
+        self._seed(factory, trip_id)
+
+        with pytest.raises(AeroDataBoxTimeout):
+            self._build(factory, self._context(trip_id, flight_number="DL200"))
+
+
+def test_route_overrunning_its_budget_is_a_503(client):
+    async def _stuck(*args, **kwargs):
+        await asyncio.sleep(5)
+
+    with patch("app.api.routes.recommendations.compute_recommendation", new=_stuck), \
+            patch("app.api.routes.recommendations.settings") as mock_settings, \
+            patch.object(deadline, "HARD_STOP_GRACE_SECONDS", 0):
+        mock_settings.recommendation_budget_seconds = 0.01
+        response = client.post("/v1/recommendations", json={"trip_id": str(uuid.uuid4())})
+    assert response.status_code == 503
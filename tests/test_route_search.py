@@ -1,6 +1,6 @@
 """Tests for GET /v1/flights/search (airport departure search)."""
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 from fastapi.testclient import TestClient
 
@@ -71,10 +71,8 @@ def _mock_get(url, **kwargs):
 
 class TestFlightSearch:
     def test_search_returns_filtered_by_destination(self, client: TestClient):
-        with patch("app.services.integrations.aerodatabox.httpx.Client") as mock_cls:
-            mock_cls.return_value.__enter__ = lambda s: s
-            mock_cls.return_value.__exit__ = lambda s, *a: None
-            mock_cls.return_value.get = _mock_get
+        with patch("app.services.integrations.aerodatabox.get_client") as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=_mock_get)
 
             resp = client.get("/v1/flights/search", params={
                 "origin": "SFO",
@@ -90,10 +88,8 @@ class TestFlightSearch:
             assert f["destination_iata"] == "LAX"
 
     def test_time_window_morning_filter(self, client: TestClient):
-        with patch("app.services.integrations.aerodatabox.httpx.Client") as mock_cls:
-            mock_cls.return_value.__enter__ = lambda s: s
-            mock_cls.return_value.__exit__ = lambda s, *a: None
-            mock_cls.return_value.get = _mock_get
+        with patch("app.services.integrations.aerodatabox.get_client") as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=_mock_get)
 
             resp = client.get("/v1/flights/search", params={
                 "origin": "SFO",
@@ -109,10 +105,8 @@ class TestFlightSearch:
         assert flights[0]["flight_number"] == "UA300"
 
     def test_airline_filter(self, client: TestClient):
-        with patch("app.services.integrations.aerodatabox.httpx.Client") as mock_cls:
-            mock_cls.return_value.__enter__ = lambda s: s
-            mock_cls.return_value.__exit__ = lambda s, *a: None
-            mock_cls.return_value.get = _mock_get
+        with patch("app.services.integrations.aerodatabox.get_client") as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=_mock_get)
 
             resp = client.get("/v1/flights/search", params={
                 "origin": "SFO",
@@ -127,10 +121,8 @@ class TestFlightSearch:
         assert flights[0]["flight_number"] == "AA200"
 
     def test_no_matching_flights_returns_empty(self, client: TestClient):
-        with patch("app.services.integrations.aerodatabox.httpx.Client") as mock_cls:
-            mock_cls.return_value.__enter__ = lambda s: s
-            mock_cls.return_value.__exit__ = lambda s, *a: None
-            mock_cls.return_value.get = _mock_get
+        with patch("app.services.integrations.aerodatabox.get_client") as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=_mock_get)
 
             resp = client.get("/v1/flights/search", params={
                 "origin": "SFO",
@@ -150,10 +142,8 @@ class TestFlightSearch:
 
     def test_missing_iata_flights_are_skipped(self, client: TestClient):
         """Flights without a destination IATA code are silently excluded."""
-        with patch("app.services.integrations.aerodatabox.httpx.Client") as mock_cls:
-            mock_cls.return_value.__enter__ = lambda s: s
-            mock_cls.return_value.__exit__ = lambda s, *a: None
-            mock_cls.return_value.get = _mock_get
+        with patch("app.services.integrations.aerodatabox.get_client") as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=_mock_get)
 
             resp = client.get("/v1/flights/search", params={
                 "origin": "SFO",
@@ -167,10 +157,8 @@ class TestFlightSearch:
 
     def test_origin_iata_set_from_query(self, client: TestClient):
         """The origin_iata field should be set to the queried airport."""
-        with patch("app.services.integrations.aerodatabox.httpx.Client") as mock_cls:
-            mock_cls.return_value.__enter__ = lambda s: s
-            mock_cls.return_value.__exit__ = lambda s, *a: None
-            mock_cls.return_value.get = _mock_get
+        with patch("app.services.integrations.aerodatabox.get_client") as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=_mock_get)
 
             resp = client.get("/v1/flights/search", params={
                 "origin": "SFO",
@@ -181,3 +169,23 @@ class TestFlightSearch:
         flights = resp.json()["flights"]
         for f in flights:
             assert f["origin_iata"] == "SFO"
+
+    def test_repeat_searches_reuse_cached_board(self, client: TestClient):
+        """One FIDS fetch (two windows) serves later searches from the same origin."""
+        with patch("app.services.integrations.aerodatabox.get_client") as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=_mock_get)
+
+            first = client.get("/v1/flights/search", params={
+                "origin": "SFO", "destination": "LAX", "date": "2026-04-01",
+            })
+            second = client.get("/v1/flights/search", params={
+                "origin": "sfo", "destination": "JFK", "date": "2026-04-01",
+            })
+            third = client.get("/v1/flights/search", params={
+                "origin": "SFO", "destination": "LAX", "date": "2026-04-01",
+            })
+
+            assert mock_client.return_value.get.await_count == 2
+
+        assert [f["flight_number"] for f in second.json()["flights"]] == ["DL100"]
+        assert first.json() == third.json()
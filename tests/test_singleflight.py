@@ -0,0 +1,104 @@
+"""SingleFlight: concurrent identical calls share one upstream request."""
+
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        sf = SingleFlight()
+        calls = 0
+
+        async def _fetch(value):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(*(sf.do("k", _fetch, 7) for _ in range(5)))
+        assert results == [7] * 5
+        assert calls == 1
+        assert len(sf) == 0
+
+    @pytest.mark.asyncio
+    async def test_distinct_keys_do_not_coalesce(self):
+        sf = SingleFlight()
+        calls = []
+
+        async def _fetch(value):
+            calls.append(value)
+            await asyncio.sleep(0)
+            return value
+
+        assert await asyncio.gather(sf.do("a", _fetch, 1), sf.do("b", _fetch, 2)) == [1, 2]
+        assert sorted(calls) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_cached(self):
+        sf = SingleFlight()
+        calls = 0
+
+        async def _fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await sf.do("k", _fetch) == 1
+        assert await sf.do("k", _fetch) == 2
+
+    @pytest.mark.asyncio
+    async def test_error_is_shared_then_cleared(self):
+        sf = SingleFlight()
+
+        async def _fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            sf.do("k", _fail), sf.do("k", _fail), return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        assert len(sf) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        sf = SingleFlight()
+        release = asyncio.Event()
+
+        async def _fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(sf.do("k", _fetch))
+        second = asyncio.create_task(sf.do("k", _fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    @pytest.mark.asyncio
+    async def test_scope_keeps_different_contexts_apart(self):
+        import contextvars
+
+        flavour = contextvars.ContextVar("flavour", default="a")
+        sf = SingleFlight(scope=flavour.get)
+        seen = []
+
+        async def _fetch():
+            seen.append(flavour.get())
+            await asyncio.sleep(0.01)
+            return flavour.get()
+
+        async def _call(value):
+            flavour.set(value)
+            return await sf.do("k", _fetch)
+
+        results = await asyncio.gather(_call("a"), _call("b"), _call("a"))
+        assert results == ["a", "b", "a"]
+        assert sorted(seen) == ["a", "b"]
@@ -3,11 +3,14 @@ and the denormalized scalars (origin_iata, destination_iata, airline)."""
 
 import asyncio
 import uuid
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from app.db.models import Trip, User
+from app.services import flight_cache
+from app.services.flight_record import FlightIndex
+from app.services.integrations.aerodatabox import AeroDataBoxTimeout
 
 
 MOCK_FLIGHTS = [
@@ -55,9 +58,9 @@ MOCK_FLIGHTS = [
 
 
 def _clear_flight_cache():
-    """Reset the flight_snapshot_service module cache between tests."""
-    from app.services import flight_snapshot_service as fss
-    fss._flight_cache.clear()
+    """Reset the in-process flight cache between tests."""
+    from app.services import flight_cache
+    flight_cache.clear_memory()
 
 
 class TestTrackPopulatesFlightInfo:
@@ -188,6 +191,27 @@ class TestTrackPopulatesFlightInfo:
         assert row.origin_iata is None
         assert row.trip_status == "active"
 
+    @patch(
+        "app.services.flight_snapshot_service.lookup_flights",
+        side_effect=AeroDataBoxTimeout("slow"),
+    )
+    def test_track_does_not_freeze_last_known_good_data(self, mock_lookup, authed_db_client):
+        """During an ADB outage, stale cached flights don't become the frozen flight_info."""
+        _clear_flight_cache()
+        stale = FlightIndex.from_dicts(MOCK_FLIGHTS).as_stale("2026-04-09T12:00:00+00:00")
+        client, factory, mock_user = authed_db_client
+        trip_id = uuid.uuid4()
+        self._seed(factory, mock_user.id, trip_id)
+
+        with patch.object(flight_cache, "get_stale_flights", new=AsyncMock(return_value=stale)):
+            resp = client.post(f"/v1/trips/{trip_id}/track")
+        assert resp.status_code == 200
+
+        row = self._read_trip(factory, trip_id)
+        assert row.flight_info is None
+        assert row.flight_status is None
+        assert row.trip_status == "active"
+
     @patch("app.services.flight_snapshot_service.lookup_flights", return_value=MOCK_FLIGHTS)
     def test_track_increments_trip_count(self, mock_lookup, authed_db_client):
         """Verify trip_count increments on track (real DB, not mocked)."""